@@ -7,11 +7,12 @@ Source: https://github.com/amulya-labs/claude-agents
 License: MIT (https://opensource.org/licenses/MIT)
 """
 
+import functools
 import json
 import re
 import sys
-from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 # Python 3.11+ has tomllib built-in
 try:
@@ -28,19 +29,97 @@ except ImportError:
         sys.exit(1)
 
 
-@dataclass
-class CompiledPattern:
-    """A pre-compiled regex pattern with metadata."""
-    regex: re.Pattern
-    section: str
-    original: str
+CATEGORIES = ("deny", "ask", "allow")
+
+
+# A pattern starting with `^word ` (or `^word\s`, `^word$`) can only match a
+# segment whose first word is exactly `word`
+PATTERN_FIRST_WORD = re.compile(r'\^([A-Za-z0-9_-]+)(?:(?: |\\s)(?![*?{])|\$$)')
+SEGMENT_FIRST_WORD = re.compile(r'\S+')
+
+# Fusing renumbers a pattern's groups and embeds it in a larger expression, so
+# numbered backreferences, group conditionals and named-group references
+# would point at the wrong group. Such patterns are matched on their own.
+GROUP_REFERENCE = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+
+
+def is_fusable(regex: re.Pattern) -> bool:
+    """Whether a pattern means the same inside a fused alternation.
+
+    Named groups would clash between patterns, and global inline flags such
+    as ``(?i)`` are only allowed at the start of the whole expression.
+    """
+    return not (regex.groupindex or regex.flags & ~re.UNICODE
+                or GROUP_REFERENCE.search(regex.pattern))
+
+
+class CompiledPatterns:
+    """All patterns of one category fused into alternation regexes.
+
+    Each alternative ends with an empty marker group ``(?P<g{i}>)``;
+    ``patterns[i]`` is the original pattern and ``sections[i]`` the config
+    section it came from. Patterns anchored with ``^`` are only tried at
+    position 0; ``anchored_alternatives`` lists them as (first word or None,
+    index) and ``anchored_for`` compiles, per segment first word, the
+    alternation of the matching bucket plus the unbucketed ones. The rest
+    are fused into ``unanchored``. A regex is None when it would have no
+    alternatives (an empty alternation would match everything).
+    Patterns that cannot be fused, or whose fused regex fails to compile,
+    are kept as (regex, section) pairs in ``separate`` and searched one by
+    one. Instances hash by identity so validate_command can be memoized.
+
+    A plain slotted class rather than a dataclass: importing dataclasses
+    pulls in inspect, which is a noticeable share of hook startup.
+    """
+
+    __slots__ = ("anchored_alternatives", "first_words", "anchored",
+                 "unanchored", "separate", "sections", "patterns")
+
+    def __init__(
+        self,
+        anchored_alternatives: list[tuple[Optional[str], int]],
+        unanchored: Optional[re.Pattern],
+        separate: list[tuple[re.Pattern, str]],
+        sections: list[str],
+        patterns: list[str],
+    ):
+        self.anchored_alternatives = anchored_alternatives
+        self.first_words = frozenset(word for word, _ in anchored_alternatives if word)
+        self.anchored = {}
+        self.unanchored = unanchored
+        self.separate = separate
+        self.sections = sections
+        self.patterns = patterns
+
+    def anchored_for(self, segment: str) -> tuple[Optional[re.Pattern], list[tuple[re.Pattern, str]]]:
+        """The anchored alternation that can match segment, compiled on first use.
+
+        Also returns the patterns to search one by one: ``separate``, plus
+        the bucket's own patterns if their alternation does not compile.
+        """
+        match = SEGMENT_FIRST_WORD.match(segment)
+        word = match.group() if match and match.group() in self.first_words else None
+        try:
+            return self.anchored[word]
+        except KeyError:
+            pass
+        indexes = [i for key, i in self.anchored_alternatives if key is None or key == word]
+        regex = None
+        separate = self.separate
+        if indexes:
+            try:
+                regex = re.compile("|".join(f"{self.patterns[i][1:]}(?P<g{i}>)" for i in indexes))
+            except re.error:
+                separate = separate_patterns(indexes, self.patterns, self.sections) + separate
+        self.anchored[word] = regex, separate
+        return regex, separate
 
 
 def load_config(config_path: str) -> dict:
     """Load and validate TOML configuration."""
     try:
-        with open(config_path, "rb") as f:
-            return tomllib.load(f)
+        # One read and an in-memory parse beats tomllib's file-object path
+        return tomllib.loads(Path(config_path).read_bytes().decode("utf-8"))
     except tomllib.TOMLDecodeError as e:
         print(f"Error: Invalid TOML in {config_path}: {e}", file=sys.stderr)
         sys.exit(1)
@@ -49,27 +128,169 @@ def load_config(config_path: str) -> dict:
         sys.exit(1)
 
 
-def compile_patterns(config: dict, category: str) -> list[CompiledPattern]:
-    """Extract and compile patterns for a category (deny/ask/allow).
+def fuse_patterns(
+    config: dict, category: str
+) -> tuple[list[tuple[Optional[str], int]], list[int], list[int], list[str], list[str]]:
+    """Extract the valid patterns for a category (deny/ask/allow) and group them.
 
-    Pre-compiling regex patterns improves performance significantly
-    when validating many commands.
+    Fusable patterns are later fused into ``pat0(?P<g0>)|pat1(?P<g1>)|...``
+    so a segment is scanned by the C regex engine in one call instead of one
+    Python-dispatched search per pattern. Returns the anchored patterns as
+    (first word they require or None, index), the indexes of the unanchored
+    and the separately matched patterns, the section list and the pattern
+    list.
     """
-    compiled = []
+    patterns = []
+    sections = []
+    fusable = []
     for section_name, section in config.get(category, {}).items():
         if isinstance(section, dict) and "patterns" in section:
             for pattern in section["patterns"]:
                 try:
                     regex = re.compile(pattern)
-                    compiled.append(CompiledPattern(
-                        regex=regex,
-                        section=f"{category}.{section_name}",
-                        original=pattern
-                    ))
                 except re.error as e:
                     print(f"Warning: Invalid regex '{pattern}' in {category}.{section_name}: {e}",
                           file=sys.stderr)
-    return compiled
+                    continue
+                patterns.append(pattern)
+                sections.append(f"{category}.{section_name}")
+                fusable.append(is_fusable(regex))
+
+    # Python's backtracking engine retries an alternation at every start
+    # position, so anchored patterns go into a separate regex that is only
+    # tried once, at the start of the segment. A pattern containing '|' may
+    # not be anchored as a whole, so it stays in the unanchored group.
+    # The marker group goes at the end so each alternative still starts
+    # with a literal, which lets the engine skip non-matching branches fast.
+    # Anchored patterns that require a specific first word are bucketed by
+    # it, so a segment only tries the bucket for its own first word.
+    anchored = []
+    unanchored = []
+    separate = []
+    for i, pattern in enumerate(patterns):
+        if not fusable[i]:
+            separate.append(i)
+        elif pattern.startswith("^") and "|" not in pattern:
+            first_word = PATTERN_FIRST_WORD.match(pattern)
+            anchored.append((first_word.group(1) if first_word else None, i))
+        else:
+            unanchored.append(i)
+
+    return anchored, unanchored, separate, sections, patterns
+
+
+def separate_patterns(
+    indexes: list[int], patterns: list[str], sections: list[str]
+) -> list[tuple[re.Pattern, str]]:
+    """Compile patterns individually, as (regex, section) pairs."""
+    return [(re.compile(patterns[i]), sections[i]) for i in indexes]
+
+
+def compile_fused(
+    fused: tuple[list[tuple[Optional[str], int]], list[int], list[int], list[str], list[str]]
+) -> CompiledPatterns:
+    """Compile the pattern groups returned by fuse_patterns.
+
+    Anchored alternations are compiled lazily, per first-word bucket. If the
+    unanchored alternation does not compile, its patterns are matched one
+    by one instead.
+    """
+    anchored, unanchored, separate, sections, patterns = fused
+    regex = None
+    if unanchored:
+        try:
+            regex = re.compile("|".join(f"(?:{patterns[i]})(?P<g{i}>)" for i in unanchored))
+        except re.error:
+            separate = unanchored + separate
+    return CompiledPatterns(
+        anchored_alternatives=anchored,
+        unanchored=regex,
+        separate=separate_patterns(sorted(separate), patterns, sections),
+        sections=sections,
+        patterns=patterns,
+    )
+
+
+def compile_patterns(config: dict, category: str) -> CompiledPatterns:
+    """Extract and compile patterns for a category (deny/ask/allow)."""
+    return compile_fused(fuse_patterns(config, category))
+
+
+def load_patterns(config_path: str) -> tuple[CompiledPatterns, CompiledPatterns, CompiledPatterns]:
+    """Load the config and compile its deny/ask/allow patterns."""
+    config = load_config(config_path)
+    return tuple(compile_patterns(config, category) for category in CATEGORIES)
+
+
+# One leading `VAR=value` assignment, including the whitespace before it.
+# $(...) is matched with one level of nested parentheses; deeper nesting and
+# unterminated quotes/substitutions fall through to _strip_one_env_var.
+ENV_ASSIGNMENT = re.compile(
+    r'\s*[A-Za-z_][A-Za-z0-9_]*='
+    r'(?:\$\((?:[^()]|\([^()]*\))*\)'     # $(cmd)
+    r'|`[^`]*`'                             # `cmd`
+    r'|"(?:\\[\s\S]|[^"\\])*"'            # "value"
+    r"|'[^']*'"                             # 'value'
+    r'|\$[A-Za-z_][A-Za-z0-9_]*'             # $VAR
+    r'|(?!\$\(|[`"\'])\S*)'                # unquoted value
+)
+
+# Precompiled pieces used by the _strip_one_env_var fallback
+ENV_NAME = re.compile(r'[A-Za-z_][A-Za-z0-9_]*=')
+IDENT_START = re.compile(r'[A-Za-z_]')
+VAR_REF = re.compile(r'\$[A-Za-z_][A-Za-z0-9_]*')
+UNQUOTED_VALUE = re.compile(r'\S*\s*')
+
+
+def _strip_one_env_var(cmd: str) -> Optional[str]:
+    """Strip a single assignment the ENV_ASSIGNMENT regex could not handle.
+
+    Returns the remaining command, or None if cmd does not start with one.
+    """
+    cmd = cmd.lstrip()
+    match = ENV_NAME.match(cmd)
+    if not match:
+        return None
+
+    rest = cmd[match.end():]
+
+    if rest.startswith('$('):
+        # Command substitution $(...)
+        depth = 1
+        i = 2
+        while depth > 0 and i < len(rest):
+            if rest[i] == '(':
+                depth += 1
+            elif rest[i] == ')':
+                depth -= 1
+            i += 1
+        return rest[i:]
+    if rest.startswith('`'):
+        # Backtick substitution
+        end = rest.find('`', 1)
+        return rest[end + 1:] if end > 0 else ""
+    if rest.startswith('"'):
+        # Double-quoted value
+        i = 1
+        while i < len(rest):
+            if rest[i] == '\\' and i + 1 < len(rest):
+                i += 2
+                continue
+            if rest[i] == '"':
+                break
+            i += 1
+        return rest[i + 1:]
+    if rest.startswith("'"):
+        # Single-quoted value
+        end = rest.find("'", 1)
+        return rest[end + 1:] if end > 0 else ""
+    if rest.startswith('$') and len(rest) > 1 and IDENT_START.match(rest, 1):
+        # Variable reference $VAR
+        var_match = VAR_REF.match(rest)
+        return rest[var_match.end():] if var_match else rest
+    # Unquoted value - ends at whitespace
+    val_match = UNQUOTED_VALUE.match(rest)
+    return rest[val_match.end():] if val_match else ""
 
 
 def strip_env_vars(cmd: str) -> str:
@@ -78,64 +299,31 @@ def strip_env_vars(cmd: str) -> str:
     Handles: VAR=value, VAR="value", VAR='value', VAR=$(cmd), VAR=$VAR
     """
     while True:
-        cmd = cmd.lstrip()
-        match = re.match(r'^[A-Za-z_][A-Za-z0-9_]*=', cmd)
-        if not match:
+        match = ENV_ASSIGNMENT.match(cmd)
+        if match:
+            cmd = cmd[match.end():]
+            continue
+        rest = _strip_one_env_var(cmd)
+        if rest is None:
             break
-
-        rest = cmd[match.end():]
-
-        if rest.startswith('$('):
-            # Command substitution $(...)
-            depth = 1
-            i = 2
-            while depth > 0 and i < len(rest):
-                if rest[i] == '(':
-                    depth += 1
-                elif rest[i] == ')':
-                    depth -= 1
-                i += 1
-            cmd = rest[i:]
-        elif rest.startswith('`'):
-            # Backtick substitution
-            end = rest.find('`', 1)
-            cmd = rest[end + 1:] if end > 0 else ""
-        elif rest.startswith('"'):
-            # Double-quoted value
-            i = 1
-            while i < len(rest):
-                if rest[i] == '\\' and i + 1 < len(rest):
-                    i += 2
-                    continue
-                if rest[i] == '"':
-                    break
-                i += 1
-            cmd = rest[i + 1:]
-        elif rest.startswith("'"):
-            # Single-quoted value
-            end = rest.find("'", 1)
-            cmd = rest[end + 1:] if end > 0 else ""
-        elif rest.startswith('$') and len(rest) > 1 and re.match(r'[A-Za-z_]', rest[1]):
-            # Variable reference $VAR
-            var_match = re.match(r'^\$[A-Za-z_][A-Za-z0-9_]*', rest)
-            cmd = rest[var_match.end():] if var_match else rest
-        else:
-            # Unquoted value - ends at whitespace
-            val_match = re.match(r'^[^\s]*\s*', rest)
-            cmd = rest[val_match.end():] if val_match else ""
+        cmd = rest
 
     return cmd.lstrip()
 
 
-def strip_leading_comment(cmd: str) -> str:
-    """Strip shell comments from the start of a command.
+# Tokens for split_commands: quoted strings (an unterminated quote runs to the
+# end), the split operators, and runs of anything else. A quote preceded by an
+# odd number of backslashes is escaped, so backslashes pair up inside runs.
+COMMAND_TOKEN = re.compile(
+    r'"(?:[^"\\]|\\[\s\S]?)*"?'
+    r"|'(?:[^'\\]|\\[\s\S]?)*'?"
+    r'|&&|\|\||;;|;'
+    r'|(?:[^"\'\\;&|]|\\\\|\\["\']?|&(?!&)|\|(?!\|))+'
+)
+SPLIT_OPERATORS = frozenset(("&&", "||", ";"))
 
-    Handles multi-line commands where the first line is a comment.
-    """
-    lines = cmd.split('\n')
-    while lines and lines[0].strip().startswith('#'):
-        lines.pop(0)
-    return '\n'.join(lines).lstrip()
+# Commands without any of these characters are a single segment
+SPLIT_CHARS = re.compile(r'[;&|]')
 
 
 def split_commands(cmd: str) -> list[str]:
@@ -146,51 +334,20 @@ def split_commands(cmd: str) -> list[str]:
     - Quoted strings
     """
     segments = []
-    current = ""
-    quote = None
-    i = 0
-
-    while i < len(cmd):
-        char = cmd[i]
-
-        # Track quotes (ignore escaped by odd number of backslashes)
-        if char in ('"', "'"):
-            backslash_count = 0
-            j = i - 1
-            while j >= 0 and cmd[j] == '\\':
-                backslash_count += 1
-                j -= 1
-            if backslash_count % 2 == 0:
-                if quote is None:
-                    quote = char
-                elif quote == char:
-                    quote = None
-
-        # Split on && || ; outside quotes
-        if quote is None:
-            if cmd[i:i+2] in ('&&', '||'):
-                if current.strip():
-                    segments.append(current)
-                current = ""
-                i += 2
-                continue
-            elif char == ';':
-                # Don't split on ;; (case statement terminator)
-                if cmd[i:i+2] == ';;':
-                    current += ';;'
-                    i += 2
-                    continue
-                if current.strip():
-                    segments.append(current)
-                current = ""
-                i += 1
-                continue
-
-        current += char
-        i += 1
+    current = []
+
+    for token in COMMAND_TOKEN.findall(cmd):
+        if token in SPLIT_OPERATORS:
+            segment = "".join(current)
+            if segment.strip():
+                segments.append(segment)
+            current = []
+        else:
+            current.append(token)
 
-    if current.strip():
-        segments.append(current)
+    segment = "".join(current)
+    if segment.strip():
+        segments.append(segment)
 
     return segments
 
@@ -235,23 +392,24 @@ def strip_control_flow_keyword(segment: str) -> str:
     return segment
 
 
-def clean_segment(segment: str) -> str:
-    """Clean a command segment: strip whitespace, subshell chars, env vars, comments."""
-    segment = segment.strip()
+# Everything clean_segment drops from the front of a segment: whitespace,
+# whole comment lines (a blank line ends the comment block), then subshell
+# and grouping openers with the whitespace after them.
+SEGMENT_PREFIX = re.compile(r'\s*(?:[^\S\n]*#[^\n]*(?:\n|\Z))*\s*(?:[({]\s*)*')
 
-    # Strip leading comments
-    segment = strip_leading_comment(segment)
 
-    # Strip leading subshell/grouping: ( {
-    while segment and segment[0] in '({':
-        segment = segment[1:].lstrip()
+def clean_segment(segment: str) -> str:
+    """Clean a command segment: strip whitespace, subshell chars, env vars, comments."""
+    # Work out the bounds first and slice once
+    start = SEGMENT_PREFIX.match(segment).end()
 
-    # Strip trailing subshell/grouping: ) }
-    while segment and segment[-1] in ')}':
-        segment = segment[:-1].rstrip()
+    # Strip trailing whitespace and subshell/grouping: ) }
+    end = len(segment)
+    while end > start and (segment[end - 1] in ')}' or segment[end - 1].isspace()):
+        end -= 1
 
     # Strip env vars
-    segment = strip_env_vars(segment)
+    segment = strip_env_vars(segment[start:end])
 
     # Strip shell control flow keywords (then, else, do, etc.)
     # This allows validation of the body command within control structures
@@ -260,14 +418,28 @@ def clean_segment(segment: str) -> str:
     return segment
 
 
-def check_patterns(segment: str, patterns: list[CompiledPattern]) -> tuple[bool, str]:
-    """Check if segment matches any compiled pattern.
+def check_patterns(segment: str, patterns: CompiledPatterns) -> tuple[bool, str]:
+    """Check if segment matches any pattern of a category.
 
     Returns (matched, section_name).
     """
-    for pattern in patterns:
-        if pattern.regex.search(segment):
-            return True, pattern.section
+    # Segments stay str: CPython already stores ASCII text one byte per
+    # character and the regex engine specializes on that width, so matching
+    # UTF-8 bytes is no faster and would change what \s, \w and . mean for
+    # non-ASCII commands.
+    match = None
+    anchored, separate = patterns.anchored_for(segment)
+    if anchored is not None:
+        match = anchored.match(segment)
+    if match is None and patterns.unanchored is not None:
+        match = patterns.unanchored.search(segment)
+    if match:
+        # lastgroup is the group that closed last, i.e. the g{i} marker,
+        # even when the pattern itself contains capturing groups
+        return True, patterns.sections[int(match.lastgroup[1:])]
+    for regex, section in separate:
+        if regex.search(segment):
+            return True, section
     return False, ""
 
 
@@ -282,11 +454,12 @@ def output_decision(decision: str, reason: str):
     }))
 
 
+@functools.lru_cache(maxsize=64)
 def validate_command(
     command: str,
-    deny_patterns: list[CompiledPattern],
-    ask_patterns: list[CompiledPattern],
-    allow_patterns: list[CompiledPattern]
+    deny_patterns: CompiledPatterns,
+    ask_patterns: CompiledPatterns,
+    allow_patterns: CompiledPatterns
 ) -> tuple[str, str]:
     """Validate a command against patterns.
 
@@ -295,12 +468,16 @@ def validate_command(
     """
     # First, check DENY patterns against the FULL command (before splitting)
     # This catches dangerous chaining patterns like "; rm -rf /" or "&& sudo"
-    matched, section = check_patterns(command, deny_patterns)
-    if matched:
-        return "deny", f"Blocked: '{command[:100]}' matches {section}"
+    if deny_patterns.sections:
+        matched, section = check_patterns(command, deny_patterns)
+        if matched:
+            return "deny", f"Blocked: '{command[:100]}' matches {section}"
 
-    # Split into segments
-    segments = split_commands(command)
+    # Split into segments (nothing to split without an operator character)
+    if SPLIT_CHARS.search(command):
+        segments = split_commands(command)
+    else:
+        segments = [command]
 
     final_decision = "allow"
     final_reason = "Command matches allow patterns"
@@ -310,6 +487,12 @@ def validate_command(
         if not cleaned:
             continue
 
+        # Categories are scanned separately, in priority order. A single
+        # deny/ask/allow regex would report the leftmost match rather than
+        # the highest-priority one, and the lookahead needed to restore
+        # priority defeats search()'s literal prefix skipping (measured
+        # slower than these separate scans).
+
         # Check DENY first (per-segment)
         matched, section = check_patterns(cleaned, deny_patterns)
         if matched:
@@ -336,27 +519,50 @@ def validate_command(
     return final_decision, final_reason
 
 
+def output_batch(commands: list, patterns: tuple[CompiledPatterns, ...]):
+    """Validate a list of commands and output one JSON document of results.
+
+    Entries that are empty or not strings get a null result, mirroring the
+    single-command path, which outputs nothing for them.
+    """
+    results = []
+    for command in commands:
+        if not command or not isinstance(command, str):
+            results.append(None)
+            continue
+        decision, reason = validate_command(command, *patterns)
+        results.append({
+            "permissionDecision": decision,
+            "permissionDecisionReason": reason
+        })
+    print(json.dumps({"results": results}))
+
+
 def main():
     if len(sys.argv) != 2:
         print("Usage: validate-bash.py <config.toml>", file=sys.stderr)
         sys.exit(1)
 
     config_path = sys.argv[1]
-    config = load_config(config_path)
-
-    # Compile patterns once at startup (improves performance)
-    deny_patterns = compile_patterns(config, "deny")
-    ask_patterns = compile_patterns(config, "ask")
-    allow_patterns = compile_patterns(config, "allow")
 
     # Read JSON input from stdin
     try:
-        input_data = json.load(sys.stdin)
+        input_data = json.loads(sys.stdin.buffer.read() or b"{}")
     except json.JSONDecodeError:
         # Invalid input, let it pass
-        sys.exit(0)
+        input_data = None
+
+    # Batch input {"commands": [...]} shares one pattern load across commands
+    commands = (input_data or {}).get("commands")
+    if isinstance(commands, list):
+        output_batch(commands, load_patterns(config_path))
+        return
+
+    command = (input_data or {}).get("tool_input", {}).get("command", "")
+
+    # Compile patterns once at startup (improves performance)
+    deny_patterns, ask_patterns, allow_patterns = load_patterns(config_path)
 
-    command = input_data.get("tool_input", {}).get("command", "")
     if not command:
         sys.exit(0)
 
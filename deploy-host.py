@@ -18,13 +18,20 @@ import subprocess
 import json
 import shlex
 import shutil
+import stat
 import argparse
 import time
 import re
 import tempfile
 import fnmatch
+import hashlib
+import threading
+import traceback
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Any, Optional
 
 try:
@@ -33,11 +40,22 @@ except ImportError:
     print("ERROR: PyYAML not installed. Run: pip install pyyaml")
     sys.exit(1)
 
+# libyaml's C loader is much faster; fall back to the pure-Python one when
+# PyYAML was built without libyaml.  Both are safe loaders.
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 
 # Global flags for logging behavior
 VERBOSE = False
 DRY_RUN = False
 
+# The effective UID does not change during a run; checked once here
+# instead of on every command.
+IS_ROOT = os.geteuid() == 0
+
 # Runner config files that must be removed before re-registration and
 # preserved during binary upgrades.  The Actions runner's IsConfigured()
 # checks both .runner and .runner_migrated — all files listed here are
@@ -53,6 +71,61 @@ RUNNER_CONFIG_FILES = [
 ]
 
 
+# Runner release tarballs are downloaded here once per {version, arch} and
+# extracted into each runner directory from the local copy.
+RUNNER_TARBALL_CACHE_DIR = "/var/cache/gha-runner"
+
+# Registration tokens are valid for about an hour.  The last one fetched is
+# kept in the per-user runtime directory (mode 0600, tmpfs, removed at
+# logout) and reused by later runs until it is within TOKEN_REFRESH_MARGIN of
+# expiring.  Without XDG_RUNTIME_DIR the token is not cached: it must not
+# outlive the session on persistent storage.
+TOKEN_CACHE_PATH = (
+    Path(os.environ["XDG_RUNTIME_DIR"]) / "gha-runnerd" / "registration-token.json"
+    if os.environ.get("XDG_RUNTIME_DIR") else None
+)
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# REST API host used when a GitHub token is available in the environment,
+# which lets API calls skip the gh CLI entirely.
+GITHUB_API_HOST = "api.github.com"
+
+# Seconds a GitHub runner listing is reused.  Cleanup, deregistration and
+# label sync in one deploy all read the same listing instead of re-paging it.
+GITHUB_RUNNERS_TTL = 60
+
+# Exit status of the install shell when its validation step (visudo) fails
+INSTALL_VALIDATION_FAILED = 3
+
+# Seconds between refreshes of the sudo timestamp during a deploy; well
+# inside sudo's default 5 minute timestamp_timeout.
+SUDO_KEEPALIVE_INTERVAL = 50
+
+# Runner units are Type=simple, so systemd reports them active as soon as the
+# process is forked.  Upgraded runners are given SERVICE_SETTLE_TIME seconds
+# to crash before their state is checked, then polled until none is still
+# "activating" or "reloading" (e.g. waiting to auto-restart after a crash).
+SERVICE_SETTLE_TIME = 2
+SERVICE_START_TIMEOUT = 5
+SERVICE_POLL_INTERVAL = 0.1
+_SERVICE_PENDING_STATES = frozenset({'activating', 'reloading'})
+
+# Upper bound on runners deployed concurrently (set by --parallel).  Per-runner
+# work is mostly waiting on downloads, GitHub and systemd, so threads overlap
+# it well.
+MAX_PARALLEL_RUNNERS = 8
+
+
+# Runner names: {type}-{size}-[{category}]-{number}.  Sizes are defined in
+# config.yml, so only the shape is checked here; a non-numeric last part is
+# captured separately so it can be reported as a bad number.
+RUNNER_NAME_PATTERN = re.compile(
+    r'(?P<type>[^-]*)-(?P<size>[^-]*)(?:-(?P<category>[^-]*))?-'
+    r'(?:(?P<number>[0-9]+)|(?P<bad_number>[^-]*))'
+)
+RUNNER_TYPES = frozenset({'cpu', 'gpu'})
+
+
 class Colors:
     """ANSI color codes for terminal output"""
     HEADER = '\033[95m'
@@ -66,25 +139,39 @@ class Colors:
     DIM = '\033[2m'
 
 
+# Per-thread log tag.  Set while a runner is handled on a worker thread so
+# interleaved output from parallel deploys can be told apart.
+_log_context = threading.local()
+
+# Colored, aligned "[LEVEL  ]" prefix per log level, built once at import.
+_LEVEL_COLORS = {
+    "info": Colors.OKBLUE,
+    "success": Colors.OKGREEN,
+    "warning": Colors.WARNING,
+    "error": Colors.FAIL,
+    "header": Colors.BOLD + Colors.HEADER,
+    "debug": Colors.DIM,
+}
+_LEVEL_PREFIX = {
+    level: f"{color}[{level.upper():7}]{Colors.ENDC} "
+    for level, color in _LEVEL_COLORS.items()
+}
+
+
 def log(msg: str, level: str = "info", newline: bool = True):
     """Colored logging with consistent formatting"""
-    colors = {
-        "info": Colors.OKBLUE,
-        "success": Colors.OKGREEN,
-        "warning": Colors.WARNING,
-        "error": Colors.FAIL,
-        "header": Colors.BOLD + Colors.HEADER,
-        "debug": Colors.DIM,
-    }
-    color = colors.get(level, "")
-    prefix = level.upper()
-
-    # Format prefix for alignment
     if level == "debug" and not VERBOSE:
         return  # Skip debug logs unless verbose mode
 
-    end_char = '\n' if newline else ''
-    print(f"{color}[{prefix:7}]{Colors.ENDC} {msg}", end=end_char)
+    prefix = _LEVEL_PREFIX.get(level) or f"[{level.upper():7}]{Colors.ENDC} "
+
+    tag = getattr(_log_context, 'tag', None)
+    if tag:
+        msg = f"[{tag}] " + msg.lstrip("\n")
+
+    # One write per line: print() writes the text and the newline
+    # separately, which lets lines from parallel workers run together.
+    sys.stdout.write(prefix + msg + ('\n' if newline else ''))
 
 
 def log_debug(msg: str):
@@ -108,7 +195,8 @@ def run_cmd(
     capture: bool = False,
     sudo: bool = False,
     dry_run_msg: Optional[str] = None,
-    sudo_reason: Optional[str] = None
+    sudo_reason: Optional[str] = None,
+    input: Optional[str] = None
 ) -> Optional[subprocess.CompletedProcess]:
     """
     Run shell command with error handling, dry-run support, and verbose logging
@@ -120,24 +208,27 @@ def run_cmd(
         sudo: Prepend sudo if not running as root
         dry_run_msg: Custom message for dry-run mode
         sudo_reason: Explanation for why sudo is needed (shown before password prompt)
+        input: Text written to the command's stdin
 
     Returns:
         CompletedProcess or None (in dry-run mode)
     """
-    need_sudo = sudo and os.geteuid() != 0
+    need_sudo = sudo and not IS_ROOT
 
     if need_sudo:
-        reason = sudo_reason or dry_run_msg or "system operation"
-        log_debug(f"🔒 Requesting sudo access for: {reason}")
+        if VERBOSE:
+            reason = sudo_reason or dry_run_msg or "system operation"
+            log_debug(f"🔒 Requesting sudo access for: {reason}")
         cmd = ["sudo"] + cmd
 
-    # Log command in verbose mode
-    cmd_str = ' '.join(shlex.quote(arg) for arg in cmd)
-    log_debug(f"Command: {cmd_str}")
+    # Log command in verbose mode.  Quoting the command line is only done
+    # when it will be shown, not on every quiet call.
+    if VERBOSE:
+        log_debug(f"Command: {shlex.join(cmd)}")
 
     # Handle dry-run mode
     if DRY_RUN:
-        msg = dry_run_msg or f"Would run: {cmd_str}"
+        msg = dry_run_msg or f"Would run: {shlex.join(cmd)}"
         log_dry_run(msg)
         # Return mock result for dry-run
         return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="", stderr="")
@@ -146,21 +237,21 @@ def run_cmd(
     start_time = time.time()
     try:
         if capture:
-            result = subprocess.run(cmd, check=check, capture_output=True, text=True)
+            result = subprocess.run(cmd, check=check, capture_output=True, text=True, input=input)
         else:
-            result = subprocess.run(cmd, check=check)
-
-        elapsed = time.time() - start_time
-        log_debug(f"Command completed in {elapsed:.2f}s")
+            result = subprocess.run(cmd, check=check, input=input, text=input is not None)
 
-        if capture and VERBOSE and result.stdout:
-            log_debug(f"Output: {result.stdout.strip()}")
+        if VERBOSE:
+            elapsed = time.time() - start_time
+            log_debug(f"Command completed in {elapsed:.2f}s")
+            if capture and result.stdout:
+                log_debug(f"Output: {result.stdout.strip()}")
 
         return result
 
     except subprocess.CalledProcessError as e:
         elapsed = time.time() - start_time
-        log(f"Command failed after {elapsed:.2f}s: {cmd_str}", "error")
+        log(f"Command failed after {elapsed:.2f}s: {shlex.join(cmd)}", "error")
         if hasattr(e, 'stderr') and e.stderr:
             log(f"STDERR: {e.stderr}", "error")
         if hasattr(e, 'stdout') and e.stdout:
@@ -168,15 +259,132 @@ def run_cmd(
         raise
 
 
+def _is_executable_file(path: str) -> bool:
+    """Same test shutil.which() applies to each candidate."""
+    return os.access(path, os.X_OK) and not os.path.isdir(path)
+
+
+def _read_text_or_none(path: Path) -> Optional[str]:
+    """File contents, or None if it is missing or unreadable."""
+    try:
+        return path.read_text()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _file_sha256(path: Path) -> str:
+    """Hex SHA256 of a file, hashed in fixed-size chunks rather than read whole."""
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        buf = bytearray(1 << 20)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            digest.update(view[:n])
+        return digest.hexdigest()
+
+
+def _chown_tree_cmd(path, owner: str) -> str:
+    """Shell command giving everything under path to owner ("uid:gid").
+
+    Like chown -R, but only entries with a different owner are changed, so
+    re-deploying over a large _work tree doesn't rewrite every inode.
+    Symlinks are changed themselves, never followed.
+    """
+    uid, gid = owner.split(":")
+    return (
+        f"find {shlex.quote(str(path))} \\( ! -uid {shlex.quote(uid)} -o ! -gid {shlex.quote(gid)} \\)"
+        f" -exec chown -h {shlex.quote(owner)} {{}} +"
+    )
+
+
+def _list_dir(path: Path) -> Optional[set]:
+    """Names of the entries in a directory, or None if it can't be listed."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return None
+
+
+def _owner_uid(path: Path) -> Optional[int]:
+    """Uid owning path (not following symlinks), or None if it can't be stat'ed."""
+    try:
+        return os.lstat(path).st_uid
+    except OSError:
+        return None
+
+
+def _read_git_head(start: Path) -> Optional[str]:
+    """Short SHA of HEAD read straight from the nearest .git directory.
+
+    Returns None when that isn't possible (no repository, a .git file as used
+    by worktrees and submodules, or an unexpected layout) so the caller can
+    fall back to running git.
+    """
+    for directory in (start, *start.parents):
+        git_dir = directory / ".git"
+        if git_dir.is_dir():
+            break
+        if git_dir.exists():
+            return None
+    else:
+        return None
+
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if head.startswith("ref: "):
+            ref = head[len("ref: "):]
+            ref_path = git_dir / ref
+            if ref_path.is_file():
+                head = ref_path.read_text().strip()
+            else:
+                head = ""
+                packed = git_dir / "packed-refs"
+                if packed.is_file():
+                    for line in packed.read_text().splitlines():
+                        sha, _, name = line.partition(" ")
+                        if name == ref:
+                            head = sha
+                            break
+    except OSError:
+        return None
+
+    if re.fullmatch(r'[0-9a-f]{40}(?:[0-9a-f]{24})?', head):
+        return head[:7]
+    return None
+
+
+def _github_env_token() -> Optional[str]:
+    """GitHub API token from GH_TOKEN or GITHUB_TOKEN, if set."""
+    return os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN") or None
+
+
 def check_requirements():
     """Verify required tools are installed"""
     log("Checking requirements...", "info")
     required = ["git", "curl", "systemctl"]
 
-    for tool in required:
-        if not shutil.which(tool):
+    # Walk $PATH once for all tools rather than once per shutil.which() call,
+    # stopping as soon as everything has been found.
+    missing = list(required)
+    for directory in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        if not missing:
+            break
+        directory = directory or os.curdir
+        missing = [
+            tool for tool in missing
+            if not _is_executable_file(os.path.join(directory, tool))
+        ]
+
+    if missing:
+        for tool in missing:
             log(f"Missing required tool: {tool}", "error")
-            sys.exit(1)
+        sys.exit(1)
 
     log("Requirements OK", "success")
 
@@ -202,19 +410,29 @@ def is_positive_number(value) -> bool:
     return isinstance(value, (int, float)) and value > 0
 
 
+# Patterns for the validators below, compiled once at import.  fullmatch()
+# is used so a trailing newline can't slip past a '$' anchor.
+OCTAL_MODE_PATTERN = re.compile(r'[0-7]{3,4}')
+SYSTEMD_MEMORY_PATTERN = re.compile(r'[0-9]+[KMGTkmgt]')
+SERVICE_NAME_PART_PATTERN = re.compile(r'[a-z][a-z0-9-]*')
+SLUG_PATTERN = re.compile(r'[a-zA-Z0-9][a-zA-Z0-9-]*')
+SHA256_PATTERN = re.compile(r'[0-9a-fA-F]{64}')
+SAFE_RUNNER_NAME_PATTERN = re.compile(r'[a-zA-Z0-9_-]+')
+
+
 def is_valid_octal_string(value) -> bool:
     """3-4 digit octal string, e.g. '755' or '0755'."""
-    return isinstance(value, str) and bool(re.match(r'^[0-7]{3,4}$', value))
+    return isinstance(value, str) and OCTAL_MODE_PATTERN.fullmatch(value) is not None
 
 
 def is_valid_systemd_memory(value) -> bool:
     """Digits followed by a single unit letter (K/M/G/T), e.g. '4G' or '512M'."""
-    return isinstance(value, str) and bool(re.match(r'^\d+[KMGTkmgt]$', value))
+    return isinstance(value, str) and SYSTEMD_MEMORY_PATTERN.fullmatch(value) is not None
 
 
 def is_valid_service_name_part(value) -> bool:
     """Lowercase letter followed by lowercase alphanumeric/hyphens."""
-    return isinstance(value, str) and bool(re.match(r'^[a-z][a-z0-9-]*$', value))
+    return isinstance(value, str) and SERVICE_NAME_PART_PATTERN.fullmatch(value) is not None
 
 
 def is_absolute_path(value) -> bool:
@@ -224,7 +442,12 @@ def is_absolute_path(value) -> bool:
 
 def is_valid_slug(value) -> bool:
     """Alphanumeric (may start with letter or digit) plus hyphens."""
-    return isinstance(value, str) and bool(re.match(r'^[a-zA-Z0-9][a-zA-Z0-9-]*$', value))
+    return isinstance(value, str) and SLUG_PATTERN.fullmatch(value) is not None
+
+
+def is_sha256_hex(value) -> bool:
+    """64 hex characters, e.g. a runner tarball checksum."""
+    return isinstance(value, str) and SHA256_PATTERN.fullmatch(value) is not None
 
 
 def is_valid_url_template(value, placeholders) -> bool:
@@ -255,6 +478,103 @@ def format_bytes_human(num_bytes: int) -> str:
     return f"{num_bytes}B"
 
 
+class GitHubAPIError(Exception):
+    """Non-2xx response from the GitHub REST API"""
+
+    def __init__(self, method: str, path: str, status: int, reason: str, body: str):
+        super().__init__(f"{method} {path} failed: HTTP {status} {reason}")
+        self.status = status
+        self.reason = reason
+        self.body = body
+
+
+class GitHubClient:
+    """Minimal GitHub REST client with keep-alive connections.
+
+    Each thread keeps one HTTPS connection open, so a deploy's API calls
+    (token, runner listing, label updates) reuse TCP/TLS instead of paying
+    a gh process start and a fresh handshake per call.
+    """
+
+    def __init__(self, token: str, host: str = GITHUB_API_HOST):
+        self.token = token
+        self.host = host
+        self._local = threading.local()
+
+    def _connection(self) -> "http.client.HTTPSConnection":
+        # http.client (and ssl with it) is imported on first use, so runs
+        # that never talk to the REST API don't pay for loading it.
+        import http.client
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = http.client.HTTPSConnection(self.host, timeout=30)
+            self._local.conn = conn
+        return conn
+
+    def request(self, method: str, path: str, body: Any = None) -> Any:
+        """Send a request and return the decoded JSON response (or None).
+
+        Raises GitHubAPIError for non-2xx responses and ConnectionError if
+        the request could not be completed (DNS, connect, TLS or timeout
+        errors included).  Only a reused keep-alive connection that the
+        server dropped is retried: any other failure may come after the
+        request was sent, and resending it is not always safe.
+        """
+        import http.client
+
+        headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": "2022-11-28",
+            "User-Agent": "gha-runnerd",
+        }
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+
+        # Retry once on a fresh connection if the server closed the idle one
+        for attempt in range(2):
+            reused = getattr(self._local, 'conn', None) is not None
+            conn = self._connection()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                self._local.conn = None
+                # RemoteDisconnected is a ConnectionResetError
+                dropped = isinstance(e, (ConnectionResetError, BrokenPipeError))
+                if attempt or not (reused and dropped):
+                    raise ConnectionError(f"{method} {path} failed: {e!r}") from e
+
+        if not 200 <= response.status < 300:
+            raise GitHubAPIError(method, path, response.status, response.reason,
+                                 data.decode(errors='replace'))
+        return json.loads(data) if data else None
+
+    def list_runners(self, api_runners: str) -> List[Dict[str, Any]]:
+        """All runners under an org/enterprise runners endpoint, across pages."""
+        runners = []
+        page = 1
+        while True:
+            result = self.request("GET", f"{api_runners}?per_page=100&page={page}")
+            batch = result.get('runners', [])
+            runners.extend(batch)
+            if len(batch) < 100:
+                return runners
+            page += 1
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
 class RunnerConfig:
     """Parsed runner configuration"""
 
@@ -277,28 +597,20 @@ class RunnerConfig:
         - cpu-medium-docker-1 → CPU runner for Docker builds
         - gpu-large-cuda-1 → GPU runner for CUDA workloads
         """
-        parts = self.name.split('-')
-        if len(parts) not in [3, 4]:
+        match = RUNNER_NAME_PATTERN.fullmatch(self.name)
+        if match is None:
             raise ValueError(
                 f"Invalid runner name '{self.name}'. "
                 f"Expected format: {{type}}-{{size}}-[{{category}}]-{{number}}"
             )
-
-        # Parse based on number of parts
-        if len(parts) == 3:
-            runner_type, size, number = parts
-            category = None
-        else:  # len(parts) == 4
-            runner_type, size, category, number = parts
-
-        # Validate number
-        try:
-            int(number)
-        except ValueError:
-            raise ValueError(f"Invalid number in runner name '{self.name}': '{number}'")
+        runner_type, size, category, number = match.group('type', 'size', 'category', 'number')
+        if number is None:
+            raise ValueError(
+                f"Invalid number in runner name '{self.name}': '{match['bad_number']}'"
+            )
 
         # Only allow 'cpu' or 'gpu'
-        if runner_type not in ['cpu', 'gpu']:
+        if runner_type not in RUNNER_TYPES:
             raise ValueError(
                 f"Invalid runner type '{runner_type}' in runner name '{self.name}'. "
                 f"Only 'cpu' and 'gpu' are allowed as runner types."
@@ -321,55 +633,35 @@ class RunnerConfig:
                 f"Available: {list(self.config['sizes'].keys())}"
             )
 
-        # Only allow cpu or gpu types
-        if self.parsed['type'] not in ['cpu', 'gpu']:
-            raise ValueError(
-                f"Invalid type '{self.parsed['type']}' in runner '{self.name}'. "
-                f"Only 'cpu' and 'gpu' are allowed. Use containers for custom environments."
-            )
-
-    @property
+    @cached_property
     def service_name(self) -> str:
         """Systemd service name"""
         prefix = self.config['github']['prefix']
         return f"gha-{prefix}-linux-{self.name}"
 
-    @property
+    @cached_property
     def registered_name(self) -> str:
         """GitHub registered runner name"""
         prefix = self.config['github']['prefix']
         return f"{prefix}-linux-{self.name}"
 
-    @property
+    @cached_property
     def labels(self) -> str:
         """Comma-separated labels for GitHub"""
-        parts = [
-            "self-hosted",
-            "linux",
-            self.config['host']['label'],
-        ]
-
-        # Add type (cpu or gpu)
-        parts.append(self.parsed['type'])
-
-        # Add size
-        parts.append(self.parsed['size'])
-
-        # Add category (generic if none specified)
-        if self.parsed['category']:
-            parts.append(self.parsed['category'])
-        else:
-            parts.append('generic')
-
-        return ','.join(parts)
+        # Category falls back to 'generic' when none is specified
+        category = self.parsed['category'] or 'generic'
+        return (
+            f"self-hosted,linux,{self.config['host']['label']},"
+            f"{self.parsed['type']},{self.parsed['size']},{category}"
+        )
 
-    @property
+    @cached_property
     def runner_path(self) -> str:
         """Host runner directory path"""
         base = self.config['host']['runner_base']
         return f"{base}/{self.registered_name}"
 
-    @property
+    @cached_property
     def size_config(self) -> Dict[str, Any]:
         """Resource limits for this runner"""
         return self.config['sizes'][self.parsed['size']]
@@ -383,9 +675,24 @@ class HostDeployer:
     def __init__(self, config_path: str = DEFAULT_CONFIG_PATH):
         self.config_path = Path(config_path).expanduser()
         self.config = self._load_config()
+        # Host settings used throughout a run.  .get() so that missing keys
+        # are reported by validate_config() rather than raising here.
+        host = self.config['host']
+        self.uid = host.get('docker_user_uid')
+        self.gid = host.get('docker_user_gid')
+        # uid:gid as passed to chown
+        self.owner = f"{self.uid}:{self.gid}"
+        self.runner_base = host.get('runner_base')
+        self.prefix = self.config['github'].get('prefix')
         self.runners = self._parse_runners()
-        self.git_sha = self._get_git_sha()
-        self.version_tag = self._get_version_tag()
+        self._tarball_lock = threading.Lock()
+        self._tarball_path: Optional[Path] = None
+        self._template_path: Optional[Path] = None
+        self._runners_lock = threading.Lock()
+        self._runners_cache: Optional[tuple] = None
+        # Set when unit files were removed; deploy() folds it into its one
+        # daemon-reload instead of reloading once per step.
+        self._daemon_reload_pending = False
 
     def _load_config(self) -> Dict[str, Any]:
         """Load and validate config.yml"""
@@ -393,15 +700,19 @@ class HostDeployer:
             log(f"Config file not found: {self.config_path}", "error")
             sys.exit(1)
 
-        with open(self.config_path) as f:
-            config = yaml.safe_load(f)
+        config = self._parse_config_file()
+
+        if not isinstance(config, dict):
+            log(f"Config file must contain a YAML mapping: {self.config_path}", "error")
+            sys.exit(1)
 
-        # Validate required sections
+        # Validate required sections (report all missing ones at once)
         required = ['github', 'host', 'runners', 'sizes', 'runner']
-        for section in required:
-            if section not in config:
-                log(f"Missing required section in config: {section}", "error")
-                sys.exit(1)
+        missing = [section for section in required if section not in config]
+        for section in missing:
+            log(f"Missing required section in config: {section}", "error")
+        if missing:
+            sys.exit(1)
 
         # Apply defaults for optional sections
         config.setdefault('cache', {})
@@ -447,16 +758,29 @@ class HostDeployer:
 
         return config
 
+    def _parse_config_file(self) -> Any:
+        """Parse config.yml with the fastest available YAML loader"""
+        if YamlLoader is not getattr(yaml, "CSafeLoader", None):
+            log_debug("PyYAML has no libyaml support; parsing config with the "
+                      "pure-Python loader (install libyaml and reinstall PyYAML to speed this up)")
+        with open(self.config_path, 'rb') as f:
+            return yaml.load(f, Loader=YamlLoader)
+
     def _parse_runners(self) -> List[RunnerConfig]:
-        """Parse all runner configurations"""
+        """Parse all runner configurations, reporting every invalid runner at once"""
         runners = []
+        errors = []
         for name in self.config['runners']:
             try:
                 runner = RunnerConfig(name, self.config)
                 runners.append(runner)
             except ValueError as e:
-                log(str(e), "error")
-                sys.exit(1)
+                errors.append(str(e))
+
+        for error in errors:
+            log(error, "error")
+        if errors:
+            sys.exit(1)
 
         return runners
 
@@ -465,12 +789,14 @@ class HostDeployer:
         log("Validating configuration...", "header")
         errors = []
         warnings = []
+        github = self.config.get('github', {})
+        sizes = self.config.get('sizes', {})
 
         # Check scope-specific settings
-        scope = self.config.get('github', {}).get('scope', 'org')
+        scope = github.get('scope', 'org')
 
         if scope == 'enterprise':
-            enterprise = self.config.get('github', {}).get('enterprise', '')
+            enterprise = github.get('enterprise', '')
             if enterprise in ['your-enterprise', '', None]:
                 errors.append(
                     "GitHub enterprise slug not set in config.yml "
@@ -478,14 +804,14 @@ class HostDeployer:
                 )
 
             # runner_group validation
-            runner_group = self.config.get('github', {}).get('runner_group', {})
+            runner_group = github.get('runner_group', {})
             rg_name = runner_group.get('name')
             if rg_name is not None and not isinstance(rg_name, str):
                 errors.append(
                     f"runner_group.name must be a string, got {rg_name!r}"
                 )
             if runner_group.get('allow_orgs'):
-                enterprise = self.config.get('github', {}).get('enterprise', '')
+                enterprise = github.get('enterprise', '')
                 errors.append(
                     "runner_group.allow_orgs is not supported — "
                     "manage organization access in the GitHub UI: "
@@ -493,14 +819,14 @@ class HostDeployer:
                     f"/settings/actions/runner-groups"
                 )
         else:
-            org = self.config.get('github', {}).get('org', '')
+            org = github.get('org', '')
             if org in ['your-org', '', None]:
                 errors.append(
                     "GitHub organization not set in config.yml "
                     "(still using placeholder 'your-org')"
                 )
 
-        prefix = self.config.get('github', {}).get('prefix', '')
+        prefix = github.get('prefix', '')
         if not prefix or prefix == '':
             errors.append("GitHub prefix not set in config.yml")
         elif not is_valid_service_name_part(prefix):
@@ -511,14 +837,14 @@ class HostDeployer:
 
         # Validate org/enterprise slug format (beyond placeholder checks above)
         if scope == 'enterprise':
-            ent_val = self.config.get('github', {}).get('enterprise', '')
+            ent_val = github.get('enterprise', '')
             if ent_val and ent_val not in ['your-enterprise', ''] and not is_valid_slug(ent_val):
                 errors.append(
                     f"GitHub enterprise slug '{ent_val}' is invalid — "
                     "must be alphanumeric with hyphens"
                 )
         else:
-            org_val = self.config.get('github', {}).get('org', '')
+            org_val = github.get('org', '')
             if org_val and org_val not in ['your-org', ''] and not is_valid_slug(org_val):
                 errors.append(
                     f"GitHub org '{org_val}' is invalid — "
@@ -526,7 +852,7 @@ class HostDeployer:
                 )
 
         # Validate runner_group fields (already checked name/allow_orgs above for enterprise)
-        runner_group = self.config.get('github', {}).get('runner_group', {})
+        runner_group = github.get('runner_group', {})
         # Check host configuration
         host_config = self.config.get('host', {})
         runner_base = host_config.get('runner_base')
@@ -590,27 +916,31 @@ class HostDeployer:
                     "'{version}' and '{arch}' placeholders"
                 )
 
+        sha256 = runner_config.get('sha256')
+        if sha256 is not None and not is_sha256_hex(sha256):
+            errors.append(
+                f"runner.sha256 must be a 64-character hex digest, got {sha256!r}"
+            )
+
         # Validate runners list
-        if not self.config.get('runners'):
+        runner_names = self.config.get('runners', [])
+        if not runner_names:
             errors.append("No runners defined in config.yml")
-        elif len(self.config['runners']) == 0:
+        elif len(runner_names) == 0:
             warnings.append("Runners list is empty - nothing to deploy")
 
-        # Validate runner names and sizes
-        for runner_name in self.config.get('runners', []):
-            try:
-                runner = RunnerConfig(runner_name, self.config)
-                # Check if size is defined
-                if runner.parsed['size'] not in self.config.get('sizes', {}):
-                    errors.append(f"Runner '{runner_name}' uses undefined size '{runner.parsed['size']}'")
-            except ValueError as e:
-                errors.append(f"Invalid runner name '{runner_name}': {e}")
+        # Validate runner sizes.  Runner names were already parsed into
+        # self.runners when the config was loaded (an invalid one stops the
+        # script there), so they are reused rather than parsed again.
+        for runner in self.runners:
+            if runner.parsed['size'] not in sizes:
+                errors.append(f"Runner '{runner.name}' uses undefined size '{runner.parsed['size']}'")
 
         # Validate sizes
-        if not self.config.get('sizes'):
+        if not sizes:
             errors.append("No sizes defined in config.yml")
         else:
-            for size_name, size_config in self.config['sizes'].items():
+            for size_name, size_config in sizes.items():
                 if size_name not in ['xs', 'small', 'medium', 'large', 'max']:
                     warnings.append(f"Non-standard size name '{size_name}' - expected: xs, small, medium, large, max")
 
@@ -688,10 +1018,9 @@ class HostDeployer:
             )
 
         # Check for duplicate runner names
-        runner_names = self.config.get('runners', [])
-        if len(runner_names) != len(set(runner_names)):
-            duplicates = [name for name in runner_names if runner_names.count(name) > 1]
-            errors.append(f"Duplicate runner names found: {set(duplicates)}")
+        duplicates = {name for name, count in Counter(runner_names).items() if count > 1}
+        if duplicates:
+            errors.append(f"Duplicate runner names found: {duplicates}")
 
         # Resource budget validation (max_cpus / max_memory)
         max_cpus = host_config.get('max_cpus')
@@ -717,7 +1046,7 @@ class HostDeployer:
                 check_mem_budget = False
 
         # If budget limits are active, require all sizes to have concrete values
-        sizes_config = self.config.get('sizes', {})
+        sizes_config = sizes
         if check_cpu_budget or check_mem_budget:
             for size_name, size_cfg in sizes_config.items():
                 if isinstance(size_cfg, dict):
@@ -739,9 +1068,9 @@ class HostDeployer:
             mem_items = []
             budget_errors_ok = True
 
-            for runner_name in self.config.get('runners', []):
+            for runner in self.runners:
+                runner_name = runner.name
                 try:
-                    runner = RunnerConfig(runner_name, self.config)
                     size_cfg = runner.size_config
                     cpus_val = size_cfg.get('cpus')
                     mem_val = size_cfg.get('mem_limit')
@@ -814,15 +1143,15 @@ class HostDeployer:
             log("\n✅ Configuration is valid!", "success")
             log(f"  • Scope: {scope}", "info")
             if scope == 'enterprise':
-                log(f"  • Enterprise: {self.config.get('github', {}).get('enterprise', '')}", "info")
-                runner_group = self.config.get('github', {}).get('runner_group', {})
+                log(f"  • Enterprise: {github.get('enterprise', '')}", "info")
+                runner_group = github.get('runner_group', {})
                 if runner_group.get('name'):
                     log(f"  • Runner group: {runner_group['name']}", "info")
             else:
-                log(f"  • Organization: {self.config.get('github', {}).get('org', '')}", "info")
+                log(f"  • Organization: {github.get('org', '')}", "info")
             log(f"  • Prefix: {prefix}", "info")
             log(f"  • Runners: {len(runner_names)}", "info")
-            log(f"  • Sizes: {len(self.config.get('sizes', {}))}", "info")
+            log(f"  • Sizes: {len(sizes)}", "info")
             return True
         elif not errors:
             log("\n✅ Configuration is valid (with warnings)", "success")
@@ -831,16 +1160,24 @@ class HostDeployer:
             log("\nPlease fix the errors above and try again.", "error")
             return False
 
-    def _get_git_sha(self) -> str:
-        """Get current git commit SHA"""
+    @cached_property
+    def git_sha(self) -> str:
+        """Current git commit SHA (computed on first use; commands that never
+        print the version don't fork git)"""
+        sha = _read_git_head(Path.cwd())
+        if sha:
+            return sha
         try:
-            result = run_cmd(["git", "rev-parse", "--short", "HEAD"], capture=True)
-            return result.stdout.strip()
+            output = subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            return output.strip().decode()
         except Exception:
             return "no-git"
 
-    def _get_version_tag(self) -> str:
-        """Generate version tag: YYYY.MM.DD-sha"""
+    @cached_property
+    def version_tag(self) -> str:
+        """Version tag: YYYY.MM.DD-sha"""
         date = datetime.now(timezone.utc).strftime("%Y.%m.%d")
         return f"{date}-{self.git_sha}"
 
@@ -875,16 +1212,120 @@ class HostDeployer:
         org = self.config['github']['org']
         return f"https://github.com/{org}"
 
+    @cached_property
+    def github_client(self) -> Optional[GitHubClient]:
+        """REST client when GH_TOKEN/GITHUB_TOKEN is set, else None (use gh)"""
+        token = _github_env_token()
+        return GitHubClient(token) if token else None
+
+    @cached_property
     def _gh_prefix(self) -> List[str]:
-        """Return command prefix to run gh as the original (non-root) user."""
+        """Command prefix to run gh as the original (non-root) user."""
         sudo_user = os.environ.get('SUDO_USER')
-        if sudo_user and os.geteuid() == 0:
+        if sudo_user and IS_ROOT:
             return ["sudo", "-u", sudo_user]
         return []
 
+    @cached_property
+    def _gh_available(self) -> bool:
+        """Whether the gh CLI is on PATH (looked up once per run)"""
+        return shutil.which("gh") is not None
+
+    def _github_runners(self) -> Dict[str, Dict[str, Any]]:
+        """Return GitHub's runners for this scope, keyed by runner name.
+
+        Each entry has id, status, busy and labels (custom labels only;
+        GitHub's read-only defaults such as "Linux" and "X64" are left out).
+        The listing is paginated, so it is kept for GITHUB_RUNNERS_TTL
+        seconds and shared by every lookup in a run; registering a runner
+        drops it.  Concurrent callers wait for one listing rather than each
+        fetching it.  Raises on API failure.
+        """
+        with self._runners_lock:
+            cached = self._runners_cache
+            if cached and time.monotonic() - cached[0] < GITHUB_RUNNERS_TTL:
+                return cached[1]
+            runners = self._fetch_github_runners()
+            self._runners_cache = (time.monotonic(), runners)
+            return runners
+
+    def _fetch_github_runners(self) -> Dict[str, Dict[str, Any]]:
+        """Page through GitHub's runner listing (see _github_runners)."""
+
+        api_runners = f"{self.api_base}/actions/runners"
+        runners = {}
+        client = self.github_client
+        if client:
+            for entry in client.list_runners(api_runners):
+                runners[entry['name']] = {
+                    'id': str(entry['id']),
+                    'status': entry.get('status', ''),
+                    'busy': bool(entry.get('busy')),
+                    'labels': [label['name'] for label in entry.get('labels', [])
+                               if label.get('type', 'custom') == 'custom'],
+                }
+        else:
+            cmd = self._gh_prefix + [
+                "gh", "api", "--paginate", api_runners,
+                "--jq", '.runners[] | [.name, .id, .status, .busy, '
+                        '(.labels | map(select((.type // "custom") == "custom") | .name)'
+                        ' | join(","))] | @tsv',
+            ]
+            result = run_cmd(cmd, capture=True, check=False)
+            if result.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    result.returncode, cmd, result.stdout, result.stderr)
+            for line in result.stdout.splitlines():
+                fields = line.split('\t')
+                if len(fields) == 5:
+                    name, runner_id, status, busy, labels = fields
+                    runners[name] = {
+                        'id': runner_id,
+                        'status': status,
+                        'busy': busy == 'true',
+                        'labels': labels.split(',') if labels else [],
+                    }
+        return runners
+
+    def _load_cached_token(self) -> Optional[str]:
+        """Return the cached registration token if it is still fresh."""
+        if TOKEN_CACHE_PATH is None:
+            return None
+        try:
+            cached = json.loads(TOKEN_CACHE_PATH.read_text())
+            if cached.get('api_base') != self.api_base:
+                return None
+            expires_at = datetime.fromisoformat(cached['expires_at'].replace('Z', '+00:00'))
+            if expires_at - datetime.now(timezone.utc) <= TOKEN_REFRESH_MARGIN:
+                return None
+            return cached['token'] or None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _save_cached_token(self, token: str, expires_at: Optional[str]):
+        """Persist a freshly fetched token; failures only cost a refetch."""
+        if DRY_RUN or not expires_at or TOKEN_CACHE_PATH is None:
+            return
+        try:
+            # Only our own directory is created; a missing runtime directory
+            # means no caching
+            TOKEN_CACHE_PATH.parent.mkdir(mode=0o700, exist_ok=True)
+            # mkstemp creates the file 0600, so the token is never world-readable
+            fd, temp_name = tempfile.mkstemp(dir=TOKEN_CACHE_PATH.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump({'api_base': self.api_base, 'token': token,
+                               'expires_at': expires_at}, f)
+                os.replace(temp_name, TOKEN_CACHE_PATH)
+            except BaseException:
+                Path(temp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            log_debug(f"Could not cache registration token: {e}")
+
     def fetch_github_token(self):
         """Fetch a fresh registration token from GitHub"""
-        gh_prefix = self._gh_prefix()
+        gh_prefix = self._gh_prefix
         api_path = f"{self.api_base}/actions/runners/registration-token"
         scope_label = (
             f"enterprise: {self.config['github']['enterprise']}"
@@ -894,22 +1335,39 @@ class HostDeployer:
 
         try:
             log(f"Fetching registration token for {scope_label}...", "info")
-            cmd = gh_prefix + ["gh", "api", "-X", "POST", api_path, "--jq", ".token"]
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            token = result.stdout.strip()
+            if self.github_client:
+                # Call the REST API directly: no gh process, no keyring unlock
+                # and no sudo -u $SUDO_USER hop.
+                response = self.github_client.request("POST", api_path)
+            else:
+                cmd = gh_prefix + ["gh", "api", "-X", "POST", api_path]
+                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+                response = json.loads(result.stdout or "{}")
+            token = response.get("token")
 
             if not token:
                 log("Failed to fetch token: empty response", "error")
                 return None
 
+            self._save_cached_token(token, response.get("expires_at"))
             return token
 
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, GitHubAPIError, OSError) as e:
             log("Failed to fetch registration token", "error")
-            if e.stderr:
-                log(f"Error: {e.stderr.strip()}", "error")
+            if isinstance(e, GitHubAPIError):
+                log(f"Error: HTTP {e.status} {e.reason}", "error")
+            elif isinstance(e, subprocess.CalledProcessError):
+                if e.stderr:
+                    log(f"Error: {e.stderr.strip()}", "error")
+            else:
+                log(f"Error: {e}", "error")
             log("Possible causes:", "error")
-            log("  • Not authenticated with gh CLI (run 'gh auth login')", "error")
+            if isinstance(e, OSError) and self.github_client:
+                log(f"  • Cannot reach {self.github_client.host} (check DNS, proxy and firewall)", "error")
+            if self.github_client:
+                log("  • GH_TOKEN/GITHUB_TOKEN is invalid or lacks admin scope", "error")
+            else:
+                log("  • Not authenticated with gh CLI (run 'gh auth login')", "error")
             if self.scope == 'enterprise':
                 log("  • Insufficient permissions for the enterprise", "error")
                 log("  • Enterprise slug incorrect in config.yml", "error")
@@ -936,10 +1394,16 @@ class HostDeployer:
                 return True
 
         if not token:
+            token = self._load_cached_token()
+            if token:
+                os.environ["REGISTER_GITHUB_RUNNER_TOKEN"] = token
+                log("Using cached registration token", "success")
+                return True
+
             log("Fetching fresh registration token...", "warning")
 
-            # Check if gh CLI is available
-            if not shutil.which("gh"):
+            # Check if gh CLI is available (not needed with a token in the environment)
+            if not self.github_client and not self._gh_available:
                 log("GitHub CLI (gh) not found. Cannot fetch token automatically.", "error")
                 log("Install gh CLI or manually set REGISTER_GITHUB_RUNNER_TOKEN", "error")
                 return False
@@ -960,81 +1424,195 @@ class HostDeployer:
         """Create runner directories with proper ownership"""
         log("Ensuring runner directories exist...", "info")
 
-        base = self.config['host']['runner_base']
+        base = self.runner_base
         base_path = Path(base)
-        uid = self.config['host']['docker_user_uid']
-        gid = self.config['host']['docker_user_gid']
+        owner = self.owner
 
         log_debug(f"Base directory: {base_path}")
-        log_debug(f"Owner UID:GID: {uid}:{gid}")
+        log_debug(f"Owner UID:GID: {owner}")
 
-        # Ensure base directory exists
-        if not base_path.exists() or DRY_RUN:
-            log(f"Creating {base}...", "info")
-            run_cmd(
-                ["mkdir", "-p", str(base_path)],
-                sudo=True,
-                sudo_reason=f"creating runner base directory {base_path}",
-                dry_run_msg=f"Create base directory {base_path}"
-            )
-
-        # Create individual runner directories
-        for runner in self.runners:
-            path = Path(runner.runner_path)
-            if not path.exists() or DRY_RUN:
-                log(f"Creating {path}...", "info")
-                run_cmd(
-                    ["mkdir", "-p", str(path)],
-                    sudo=True,
-                    sudo_reason=f"creating runner directory {path}",
-                    dry_run_msg=f"Create runner directory {path}"
-                )
-
-        # Set ownership
-        log(f"Setting ownership {uid}:{gid} on {base}...", "info")
-        run_cmd(
-            ["chown", "-R", f"{uid}:{gid}", str(base_path)],
-            sudo=True,
-            sudo_reason=f"setting ownership on {base_path}",
-            dry_run_msg=f"Set ownership {uid}:{gid} on {base_path}"
-        )
-
-        # Create shared cache directory for corca-ai/local-cache
-        # Used as a general cache across ecosystems (e.g. Poetry, npm, Cargo)
         cache_dir = Path(self.config['cache']['base_dir'])
-        if not cache_dir.exists() or DRY_RUN:
-            log(f"Creating shared cache directory {cache_dir}...", "info")
-            run_cmd(
-                ["mkdir", "-p", str(cache_dir)],
-                sudo=True,
-                sudo_reason=f"creating shared cache directory {cache_dir}",
-                dry_run_msg=f"Create cache directory {cache_dir}"
-            )
-        # Always ensure correct ownership/permissions (fix if directory exists with wrong perms)
-        run_cmd(
-            ["chown", f"{uid}:{gid}", str(cache_dir)],
-            sudo=True,
-            sudo_reason=f"setting cache directory ownership",
-            dry_run_msg=f"Set cache directory ownership {uid}:{gid}"
-        )
         cache_perms = self.config['cache']['permissions']
+
+        # Collect every missing directory so a single mkdir creates them all.
+        # Runner directories all live directly under the base, so one listing
+        # of it answers for every runner instead of a stat per runner.
+        wanted = [base_path] + [Path(r.runner_path) for r in self.runners] + [cache_dir]
+        base_entries = None if DRY_RUN else _list_dir(base_path)
+        missing = [
+            path for path in wanted
+            if DRY_RUN or not (
+                path.name in base_entries
+                if base_entries is not None and path.parent == base_path
+                else path.exists()
+            )
+        ]
+        for path in missing:
+            log(f"Creating {path}...", "info")
+
+        # One privileged shell for mkdir/chown/chmod instead of a sudo per call.
+        # The shared cache directory is used by corca-ai/local-cache as a
+        # general cache across ecosystems (e.g. Poetry, npm, Cargo); its
+        # ownership and permissions are always reapplied in case they drifted.
+        commands = []
+        if missing:
+            commands.append("mkdir -p " + shlex.join(str(p) for p in missing))
+        commands.append(_chown_tree_cmd(base_path, owner))
+        commands.append(f"chown {shlex.quote(owner)} {shlex.quote(str(cache_dir))}")
+        commands.append(f"chmod {shlex.quote(str(cache_perms))} {shlex.quote(str(cache_dir))}")
+
+        log(f"Setting ownership {owner} on {base}...", "info")
         run_cmd(
-            ["chmod", cache_perms, str(cache_dir)],
+            ["bash", "-c", "set -e; " + "; ".join(commands)],
             sudo=True,
-            sudo_reason=f"setting cache directory permissions",
-            dry_run_msg=f"Set cache directory permissions {cache_perms}"
+            sudo_reason=f"creating runner directories under {base_path}",
+            dry_run_msg=(
+                f"Create directories and set ownership {owner} on {base_path}, "
+                f"cache directory {cache_dir} ({cache_perms})"
+            )
         )
-        log("Shared cache directory ready", "success")
 
         log("Directories ready", "success")
 
-    def install_dependencies(self, runner: RunnerConfig):
-        """No dependencies needed - everything runs in containers!"""
+    def install_dependencies(self, runners: List[RunnerConfig]):
+        """No dependencies needed - everything runs in containers!
+
+        Called once for all runners, so any host packages added here in
+        future get a single package-manager run rather than one per runner.
+        """
         # Generic runners (cpu/gpu) don't need any host dependencies
         # All dependencies should be in container images
-        log(f"No host dependencies for {runner.parsed['type']} runner (use containers!)", "info")
+        types = sorted({runner.parsed['type'] for runner in runners})
+        log(f"No host dependencies for {'/'.join(types)} runners (use containers!)", "info")
         return
 
+    def _ensure_tarball_cached(self) -> Path:
+        """Download the runner tarball into the shared cache if not already there.
+
+        Runners deployed in parallel share one download: threads serialize on
+        an in-process lock, and the download itself runs under flock(1) so
+        concurrent deploy-host.py processes don't race either.  The file is
+        written to a .part file and renamed into place only after the
+        optional runner.sha256 checksum matches.
+        """
+        with self._tarball_lock:
+            if self._tarball_path is not None:
+                return self._tarball_path
+
+            version = self.config['runner']['version']
+            arch = self.config['runner']['arch']
+
+            # Use custom download URL template if provided, otherwise use default GitHub releases
+            url_template = self.config['runner'].get(
+                'download_url_template',
+                'https://github.com/actions/runner/releases/download/v{version}/actions-runner-{arch}-{version}.tar.gz'
+            )
+            tarball_url = url_template.format(version=version, arch=arch)
+            cache_dir = Path(RUNNER_TARBALL_CACHE_DIR)
+            tarball = cache_dir / f"actions-runner-{arch}-{version}.tar.gz"
+
+            log_debug(f"Runner version: {version}")
+            log_debug(f"Architecture: {arch}")
+            log_debug(f"Download URL: {tarball_url}")
+            log_debug(f"Cached tarball: {tarball}")
+
+            # A tarball cached before runner.sha256 was set (or changed) was
+            # never checked against it; drop it, and the runner template
+            # unpacked from it, so it is downloaded and verified again.
+            sha256 = self.config['runner'].get('sha256')
+            if sha256 and tarball.exists() and not DRY_RUN:
+                try:
+                    mismatch = _file_sha256(tarball) != sha256.lower()
+                except OSError as e:
+                    log_debug(f"Could not hash cached tarball: {e}")
+                    mismatch = False
+                if mismatch:
+                    log("Cached runner tarball does not match runner.sha256, downloading again", "warning")
+                    template = cache_dir / f"actions-runner-{arch}-{version}"
+                    run_cmd(
+                        ["flock", str(cache_dir / ".lock"),
+                         "rm", "-rf", str(tarball), str(template)],
+                        sudo=True,
+                        sudo_reason=f"removing mismatched runner tarball from {cache_dir}"
+                    )
+
+            if tarball.exists() and not DRY_RUN:
+                log(f"Using cached runner tarball: {tarball}", "info")
+            else:
+                quoted = shlex.quote(str(tarball))
+                part = shlex.quote(f"{tarball}.part")
+                verify = ""
+                if sha256:
+                    verify = f"echo {shlex.quote(f'{sha256.lower()}  {tarball}.part')} | sha256sum -c --quiet - && "
+                script = (
+                    f"mkdir -p {shlex.quote(str(cache_dir))} && "
+                    f"exec flock {shlex.quote(str(cache_dir / '.lock'))} sh -c "
+                    + shlex.quote(
+                        f"[ -f {quoted} ] || {{ "
+                        f"curl -fsSL --retry 3 --retry-connrefused "
+                        f"-o {part} {shlex.quote(tarball_url)} && "
+                        f"{verify}mv -f {part} {quoted}; "
+                        f"}} || {{ rm -f {part}; exit 1; }}"
+                    )
+                )
+                log(f"Downloading runner v{version}...", "info")
+                run_cmd(
+                    ["bash", "-c", script],
+                    sudo=True,
+                    sudo_reason=f"downloading runner binary to {cache_dir}",
+                    dry_run_msg=f"Download runner v{version} from GitHub to {tarball}"
+                )
+
+            self._tarball_path = tarball
+            return tarball
+
+    def _ensure_runner_template(self) -> Path:
+        """Extract the cached runner tarball once into a shared template dir.
+
+        The template sits next to the tarball and is only renamed into place
+        once extraction finishes, so its existence marks it complete.  Runner
+        directories are then populated from it with copies.  pigz is used
+        for decompression when installed (it inflates on a separate thread
+        from reading and CRC checking), else gzip.
+
+        The template must stay root-owned: runners execute copies of it.  A
+        template whose files are not (e.g. hardlinked into runner directories
+        and chowned by an older version) is extracted again.
+        """
+        tarball = self._ensure_tarball_cached()
+        with self._tarball_lock:
+            if self._template_path is not None:
+                return self._template_path
+
+            template = tarball.parent / tarball.name[:-len(".tar.gz")]
+            marker = template / "config.sh"
+            if not DRY_RUN and _owner_uid(marker) == 0:
+                log_debug(f"Using runner template: {template}")
+            else:
+                quoted = shlex.quote(str(template))
+                part = shlex.quote(f"{template}.part")
+                script = (
+                    f"exec flock {shlex.quote(str(tarball.parent / '.lock'))} sh -c "
+                    + shlex.quote(
+                        f"[ \"$(stat -c %u {shlex.quote(str(marker))} 2>/dev/null)\" = 0 ] || {{ "
+                        f"rm -rf {part} && mkdir {part} && "
+                        f"tar -x -I \"$(command -v pigz || echo gzip)\" "
+                        f"-f {shlex.quote(str(tarball))} -C {part} && "
+                        f"rm -rf {quoted} && mv {part} {quoted}; "
+                        f"}} || {{ rm -rf {part}; exit 1; }}"
+                    )
+                )
+                log("Extracting runner...", "info")
+                run_cmd(
+                    ["bash", "-c", script],
+                    sudo=True,
+                    sudo_reason=f"extracting runner binary to {template}",
+                    dry_run_msg=f"Extract runner to {template}"
+                )
+
+            self._template_path = template
+            return template
+
     def install_runner_binary(self, runner: RunnerConfig):
         """Download and extract GitHub Actions runner binary"""
         runner_path = Path(runner.runner_path)
@@ -1048,59 +1626,39 @@ class HostDeployer:
 
         log(f"Installing runner binary for {runner.registered_name}...", "info")
 
-        version = self.config['runner']['version']
-        arch = self.config['runner']['arch']
-
-        # Use custom download URL template if provided, otherwise use default GitHub releases
-        url_template = self.config['runner'].get(
-            'download_url_template',
-            'https://github.com/actions/runner/releases/download/v{version}/actions-runner-{arch}-{version}.tar.gz'
+        template = self._ensure_runner_template()
+        self._copy_runner_files(
+            template, runner_path, self.owner,
+            sudo_reason=f"installing runner binary to {runner_path}",
         )
-        tarball_url = url_template.format(version=version, arch=arch)
-        tarball_path = runner_path / "runner.tar.gz"
 
-        log_debug(f"Runner version: {version}")
-        log_debug(f"Architecture: {arch}")
-        log_debug(f"Download URL: {tarball_url}")
-
-        # Download runner tarball
-        log(f"Downloading runner v{version}...", "info")
-        run_cmd(
-            ["curl", "-fsSL", "-o", str(tarball_path), tarball_url],
-            sudo=True,
-            sudo_reason=f"downloading runner binary to {runner_path}",
-            dry_run_msg=f"Download runner v{version} from GitHub"
-        )
-
-        # Extract tarball
-        log("Extracting runner...", "info")
-        run_cmd(
-            ["tar", "xzf", str(tarball_path), "-C", str(runner_path)],
-            sudo=True,
-            sudo_reason=f"extracting runner binary to {runner_path}",
-            dry_run_msg=f"Extract runner to {runner_path}"
-        )
-
-        # Remove tarball
-        run_cmd(
-            ["rm", "-f", str(tarball_path)],
-            sudo=True,
-            sudo_reason=f"removing runner tarball",
-            dry_run_msg=f"Remove tarball {tarball_path}"
-        )
+        log(f"Runner binary installed at {runner_path}", "success")
 
-        # Fix ownership
-        uid = self.config['host']['docker_user_uid']
-        gid = self.config['host']['docker_user_gid']
+    def _copy_runner_files(self, template: Path, runner_path: Path, owner: str,
+                           sudo_reason: str):
+        """Populate a runner directory from the unpacked runner template.
+
+        Copy the unpacked runner instead of extracting it again.  The files
+        are not hardlinked: the runner directory is chowned to the runner
+        user, which would also hand the shared root-owned template to every
+        job.  --remove-destination replaces files left as hardlinks by older
+        versions instead of writing through them, and --reflink=auto shares
+        extents on CoW filesystems (coreutils copies in-kernel via
+        copy_file_range otherwise).  Files that are not in the template
+        (_work, registration files) are left alone.  Ownership is fixed in
+        the same privileged shell.
+        """
+        src = shlex.quote(f"{template}/.")
+        dst = shlex.quote(str(runner_path))
         run_cmd(
-            ["chown", "-R", f"{uid}:{gid}", str(runner_path)],
+            ["bash", "-c",
+             f"cp -a --reflink=auto --remove-destination {src} {dst}"
+             f" && {_chown_tree_cmd(runner_path, owner)}"],
             sudo=True,
-            sudo_reason=f"setting runner binary ownership to ci-docker user",
-            dry_run_msg=f"Set runner directory ownership {uid}:{gid}"
+            sudo_reason=sudo_reason,
+            dry_run_msg=f"Copy runner files from {template} into {runner_path} (owner {owner})"
         )
 
-        log(f"Runner binary installed at {runner_path}", "success")
-
     def register_runner(self, runner: RunnerConfig):
         """Register or reconfigure runner with GitHub"""
         token = os.environ.get("REGISTER_GITHUB_RUNNER_TOKEN")
@@ -1124,6 +1682,7 @@ class HostDeployer:
         labels_file = runner_path / ".labels"
 
         need_config = True
+        previously_registered = False
 
         if not DRY_RUN:
             result = run_cmd(
@@ -1131,6 +1690,7 @@ class HostDeployer:
                 sudo=True, check=False, capture=True,
             )
             if result and result.returncode == 0:
+                previously_registered = True
                 current_labels = result.stdout.strip()
                 log_debug(f"Current labels: {current_labels}")
                 if current_labels == runner.labels:
@@ -1138,10 +1698,25 @@ class HostDeployer:
                     need_config = False
                 else:
                     log(f"Labels changed, reconfiguring runner...", "info")
+            else:
+                # No .labels: a fresh runner, unless it was configured by
+                # hand or by an older version (.runner present) or its
+                # service is still running.
+                result = run_cmd(
+                    ["bash", "-c",
+                     f"test -e {shlex.quote(str(runner_path / '.runner'))}"
+                     f" || test -e {shlex.quote(str(runner_path / '.runner_migrated'))}"
+                     f" || systemctl is-active --quiet {shlex.quote(runner.service_name)}.service"],
+                    sudo=True, check=False, capture=True,
+                )
+                previously_registered = bool(result and result.returncode == 0)
 
         if need_config or DRY_RUN:
-            # Always ensure clean state before (re)configuring
-            if not DRY_RUN:
+            # Stop and deregister a runner that was configured before.  A
+            # fresh runner has nothing to stop or remove: the rm -f below
+            # clears any partial local state and --replace takes over a
+            # stale registration of the same name on GitHub.
+            if previously_registered:
                 self._unconfigure_runner(runner, token)
 
             # Run config.sh
@@ -1163,8 +1738,8 @@ class HostDeployer:
                 log("runner_group.name is ignored for org-scoped runners (enterprise only)", "warning")
 
             # Run as the runner user
-            uid = self.config['host']['docker_user_uid']
-            gid = self.config['host']['docker_user_gid']
+            uid = self.uid
+            gid = self.gid
 
             log_debug(f"Running config.sh as UID {uid}, GID {gid}")
 
@@ -1176,12 +1751,15 @@ class HostDeployer:
                 # Remove ALL runner config files before config.sh in the SAME
                 # shell — the runner checks both .runner and .runner_migrated
                 # in IsConfigured(), so both must be gone.
-                config_cmd_str = ' '.join(shlex.quote(arg) for arg in config_cmd)
+                # The .labels file is written by the same shell once config.sh
+                # succeeds; running as the runner user, it gets the right
+                # owner without separate sudo cp/chown calls.
                 rp = shlex.quote(str(runner_path))
                 shell_cmd = (
                     f"cd {rp}"
                     f" && rm -f {' '.join(RUNNER_CONFIG_FILES)}"
-                    f" && {config_cmd_str}"
+                    f" && {shlex.join(config_cmd)}"
+                    f" && printf %s {shlex.quote(runner.labels)} > .labels"
                 )
                 result = run_cmd(
                     ["sudo", "-u", f"#{uid}", "-g", f"#{gid}",
@@ -1209,27 +1787,10 @@ class HostDeployer:
                     else:
                         log("Re-run with --verbose for more details.", "info")
                     sys.exit(1)
+                self._runners_cache = None
 
-            # Save labels (runner dir is owned by runner user, write via sudo)
             if DRY_RUN:
                 log_dry_run(f"Save labels to {labels_file}")
-            else:
-                temp_labels = Path(f"/tmp/gha-labels-{os.getpid()}")
-                try:
-                    temp_labels.write_text(runner.labels)
-                    run_cmd(
-                        ["cp", str(temp_labels), str(labels_file)],
-                        sudo=True,
-                        sudo_reason="saving labels file",
-                    )
-                    run_cmd(
-                        ["chown", f"{uid}:{gid}", str(labels_file)],
-                        sudo=True,
-                        sudo_reason="setting labels file ownership",
-                    )
-                finally:
-                    if temp_labels.exists():
-                        temp_labels.unlink()
 
             log(f"Registered {runner.registered_name}", "success")
 
@@ -1268,12 +1829,11 @@ class HostDeployer:
             "--token", token
         ]
 
-        uid = self.config['host']['docker_user_uid']
+        uid = self.uid
 
         try:
             result = run_cmd(
-                ["sudo", "-u", f"#{uid}", "bash", "-c",
-                 f"cd {shlex.quote(str(runner_path))} && {' '.join(shlex.quote(arg) for arg in remove_cmd)}"],
+                ["sudo", "-u", f"#{uid}", "env", f"--chdir={runner_path}"] + remove_cmd,
                 check=False, capture=True,
             )
             if result and result.returncode != 0:
@@ -1286,9 +1846,7 @@ class HostDeployer:
         """Generate the pre-job cleanup hook script content"""
         runner_path = Path(runner.runner_path)
         work_path = runner_path / "_work"
-
-        uid = self.config['host']['docker_user_uid']
-        gid = self.config['host']['docker_user_gid']
+        owner = self.owner
 
         # The GitHub Actions runner bind-mounts _work/_temp/_github_home as
         # /github/home inside containers (HOME=/github/home).  Tool installers
@@ -1306,7 +1864,7 @@ WORK_DIR="{work_path}"
 
 if [ -d "$WORK_DIR" ]; then
     # Fix ownership of any files not owned by the runner user
-    sudo /usr/bin/chown -R {uid}:{gid} "$WORK_DIR" 2>/dev/null || true
+    sudo /usr/bin/chown -R {owner} "$WORK_DIR" 2>/dev/null || true
 fi
 
 # Remove tool installations from previous container runs
@@ -1325,52 +1883,70 @@ fi
 HOME_LOCAL="{runner_path}/.local"
 if [ -d "$HOME_LOCAL" ]; then
     echo "[cleanup-hook] Removing stale $HOME_LOCAL from previous run"
-    sudo /usr/bin/chown -R {uid}:{gid} "$HOME_LOCAL" 2>/dev/null || true
+    sudo /usr/bin/chown -R {owner} "$HOME_LOCAL" 2>/dev/null || true
     rm -rf "$HOME_LOCAL" 2>/dev/null || true
 fi
 """
 
+    def _install_content(self, content: str, dest: Path, owner, group, mode: str,
+                         sudo_reason: str, validate: Optional[str] = None):
+        """Write content to dest with the given owner, group and mode.
+
+        The content is piped into a single privileged shell, so there is no
+        user-side temp file to write, copy and clean up.  It is written to a
+        dotted sibling (skipped by sudoers.d includes and by systemd) that
+        is renamed over dest, so a partial sudoers file or unit is never
+        visible.  If given, validate is run on the staged file first; its
+        failure exits with INSTALL_VALIDATION_FAILED.
+        """
+        staged = shlex.quote(f"{dest}.tmp")
+        steps = ["umask 077", f"cat > {staged}"]
+        if validate:
+            steps.append(f"{{ {validate} {staged} || (exit {INSTALL_VALIDATION_FAILED}); }}")
+        steps += [
+            f"chown {shlex.quote(f'{owner}:{group}')} {staged}",
+            f"chmod {mode} {staged}",
+            f"mv -f {staged} {shlex.quote(str(dest))}",
+        ]
+        run_cmd(
+            ["bash", "-c",
+             f"{{ {' && '.join(steps)}; }} || {{ status=$?; rm -f {staged}; exit $status; }}"],
+            sudo=True,
+            sudo_reason=sudo_reason,
+            dry_run_msg=f"Install {dest} (owner {owner}:{group}, mode {mode})",
+            input=content,
+        )
+
     def create_cleanup_hook(self, runner: RunnerConfig):
         """Create a pre-job cleanup script that fixes workspace permissions and removes stale tool installations"""
         runner_path = Path(runner.runner_path)
         hook_path = runner_path / "cleanup-workspace.sh"
 
-        uid = self.config['host']['docker_user_uid']
-        gid = self.config['host']['docker_user_gid']
-
         log(f"Creating cleanup hook for {runner.registered_name}...", "info")
 
         hook_content = self.generate_hook_content(runner)
 
-        # Write to /tmp first, then copy with sudo
-        temp_path = Path(f"/tmp/cleanup-workspace-{os.getpid()}.sh")
-        temp_path.write_text(hook_content)
-        temp_path.chmod(0o755)
+        # Skip the privileged install when content, owner and mode are
+        # already right; a mere metadata drift still gets reinstalled.
+        if _read_text_or_none(hook_path) == hook_content:
+            try:
+                st = hook_path.stat()
+            except OSError:
+                st = None
+            if st and (st.st_uid, st.st_gid, stat.S_IMODE(st.st_mode)) == (self.uid, self.gid, 0o755):
+                log(f"Cleanup hook for {runner.registered_name} unchanged", "info")
+                return
 
-        run_cmd(
-            ["cp", str(temp_path), str(hook_path)],
-            sudo=True,
-            sudo_reason=f"installing cleanup hook script"
-        )
-        run_cmd(
-            ["chown", f"{uid}:{gid}", str(hook_path)],
-            sudo=True,
-            sudo_reason=f"setting cleanup hook ownership"
-        )
-        run_cmd(
-            ["chmod", "755", str(hook_path)],
-            sudo=True,
-            sudo_reason=f"setting cleanup hook permissions"
-        )
-        temp_path.unlink()
+        self._install_content(hook_content, hook_path, self.uid, self.gid, "755",
+                              sudo_reason="installing cleanup hook script")
 
         log(f"Cleanup hook created at {hook_path}", "success")
 
     def generate_sudoers_content(self):
         """Generate the sudoers configuration content"""
-        uid = self.config['host']['docker_user_uid']
-        gid = self.config['host']['docker_user_gid']
-        base = self.config['host']['runner_base']
+        uid = self.uid
+        gid = self.gid
+        base = self.runner_base
 
         return f"""# Allow GitHub Actions runner user to fix workspace and tool installation permissions
 # Managed by deploy-host.py - do not edit manually
@@ -1386,49 +1962,36 @@ Defaults:#{uid} !requiretty
 
         sudoers_content = self.generate_sudoers_content()
 
-        # Write to /tmp first (user-writable), then move with sudo
-        temp_path = Path(f"/tmp/gha-runner-cleanup-{os.getpid()}.sudoers")
-        temp_path.write_text(sudoers_content)
-        temp_path.chmod(0o440)
-
-        # Validate sudoers syntax before installing
+        # Validate sudoers syntax on the staged file before it is renamed
+        # into place, in the same privileged shell that installs it
         try:
-            run_cmd(
-                ["visudo", "-c", "-f", str(temp_path)],
-                sudo=True,
-                sudo_reason="validating sudoers configuration",
-                capture=True
+            self._install_content(
+                sudoers_content, sudoers_path, "root", "root", "440",
+                sudo_reason="validating and installing sudoers configuration for workspace cleanup",
+                validate="visudo -c -q -f",
             )
-        except subprocess.CalledProcessError:
-            temp_path.unlink()
+        except subprocess.CalledProcessError as e:
+            if e.returncode != INSTALL_VALIDATION_FAILED:
+                raise
             log("Sudoers file validation failed!", "error")
             log("The generated sudoers content did not pass visudo -c validation.", "error")
             log("This is likely a bug in deploy-host.py — please report it.", "error")
             sys.exit(1)
-
-        # Move into place with sudo
-        run_cmd(
-            ["cp", str(temp_path), str(sudoers_path)],
-            sudo=True,
-            sudo_reason="installing sudoers configuration for workspace cleanup"
-        )
-        run_cmd(
-            ["chmod", "440", str(sudoers_path)],
-            sudo=True,
-            sudo_reason="setting sudoers file permissions"
-        )
-        temp_path.unlink()
         log("Sudoers configured for workspace cleanup", "success")
 
-    def create_systemd_service(self, runner: RunnerConfig):
-        """Create and enable systemd service for runner"""
+    def write_systemd_service(self, runner: RunnerConfig) -> bool:
+        """Write the systemd unit file for runner (no reload/start).
+
+        Returns False without touching anything if the installed unit
+        already has the same content.
+        """
         log(f"Creating systemd service for {runner.registered_name}...", "info")
 
         service_name = f"{runner.service_name}.service"
         service_path = Path(f"/etc/systemd/system/{service_name}")
 
-        uid = self.config['host']['docker_user_uid']
-        gid = self.config['host']['docker_user_gid']
+        uid = self.uid
+        gid = self.gid
         runner_path = runner.runner_path
         size_cfg = runner.size_config
         hook_path = f"{runner_path}/cleanup-workspace.sh"
@@ -1479,7 +2042,11 @@ Environment="ACTIONS_RUNNER_HOOK_JOB_STARTED={hook_path}"
 WantedBy=multi-user.target
 """
 
-        # Write service file (write to /tmp first, then copy with sudo)
+        if _read_text_or_none(service_path) == service_content:
+            log(f"Service file for {runner.registered_name} unchanged", "info")
+            return False
+
+        # Write service file
         if DRY_RUN:
             log_dry_run(f"Write systemd service file to {service_path}")
             if VERBOSE:
@@ -1488,17 +2055,12 @@ WantedBy=multi-user.target
                     if line.strip():
                         log_debug(f"  {line}")
         else:
-            temp_path = Path(f"/tmp/gha-service-{os.getpid()}.service")
-            temp_path.write_text(service_content)
-            temp_path.chmod(0o644)
-            run_cmd(
-                ["cp", str(temp_path), str(service_path)],
-                sudo=True,
-                sudo_reason=f"installing systemd service file for {service_name}"
-            )
-            temp_path.unlink()
+            self._install_content(service_content, service_path, "root", "root", "644",
+                                  sudo_reason=f"installing systemd service file for {service_name}")
+        return True
 
-        # Reload systemd, enable and start service
+    def reload_systemd(self):
+        """Reload systemd so it picks up new or changed unit files"""
         log("Reloading systemd daemon...", "info")
         run_cmd(
             ["systemctl", "daemon-reload"],
@@ -1506,27 +2068,51 @@ WantedBy=multi-user.target
             sudo_reason="reloading systemd after service file changes",
             dry_run_msg="Reload systemd daemon"
         )
+        self._daemon_reload_pending = False
 
-        log(f"Enabling service {service_name}...", "info")
-        run_cmd(
-            ["systemctl", "enable", service_name],
-            sudo=True,
-            sudo_reason=f"enabling systemd service {service_name}",
-            dry_run_msg=f"Enable service {service_name}"
-        )
+    def start_systemd_services(self, runners: List[RunnerConfig], restart: bool = True):
+        """Enable and (re)start the systemd services for runners.
 
-        log(f"Starting service {service_name}...", "info")
-        run_cmd(
-            ["systemctl", "restart", service_name],
-            sudo=True,
-            sudo_reason=f"starting runner service {service_name}",
-            dry_run_msg=f"Start service {service_name}"
-        )
+        systemctl accepts several units per call, so all runners share one
+        enable and one restart instead of two invocations each.  With
+        restart=False the services are only started, leaving running ones
+        (and their jobs) alone; that is a single 'enable --now'.
+        """
+        if not runners:
+            return
+        services = [f"{runner.service_name}.service" for runner in runners]
+        service_list = ' '.join(services)
 
-        log(f"Service {service_name} created and started", "success")
+        if not restart:
+            log(f"Enabling and starting service(s) {service_list}...", "info")
+            run_cmd(
+                ["systemctl", "enable", "--now"] + services,
+                sudo=True,
+                sudo_reason=f"enabling and starting runner service(s) {service_list}",
+                dry_run_msg=f"Enable and start service(s) {service_list}"
+            )
+        else:
+            log(f"Enabling service(s) {service_list}...", "info")
+            run_cmd(
+                ["systemctl", "enable"] + services,
+                sudo=True,
+                sudo_reason=f"enabling systemd service(s) {service_list}",
+                dry_run_msg=f"Enable service(s) {service_list}"
+            )
+
+            log(f"Restarting service(s) {service_list}...", "info")
+            run_cmd(
+                ["systemctl", "restart"] + services,
+                sudo=True,
+                sudo_reason=f"starting runner service(s) {service_list}",
+                dry_run_msg=f"Restart service(s) {service_list}"
+            )
+
+        for service_name in services:
+            log(f"Service {service_name} {'created and started' if restart else 'started'}", "success")
 
     def sync_labels_via_api(self):
-        """Sync labels via GitHub API (requires gh CLI)"""
+        """Sync labels via GitHub API (GH_TOKEN/GITHUB_TOKEN or gh CLI)"""
         if not self.config.get('github_api', {}).get('enforce_labels', False):
             log("Label sync disabled in config", "info")
             return
@@ -1535,33 +2121,52 @@ WantedBy=multi-user.target
             log("No registration token - skipping label sync", "info")
             return
 
-        if not shutil.which("gh"):
+        client = self.github_client
+        if not client and not self._gh_available:
             log("'gh' CLI not found, skipping label sync", "warning")
             return
 
         log("Syncing labels via GitHub API...", "header")
 
-        gh_prefix = self._gh_prefix()
+        gh_prefix = self._gh_prefix
         api_runners = f"{self.api_base}/actions/runners"
 
-        for runner in self.runners:
-            try:
-                cmd = gh_prefix + ["gh", "api", "--paginate", api_runners,
-                     "--jq", f'.runners[] | select(.name=="{runner.registered_name}") | .id']
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-                runner_id = result.stdout.strip()
+        # One paginated listing resolves every runner ID; per-runner lookups
+        # would cost an API round trip (and gh process) each.
+        try:
+            github_runners = self._github_runners()
+        except (OSError, subprocess.CalledProcessError, GitHubAPIError) as e:
+            detail = getattr(e, 'stderr', None) or e
+            log(f"Failed to list runners for label sync: {detail}", "warning")
+            return
 
-                if not runner_id:
-                    log(f"Runner {runner.registered_name} not found, skipping", "warning")
-                    continue
+        # Update labels (filter out read-only labels that GitHub assigns automatically)
+        readonly_labels = {'self-hosted', 'linux', 'macOS', 'windows', 'x64', 'arm64'}
+
+        def sync_runner(runner: RunnerConfig):
+            entry = github_runners.get(runner.registered_name)
+            if not entry:
+                log(f"Runner {runner.registered_name} not found, skipping", "warning")
+                return
+
+            labels = [l for l in runner.labels.split(',') if l not in readonly_labels]
+            # PUT replaces the whole custom label set, so it is only needed
+            # when that set differs from what GitHub already has.  GitHub
+            # compares labels case-insensitively, so this does too.
+            if {l.casefold() for l in labels} == {l.casefold() for l in entry['labels']}:
+                log_debug(f"Labels for {runner.registered_name} already up to date")
+                return
+
+            try:
+                if client:
+                    client.request("PUT", f"{api_runners}/{entry['id']}/labels", {"labels": labels})
+                    log(f"Synced labels for {runner.registered_name}", "success")
+                    return
 
-                # Update labels (filter out read-only labels that GitHub assigns automatically)
-                readonly_labels = {'self-hosted', 'linux', 'macOS', 'windows', 'x64', 'arm64'}
-                labels = [l for l in runner.labels.split(',') if l not in readonly_labels]
                 labels_json = json.dumps({"labels": labels})
 
                 cmd = gh_prefix + ["gh", "api", "-X", "PUT",
-                       f"{api_runners}/{runner_id}/labels", "--input", "-"]
+                       f"{api_runners}/{entry['id']}/labels", "--input", "-"]
                 proc = subprocess.Popen(
                     cmd,
                     stdin=subprocess.PIPE,
@@ -1579,6 +2184,8 @@ WantedBy=multi-user.target
             except Exception as e:
                 log(f"Failed to sync labels for {runner.registered_name}: {e}", "warning")
 
+        self._parallel(sync_runner, self.runners)
+
     def print_summary(self):
         """Print deployment summary"""
         if self.scope == 'enterprise':
@@ -1636,28 +2243,12 @@ WantedBy=multi-user.target
         Returns True if busy, False if idle, None if the runner was not found
         on GitHub (already removed or never registered).
         """
-        prefix = self.config['github']['prefix']
-        registered_name = f"{prefix}-linux-{runner_name}"
-        gh_prefix = self._gh_prefix()
-        api_runners = f"{self.api_base}/actions/runners"
-
+        registered_name = f"{self.prefix}-linux-{runner_name}"
         try:
-            result = run_cmd(
-                gh_prefix + ["gh", "api", api_runners,
-                             "--paginate", "--jq",
-                             f'.runners[] | select(.name == "{registered_name}") | .busy'],
-                capture=True,
-                check=False
-            )
-            value = result.stdout.strip().lower() if result else ""
-            if value == "true":
-                return True
-            elif value == "false":
-                return False
-            else:
-                return None
+            entry = self._github_runners().get(registered_name)
         except Exception:
             return None
+        return entry['busy'] if entry else None
 
     def _deregister_runner_from_github(self, runner_name, runner_path):
         """Deregister a runner from GitHub before local removal.
@@ -1665,9 +2256,11 @@ WantedBy=multi-user.target
         Tries config.sh remove first (clean deregistration), then falls back
         to the GitHub API if the runner directory or binary is missing.
         """
-        token = os.environ.get("REGISTER_GITHUB_RUNNER_TOKEN")
-        uid = self.config['host']['docker_user_uid']
-        registered_name = f"{self.config['github']['prefix']}-linux-{runner_name}"
+        # A still-fresh token cached by an earlier deploy lets --remove
+        # deregister cleanly via config.sh without a new API call.
+        token = os.environ.get("REGISTER_GITHUB_RUNNER_TOKEN") or self._load_cached_token()
+        uid = self.uid
+        registered_name = f"{self.prefix}-linux-{runner_name}"
         config_script = runner_path / "config.sh"
 
         # Try config.sh remove first (cleanest approach)
@@ -1678,8 +2271,7 @@ WantedBy=multi-user.target
             ]
             try:
                 result = run_cmd(
-                    ["sudo", "-u", f"#{uid}", "bash", "-c",
-                     f"cd {shlex.quote(str(runner_path))} && {' '.join(shlex.quote(arg) for arg in remove_cmd)}"],
+                    ["sudo", "-u", f"#{uid}", "env", f"--chdir={runner_path}"] + remove_cmd,
                     check=False
                 )
                 if result and result.returncode == 0:
@@ -1693,24 +2285,27 @@ WantedBy=multi-user.target
         # Fallback: remove via GitHub API
         log(f"Deregistering {registered_name} from GitHub via API...", "info")
         try:
-            gh_prefix = self._gh_prefix()
             api_runners = f"{self.api_base}/actions/runners"
-
-            result = run_cmd(
-                gh_prefix + ["gh", "api", api_runners,
-                             "--paginate", "--jq",
-                             f'.runners[] | select(.name == "{registered_name}") | .id'],
-                capture=True,
-                check=False
-            )
-            runner_id = result.stdout.strip()
-
-            if runner_id:
-                run_cmd(
-                    gh_prefix + ["gh", "api", "-X", "DELETE",
-                                 f"{api_runners}/{runner_id}"],
-                    check=False
-                )
+            github_runners = self._github_runners()
+            entry = github_runners.get(registered_name)
+
+            if entry:
+                runner_id = entry['id']
+                client = self.github_client
+                if client:
+                    try:
+                        client.request("DELETE", f"{api_runners}/{runner_id}")
+                    except GitHubAPIError as e:
+                        # Already gone (e.g. removed by hand since the listing)
+                        if e.status != 404:
+                            raise
+                else:
+                    run_cmd(
+                        self._gh_prefix + ["gh", "api", "-X", "DELETE",
+                                             f"{api_runners}/{runner_id}"],
+                        check=False
+                    )
+                github_runners.pop(registered_name, None)
                 log(f"Deregistered {registered_name} (ID: {runner_id}) from GitHub", "success")
                 return True
             else:
@@ -1736,25 +2331,60 @@ WantedBy=multi-user.target
                 )
             return False
 
+    def _remove_runner_directories(self, paths: List[Path], prefix: str = ""):
+        """Delete runner directories.
+
+        As root the tree is removed in-process with shutil.rmtree; otherwise
+        a single sudo rm -rf covers every directory.
+        """
+        # Runner directories share a parent, so one listing per parent
+        # answers for all of them instead of a stat per directory.
+        listings = {parent: _list_dir(parent) for parent in {path.parent for path in paths}}
+        existing = [
+            path for path in paths
+            if (path.name in listings[path.parent]
+                if listings[path.parent] is not None else path.exists())
+        ]
+        for path in existing:
+            log(f"{prefix}Removing runner directory {path}...", "info")
+        if not existing:
+            return
+
+        if IS_ROOT and not DRY_RUN:
+            for path in existing:
+                shutil.rmtree(path)
+            return
+
+        run_cmd(
+            ["rm", "-rf"] + [str(path) for path in existing],
+            sudo=True,
+            sudo_reason=f"removing runner director{'ies' if len(existing) > 1 else 'y'}",
+            dry_run_msg=f"Remove {' '.join(str(path) for path in existing)}"
+        )
+
     def cleanup_removed_runners(self):
         """Remove runners that are no longer in config (local + GitHub)"""
         log("\nChecking for runners to remove...", "info")
 
-        prefix = self.config['github']['prefix']
+        prefix = self.prefix
         service_pattern = f"gha-{prefix}-linux-"
 
         # Get list of configured runner names
         configured_names = {runner.name for runner in self.runners}
 
-        # Find all existing services matching our pattern
+        # Find all installed services matching our pattern.  list-unit-files
+        # only reads unit files, unlike list-units --all, which loads and
+        # reports runtime state for every matching unit.
         result = run_cmd(
-            ["systemctl", "list-units", "--all", "--no-legend", f"{service_pattern}*"],
+            ["systemctl", "list-unit-files", "--type=service", "--no-legend",
+             f"{service_pattern}*"],
             sudo=True,
             capture=True,
             check=False
         )
 
         self._removed_runners = []
+        to_remove = []
         for line in result.stdout.splitlines():
             if not line.strip():
                 continue
@@ -1778,55 +2408,57 @@ WantedBy=multi-user.target
                     continue
 
                 log(f"\n>>> Removing runner: {registered_name} (not in config)", "warning")
-                service_name = f"{service_pattern}{runner_name}.service"
-                runner_path = Path(f"{self.config['host']['runner_base']}/{prefix}-linux-{runner_name}")
-
-                # 1. Stop and disable systemd service
-                log(f"  Stopping service {service_name}...", "info")
-                run_cmd(
-                    ["systemctl", "stop", service_name],
-                    sudo=True,
-                    sudo_reason=f"stopping removed runner service",
-                    check=False
-                )
-
-                log(f"  Disabling service {service_name}...", "info")
-                run_cmd(
-                    ["systemctl", "disable", service_name],
-                    sudo=True,
-                    sudo_reason=f"disabling removed runner service",
-                    check=False
-                )
+                to_remove.append(runner_name)
+
+        if to_remove:
+            # systemctl, rm and the directory removal all take many targets at
+            # once, so each step is one call for every removed runner.
+            runner_base = self.runner_base
+            services = [f"{service_pattern}{name}.service" for name in to_remove]
+            runner_paths = [Path(f"{runner_base}/{prefix}-linux-{name}") for name in to_remove]
+            service_list = ' '.join(services)
+
+            # 1. Stop and disable systemd services
+            log(f"  Stopping and disabling service(s) {service_list}...", "info")
+            run_cmd(
+                ["systemctl", "disable", "--now"] + services,
+                sudo=True,
+                sudo_reason=f"stopping and disabling removed runner service(s)",
+                check=False
+            )
 
-                # 2. Deregister from GitHub (before removing directory)
-                self._deregister_runner_from_github(runner_name, runner_path)
+            # 2. Deregister from GitHub (before removing directories).  Each
+            #    runner is an independent round trip, so they run concurrently.
+            deregistered = self._parallel(
+                lambda item: self._deregister_runner_from_github(*item),
+                list(zip(to_remove, runner_paths)),
+                tag=lambda item: item[0],
+            )
+            failed = [name for name, ok in zip(to_remove, deregistered) if not ok]
+            if failed:
+                log(f"  {len(failed)} runner(s) could not be deregistered from GitHub: "
+                    f"{', '.join(failed)}", "warning")
+
+            # 3. Remove service files.  rm -f skips missing ones itself, so
+            #    there is no need to stat each path first.
+            service_paths = [f"/etc/systemd/system/{service}" for service in services]
+            log(f"  Removing service file(s) {' '.join(service_paths)}...", "info")
+            run_cmd(
+                ["rm", "-f"] + service_paths,
+                sudo=True,
+                sudo_reason=f"removing systemd service file(s)"
+            )
 
-                # 3. Remove service file
-                service_path = Path(f"/etc/systemd/system/{service_name}")
-                if service_path.exists():
-                    log(f"  Removing service file {service_path}...", "info")
-                    run_cmd(
-                        ["rm", str(service_path)],
-                        sudo=True,
-                        sudo_reason=f"removing systemd service file"
-                    )
+            # 4. The services are stopped and disabled, so systemd only needs
+            #    a reload to forget them; deploy() does that together with
+            #    the reload for new or changed unit files.
+            self._daemon_reload_pending = True
 
-                # 4. Reload systemd
-                run_cmd(
-                    ["systemctl", "daemon-reload"],
-                    sudo=True,
-                    sudo_reason="reloading systemd after removing service"
-                )
-
-                # 5. Remove runner directory
-                if runner_path.exists():
-                    log(f"  Removing runner directory {runner_path}...", "info")
-                    run_cmd(
-                        ["rm", "-rf", str(runner_path)],
-                        sudo=True,
-                        sudo_reason=f"removing runner directory {runner_path}"
-                    )
+            # 5. Remove runner directories
+            self._remove_runner_directories(runner_paths, prefix="  ")
 
+            for name in to_remove:
+                registered_name = f"{prefix}-linux-{name}"
                 log(f"  Runner {registered_name} fully removed", "success")
                 self._removed_runners.append(registered_name)
 
@@ -1878,17 +2510,17 @@ WantedBy=multi-user.target
 
         # Validate runner_name to prevent path traversal attacks
         # Only allow alphanumeric, hyphens, and underscores
-        if not re.match(r'^[a-zA-Z0-9_-]+$', runner_name):
+        if not SAFE_RUNNER_NAME_PATTERN.fullmatch(runner_name):
             log(f"Invalid runner name '{runner_name}': only alphanumeric, hyphens, and underscores allowed", "error")
             return False
 
-        prefix = self.config['github']['prefix']
+        prefix = self.prefix
         service_name = f"gha-{prefix}-linux-{runner_name}.service"
-        runner_path = Path(f"{self.config['host']['runner_base']}/{prefix}-linux-{runner_name}")
+        runner_path = Path(f"{self.runner_base}/{prefix}-linux-{runner_name}")
 
-        # Check if service exists
+        # Check if service exists (its unit file is installed)
         check_result = run_cmd(
-            ["systemctl", "list-units", "--all", "--no-legend", service_name],
+            ["systemctl", "list-unit-files", "--type=service", "--no-legend", service_name],
             sudo=True,
             capture=True,
             check=False
@@ -1908,19 +2540,11 @@ WantedBy=multi-user.target
                 return False
 
         # 1. Stop and disable service
-        log(f"Stopping service {service_name}...", "info")
-        run_cmd(
-            ["systemctl", "stop", service_name],
-            sudo=True,
-            sudo_reason=f"stopping runner service {service_name}",
-            check=False
-        )
-
-        log(f"Disabling service {service_name}...", "info")
+        log(f"Stopping and disabling service {service_name}...", "info")
         run_cmd(
-            ["systemctl", "disable", service_name],
+            ["systemctl", "disable", "--now", service_name],
             sudo=True,
-            sudo_reason=f"disabling runner service {service_name}",
+            sudo_reason=f"stopping and disabling runner service {service_name}",
             check=False
         )
 
@@ -1945,13 +2569,7 @@ WantedBy=multi-user.target
         )
 
         # 5. Remove runner directory
-        if runner_path.exists():
-            log(f"Removing runner directory {runner_path}...", "info")
-            run_cmd(
-                ["rm", "-rf", str(runner_path)],
-                sudo=True,
-                sudo_reason=f"removing runner directory {runner_path}"
-            )
+        self._remove_runner_directories([runner_path])
 
         registered_name = f"{prefix}-linux-{runner_name}"
         log(f"\nRunner '{registered_name}' fully removed (GitHub + local)", "success")
@@ -1973,100 +2591,85 @@ WantedBy=multi-user.target
         
         log(f"Found {len(runners_to_upgrade)} runner(s) to upgrade", "info")
 
-        # Get runner version and download URL from config
-        runner_cfg = self.config.get('runner', {})
-        runner_version = runner_cfg['version']
-        runner_arch = runner_cfg.get('arch', 'linux-x64')
-        download_url_template = runner_cfg.get(
-            'download_url_template',
-            "https://github.com/actions/runner/releases/download/v{version}/actions-runner-{arch}-{version}.tar.gz",
-        )
-        runner_url = download_url_template.format(version=runner_version, arch=runner_arch)
-        runner_tarball = f"/tmp/actions-runner-{runner_arch}-{runner_version}.tar.gz"
-        
-        log(f"\nDownloading runner version {runner_version}...", "info")
-        if not Path(runner_tarball).exists():
-            run_cmd(
-                ["curl", "-L", "-o", runner_tarball, runner_url],
-                check=True
-            )
-        else:
-            log(f"Using cached runner tarball: {runner_tarball}", "info")
-        
-        # Upgrade each runner
-        upgraded_count = 0
-        for runner_info in runners_to_upgrade:
-            log(f"\n>>> Upgrading runner: {runner_info['name']}", "header")
-            
-            # Stop service
-            log(f"Stopping service {runner_info['service']}...", "info")
-            run_cmd(
-                ["systemctl", "stop", runner_info['service']],
-                sudo=True,
-                sudo_reason=f"stopping runner for upgrade",
-                check=False
-            )
-            
-            # Backup current version (just the binaries, not _work or config)
-            backup_marker = runner_info['path'] / ".backup-done"
+        # The upgrades below run sudo from worker threads
+        sudo_keepalive = self._authorize_sudo()
+        try:
+            # Unpacked once; every runner is copied from it
+            template = self._ensure_runner_template()
+            # Job data and registration files are left out of the backup
             tar_excludes = ["--exclude=_work"] + [f"--exclude={f}" for f in RUNNER_CONFIG_FILES]
-            if not backup_marker.exists():
-                log(f"Creating backup of runner binaries...", "info")
-                run_cmd(
-                    ["tar", "-czf", f"{runner_info['path']}.backup.tar.gz",
-                     "-C", str(runner_info['path'])] + tar_excludes + ["."],
-                    sudo=True,
-                    sudo_reason="backing up runner before upgrade"
-                )
-                run_cmd(
-                    ["touch", str(backup_marker)],
-                    sudo=True,
-                    sudo_reason="creating backup marker after runner backup"
-                )
 
-            # Extract new binaries (preserve _work and config files)
-            log(f"Extracting new runner binaries...", "info")
-            run_cmd(
-                ["tar", "-xzf", runner_tarball,
-                 "-C", str(runner_info['path'])] + tar_excludes,
-                sudo=True,
-                sudo_reason="extracting new runner binaries"
+            # Runners are independent, so they are upgraded concurrently
+            self._parallel(
+                lambda runner_info: self._upgrade_runner(runner_info, template, tar_excludes),
+                runners_to_upgrade,
+                tag=lambda runner_info: runner_info['name'],
             )
-            
-            # Fix permissions
-            runner_uid = self.config['host'].get('docker_user_uid', 1003)
-            runner_gid = self.config['host'].get('docker_user_gid', 1003)
+
+            # Verify they started: all runners are polled together
+            states = self._wait_for_services([r['service'] for r in runners_to_upgrade])
+        finally:
+            if sudo_keepalive:
+                sudo_keepalive.set()
+
+        upgraded_count = 0
+        for runner_info, status in zip(runners_to_upgrade, states):
+            if status == "active":
+                log(f"✅ Runner '{runner_info['name']}' upgraded successfully", "success")
+                upgraded_count += 1
+            else:
+                log(f"⚠️  Runner '{runner_info['name']}' upgraded but failed to start", "warning")
+
+        log(f"\n✅ Upgraded {upgraded_count}/{len(runners_to_upgrade)} runner(s)", "success")
+
+    def _upgrade_runner(self, runner_info: Dict[str, Any], template: Path,
+                        tar_excludes: List[str]):
+        """Stop one runner, back it up, unpack the new binaries and start it"""
+        log(f"\n>>> Upgrading runner: {runner_info['name']}", "header")
+
+        # Stop service
+        log(f"Stopping service {runner_info['service']}...", "info")
+        run_cmd(
+            ["systemctl", "stop", runner_info['service']],
+            sudo=True,
+            sudo_reason=f"stopping runner for upgrade",
+            check=False
+        )
+
+        # Backup current version (just the binaries, not _work or config)
+        backup_marker = runner_info['path'] / ".backup-done"
+        if not backup_marker.exists():
+            log(f"Creating backup of runner binaries...", "info")
             run_cmd(
-                ["chown", "-R", f"{runner_uid}:{runner_gid}", str(runner_info['path'])],
+                ["tar", "-czf", f"{runner_info['path']}.backup.tar.gz",
+                 "-C", str(runner_info['path'])] + tar_excludes + ["."],
                 sudo=True,
-                sudo_reason="fixing permissions after upgrade"
+                sudo_reason="backing up runner before upgrade"
             )
-            
-            # Start service
-            log(f"Starting service {runner_info['service']}...", "info")
             run_cmd(
-                ["systemctl", "start", runner_info['service']],
-                sudo=True,
-                sudo_reason=f"starting upgraded runner",
-                check=False
-            )
-            
-            # Verify it started
-            time.sleep(2)
-            status_result = run_cmd(
-                ["systemctl", "is-active", runner_info['service']],
+                ["touch", str(backup_marker)],
                 sudo=True,
-                capture=True,
-                check=False
+                sudo_reason="creating backup marker after runner backup"
             )
-            
-            if status_result.stdout.strip() == "active":
-                log(f"✅ Runner '{runner_info['name']}' upgraded successfully", "success")
-                upgraded_count += 1
-            else:
-                log(f"⚠️  Runner '{runner_info['name']}' upgraded but failed to start", "warning")
-        
-        log(f"\n✅ Upgraded {upgraded_count}/{len(runners_to_upgrade)} runner(s)", "success")
+
+        # Copy in the new binaries (_work and config files are not in the
+        # template, so they are preserved) and fix permissions
+        log(f"Installing new runner binaries...", "info")
+        runner_uid = self.config['host'].get('docker_user_uid', 1003)
+        runner_gid = self.config['host'].get('docker_user_gid', 1003)
+        self._copy_runner_files(
+            template, runner_info['path'], f"{runner_uid}:{runner_gid}",
+            sudo_reason="installing new runner binaries",
+        )
+
+        # Start service
+        log(f"Starting service {runner_info['service']}...", "info")
+        run_cmd(
+            ["systemctl", "start", runner_info['service']],
+            sudo=True,
+            sudo_reason=f"starting upgraded runner",
+            check=False
+        )
 
     def _get_deployed_runners(self, pool: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get list of deployed runners from systemd, optionally filtered by pool pattern.
@@ -2075,26 +2678,29 @@ WantedBy=multi-user.target
         If pool is given, only runners whose name contains the given substring
         (matched using a pattern of ``*{pool}*``) are returned.
         """
-        prefix = self.config['github']['prefix']
+        prefix = self.prefix
         service_pattern = f"gha-{prefix}-linux-"
 
+        # Discovery only needs unit names: list-unit-files reads unit files
+        # without loading every unit's runtime state like list-units --all.
+        # States come from one is-active call below.
         result = run_cmd(
-            ["systemctl", "list-units", "--all", "--no-legend", f"{service_pattern}*"],
+            ["systemctl", "list-unit-files", "--type=service", "--no-legend",
+             f"{service_pattern}*"],
             sudo=True,
             capture=True,
             check=False
         )
 
+        # One listing of the runner base answers 'exists' for every runner
+        base_entries = _list_dir(Path(self.runner_base))
+
         runners = []
         for line in result.stdout.splitlines():
             if not line.strip():
                 continue
 
-            parts = line.split()
-            if len(parts) < 4:
-                continue
-
-            service_full = parts[0]
+            service_full = line.split()[0]
             if not service_full.startswith(service_pattern):
                 continue
 
@@ -2104,53 +2710,70 @@ WantedBy=multi-user.target
             if pool and not fnmatch.fnmatch(runner_name, f"*{pool}*"):
                 continue
 
-            status_result = run_cmd(
-                ["systemctl", "is-active", service_full],
-                sudo=True,
-                capture=True,
-                check=False
-            )
-            status = status_result.stdout.strip()
-
-            runner_path = Path(f"{self.config['host']['runner_base']}/{prefix}-linux-{runner_name}")
+            runner_path = Path(f"{self.runner_base}/{prefix}-linux-{runner_name}")
             runners.append({
                 'name': runner_name,
                 'service': service_full,
-                'status': status,
                 'path': runner_path,
-                'exists': runner_path.exists(),
+                'exists': (runner_path.name in base_entries if base_entries is not None
+                           else runner_path.exists()),
             })
 
+        states = self._service_states([runner['service'] for runner in runners])
+        for runner, status in zip(runners, states):
+            runner['status'] = status
+
         return runners
 
+    def _service_states(self, services: List[str]) -> List[str]:
+        """Active state of each service, from one systemctl is-active call.
+
+        systemctl prints one state per unit, in the order given.
+        """
+        if not services:
+            return []
+        result = run_cmd(
+            ["systemctl", "is-active"] + services,
+            sudo=True,
+            capture=True,
+            check=False
+        )
+        states = result.stdout.split() if result else []
+        return states + ["unknown"] * (len(services) - len(states))
+
+    def _wait_for_services(self, services: List[str]) -> List[str]:
+        """Poll the services' states until none is still starting.
+
+        Waits SERVICE_SETTLE_TIME first so a runner that exits right after
+        starting is not reported active.  Returns as soon as every unit has
+        settled (active or otherwise), or with the last states seen after
+        SERVICE_START_TIMEOUT more seconds.
+        """
+        if not DRY_RUN:
+            time.sleep(SERVICE_SETTLE_TIME)
+        deadline = time.monotonic() + SERVICE_START_TIMEOUT
+        while True:
+            states = self._service_states(services)
+            if DRY_RUN or time.monotonic() >= deadline or \
+                    not _SERVICE_PENDING_STATES.intersection(states):
+                return states
+            time.sleep(SERVICE_POLL_INTERVAL)
+
     def _get_runner_github_status(self, runner_name: str) -> str:
         """Query GitHub API for runner status (online/offline/busy).
 
         Returns 'online', 'offline', 'busy', or 'unknown'.
         """
-        prefix = self.config['github']['prefix']
-        registered_name = f"{prefix}-linux-{runner_name}"
-        gh_prefix = self._gh_prefix()
-        api_runners = f"{self.api_base}/actions/runners"
-
+        registered_name = f"{self.prefix}-linux-{runner_name}"
         try:
-            result = run_cmd(
-                gh_prefix + ["gh", "api", api_runners,
-                             "--paginate", "--jq",
-                             f'.runners[] | select(.name == "{registered_name}") '
-                             f'| (.status + "/" + (.busy | tostring))'],
-                capture=True,
-                check=False
-            )
-            value = result.stdout.strip() if result else ""
-            if not value:
-                return "unknown"
-            status, busy = value.split("/", 1)
-            if busy == "true":
-                return "busy"
-            return status  # "online" or "offline"
+            entry = self._github_runners().get(registered_name)
         except Exception:
             return "unknown"
+        if not entry:
+            return "unknown"
+        if entry['busy']:
+            return "busy"
+        return entry['status']  # "online" or "offline"
 
     def _get_disk_info(self, path: str) -> Dict[str, Any]:
         """Get disk space info for a path using os.statvfs."""
@@ -2210,7 +2833,7 @@ WantedBy=multi-user.target
                 problems.append(f"{r['name']}: systemd={r['status']} github={gh_status}")
 
         # Gather disk info
-        disk_paths = [self.config['host']['runner_base']]
+        disk_paths = [self.runner_base]
         cache_dir = self.config.get('cache', {}).get('base_dir')
         if cache_dir and cache_dir != disk_paths[0]:
             disk_paths.append(cache_dir)
@@ -2326,7 +2949,7 @@ WantedBy=multi-user.target
         # Disk space
         lines.append("# HELP gha_runner_disk_bytes_free Free disk space in bytes.")
         lines.append("# TYPE gha_runner_disk_bytes_free gauge")
-        disk_paths = [self.config['host']['runner_base']]
+        disk_paths = [self.runner_base]
         cache_dir = self.config.get('cache', {}).get('base_dir')
         if cache_dir and cache_dir != disk_paths[0]:
             disk_paths.append(cache_dir)
@@ -2369,6 +2992,69 @@ WantedBy=multi-user.target
                 pass
             raise
 
+    def _parallel(self, fn, items, tag=None):
+        """Call fn on every item using a thread pool.
+
+        Runs serially in dry-run mode so the planned actions stay readable.
+        Re-raises the first exception (including sys.exit) in item order
+        once all calls have finished; otherwise returns the results in
+        item order.  tag(item) names the item in log lines (default: its
+        .name attribute).
+        """
+        if not items:
+            return []
+        workers = 1 if DRY_RUN else min(len(items), MAX_PARALLEL_RUNNERS)
+
+        def run(item):
+            # Tag log lines with the runner only when output can interleave
+            if workers > 1:
+                _log_context.tag = tag(item) if tag else getattr(item, 'name', None)
+            else:
+                _log_context.tag = None
+            try:
+                return fn(item)
+            finally:
+                _log_context.tag = None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run, item) for item in items]
+        return [future.result() for future in futures]
+
+    def _authorize_sudo(self) -> Optional[threading.Event]:
+        """Ask for the sudo password once, before any work starts.
+
+        Without this the first of many sudo calls prompts, possibly from a
+        runner thread with other output interleaved.  A background thread
+        then refreshes the timestamp non-interactively so a long deploy
+        doesn't prompt again halfway.  Returns an event that stops the
+        refresh, or None when running as root or in dry-run mode.
+        """
+        if IS_ROOT or DRY_RUN:
+            return None
+
+        log("Requesting sudo access for the deployment...", "info")
+        run_cmd(["sudo", "-v"])
+
+        stop = threading.Event()
+
+        def keep_alive():
+            while not stop.wait(SUDO_KEEPALIVE_INTERVAL):
+                run_cmd(["sudo", "-n", "-v"], check=False, capture=True)
+
+        threading.Thread(target=keep_alive, name="sudo-keepalive", daemon=True).start()
+        return stop
+
+    def _deploy_runner(self, runner: RunnerConfig) -> bool:
+        """Install, register and write the service file for one runner.
+
+        Returns True if the unit file changed and the service needs a restart.
+        """
+        log(f"\n>>> Deploying runner: {runner.registered_name}", "header")
+        self.install_runner_binary(runner)
+        self.register_runner(runner)
+        self.create_cleanup_hook(runner)
+        return self.write_systemd_service(runner)
+
     def deploy(self):
         """Main deployment workflow"""
         log("Starting GitHub Actions Host-Based Runner Deployment", "header")
@@ -2385,24 +3071,35 @@ WantedBy=multi-user.target
             log("  2. Authenticate with 'gh auth login' to fetch automatically", "error")
             sys.exit(1)
 
-        self.ensure_directories()
-        self.cleanup_removed_runners()
-        self.configure_sudoers()
-
-        for runner in self.runners:
-            log(f"\n>>> Deploying runner: {runner.registered_name}", "header")
-            self.install_dependencies(runner)
-            self.install_runner_binary(runner)
-            self.register_runner(runner)
-            self.create_cleanup_hook(runner)
-            self.create_systemd_service(runner)
-
-        self.sync_labels_via_api()
+        sudo_keepalive = self._authorize_sudo()
+        try:
+            self.ensure_directories()
+            self.cleanup_removed_runners()
+            self.configure_sudoers()
+            self.install_dependencies(self.runners)
+
+            unit_changed = self._parallel(self._deploy_runner, self.runners)
+            changed = [r for r, c in zip(self.runners, unit_changed) if c]
+            unchanged = [r for r, c in zip(self.runners, unit_changed) if not c]
+
+            # One reload for all unit files written above.  Runners whose unit
+            # is unchanged are only started (a no-op when already running), so
+            # an idempotent re-run doesn't interrupt in-progress jobs.
+            if changed or self._daemon_reload_pending:
+                self.reload_systemd()
+            self.start_systemd_services(changed)
+            self.start_systemd_services(unchanged, restart=False)
+
+            self.sync_labels_via_api()
+        finally:
+            if sudo_keepalive:
+                sudo_keepalive.set()
         self.print_summary()
 
 
 def main():
     """Entry point"""
+    global VERBOSE, DRY_RUN, MAX_PARALLEL_RUNNERS
     parser = argparse.ArgumentParser(
         description="Deploy GitHub Actions self-hosted runners",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -2446,6 +3143,9 @@ Examples:
   # Deploy with verbose output
   ./deploy-host.py --verbose
 
+  # Deploy one runner at a time
+  ./deploy-host.py --parallel 1
+
   # Deploy with custom config file (default: ~/.config/gha-runnerd/config.yml)
   ./deploy-host.py --config /path/to/config.yml
 
@@ -2513,6 +3213,14 @@ Note: The script will prompt for sudo password when needed for system operations
         metavar='PATTERN',
         help='Filter runners by name pattern (use with --list, --upgrade, --health)'
     )
+    parser.add_argument(
+        '--parallel',
+        type=int,
+        default=MAX_PARALLEL_RUNNERS,
+        metavar='N',
+        help=f'Deploy up to N runners at a time; 1 deploys them one by one '
+             f'(default: {MAX_PARALLEL_RUNNERS})'
+    )
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -2525,11 +3233,13 @@ Note: The script will prompt for sudo password when needed for system operations
     )
 
     args = parser.parse_args()
+    if args.parallel < 1:
+        parser.error("--parallel must be at least 1")
 
     # Set global flags
-    global VERBOSE, DRY_RUN
     VERBOSE = args.verbose
     DRY_RUN = args.dry_run
+    MAX_PARALLEL_RUNNERS = args.parallel
 
     if VERBOSE:
         log("Verbose mode enabled", "debug")
@@ -2611,21 +3321,19 @@ Note: The script will prompt for sudo password when needed for system operations
         log("\nDeployment cancelled by user", "warning")
         sys.exit(1)
     except subprocess.CalledProcessError as e:
-        log(f"\nCommand failed: {' '.join(shlex.quote(str(a)) for a in e.cmd)}", "error")
+        log(f"\nCommand failed: {shlex.join(str(a) for a in e.cmd)}", "error")
         if e.stderr:
             log(f"stderr: {e.stderr.strip()}", "error")
         if e.stdout:
             log(f"stdout: {e.stdout.strip()}", "error")
         log("Re-run with --verbose for more details.", "info")
         if VERBOSE:
-            import traceback
             traceback.print_exc()
         sys.exit(1)
     except Exception as e:
         log(f"\nDeployment failed: {e}", "error")
         log("Re-run with --verbose for more details.", "info")
         if VERBOSE:
-            import traceback
             traceback.print_exc()
         sys.exit(1)
 
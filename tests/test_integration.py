@@ -11,10 +11,13 @@ These tests validate:
 import unittest
 from unittest.mock import patch, MagicMock
 import subprocess
+import json
 import tempfile
 import os
 import sys
 import re
+import stat
+import http.client
 from fnmatch import fnmatch
 from pathlib import Path
 
@@ -36,6 +39,14 @@ spec.loader.exec_module(deploy_host)
 RunnerConfig = deploy_host.RunnerConfig
 HostDeployer = deploy_host.HostDeployer
 
+# Variable assignments in the generated cleanup hook.  HOME_LOCAL is anchored
+# to the start of a line so it does not match CONTAINER_HOME_LOCAL.
+WORK_DIR_PATTERN = re.compile(r'^WORK_DIR="([^"]+)"', re.MULTILINE)
+HOME_LOCAL_PATTERN = re.compile(r'^HOME_LOCAL="([^"]+)"', re.MULTILINE)
+CONTAINER_HOME_LOCAL_PATTERN = re.compile(r'^CONTAINER_HOME_LOCAL="([^"]+)"', re.MULTILINE)
+# Target path of each chown rule in the sudoers NOPASSWD line
+SUDOERS_CHOWN_TARGET_PATTERN = re.compile(r'/usr/bin/chown -R \S+ ([^\s,]+)')
+
 
 class TestConfigParsing(unittest.TestCase):
     """Test configuration file parsing and validation"""
@@ -107,6 +118,48 @@ class TestConfigParsing(unittest.TestCase):
             deployer = HostDeployer(config_path=str(self.config_file))
             deployer.validate_config()
 
+    @patch.object(deploy_host, 'log')
+    def test_all_missing_sections_reported(self, mock_log):
+        """Every missing required section is reported before exiting"""
+        self._write_config({'github': {'org': 'test-org', 'prefix': 'test'}})
+
+        with self.assertRaises(SystemExit):
+            HostDeployer(config_path=str(self.config_file))
+
+        messages = [c[0][0] for c in mock_log.call_args_list]
+        for section in ['host', 'runners', 'sizes', 'runner']:
+            self.assertIn(f"Missing required section in config: {section}", messages)
+
+    def test_non_mapping_config_rejected(self):
+        """A config file that is not a YAML mapping exits cleanly"""
+        self.config_file.write_text("- just\n- a list\n")
+
+        with self.assertRaises(SystemExit):
+            HostDeployer(config_path=str(self.config_file))
+
+    @patch.object(deploy_host, 'log')
+    def test_all_invalid_runner_names_reported(self, mock_log):
+        """Every invalid runner name is reported before exiting"""
+        self._write_config({
+            'github': {'org': 'test-org', 'prefix': 'test'},
+            'host': {
+                'runner_base': '/srv/gha',
+                'docker_user_uid': 1003,
+                'docker_user_gid': 1003,
+                'label': 'test-host',
+            },
+            'runners': ['cpu-small-1', 'tpu-small-1', 'cpu-huge-1'],
+            'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
+            'runner': {'version': '2.321.0', 'arch': 'linux-x64'},
+        })
+
+        with self.assertRaises(SystemExit):
+            HostDeployer(config_path=str(self.config_file))
+
+        errors = [c[0][0] for c in mock_log.call_args_list if c[0][1:] == ("error",)]
+        self.assertTrue(any('tpu-small-1' in e for e in errors))
+        self.assertTrue(any('cpu-huge-1' in e for e in errors))
+
     def test_config_with_gpu_runner(self):
         """Test config parsing with GPU runner"""
         config = {
@@ -189,19 +242,21 @@ class TestConfigParsing(unittest.TestCase):
 class TestRunnerNameParsing(unittest.TestCase):
     """Test runner name parsing and label generation"""
 
+    # RunnerConfig only reads its config, so every test shares this one
+    CONFIG = {
+        'github': {'org': 'test-org', 'prefix': 'test'},
+        'host': {'runner_base': '/srv/gha'},
+        'sizes': {
+            'small': {'cpus': 2.0, 'mem_limit': '4g'},
+            'medium': {'cpus': 6.0, 'mem_limit': '16g'},
+            'large': {'cpus': 12.0, 'mem_limit': '32g'},
+            'max': {'cpus': 16.0, 'mem_limit': '64g'}
+        }
+    }
+
     def _create_runner(self, name):
         """Helper to create a RunnerConfig with minimal config"""
-        config = {
-            'github': {'org': 'test-org', 'prefix': 'test'},
-            'host': {'runner_base': '/srv/gha'},
-            'sizes': {
-                'small': {'cpus': 2.0, 'mem_limit': '4g'},
-                'medium': {'cpus': 6.0, 'mem_limit': '16g'},
-                'large': {'cpus': 12.0, 'mem_limit': '32g'},
-                'max': {'cpus': 16.0, 'mem_limit': '64g'}
-            }
-        }
-        return RunnerConfig(name, config)
+        return RunnerConfig(name, self.CONFIG)
 
     def test_parse_cpu_generic_runner(self):
         """Test parsing of CPU generic runner name"""
@@ -222,6 +277,21 @@ class TestRunnerNameParsing(unittest.TestCase):
         self.assertEqual(runner.parsed['category'], 'docker')
         self.assertEqual(runner.parsed['number'], '1')
 
+    def test_parse_invalid_runner_names(self):
+        """Test that malformed runner names raise the matching error"""
+        cases = {
+            'cpu-small': 'Invalid runner name',
+            'cpu-small-docker-extra-1': 'Invalid runner name',
+            'cpu-small-x': "Invalid number in runner name 'cpu-small-x': 'x'",
+            'cpu-small-docker-': "Invalid number in runner name 'cpu-small-docker-': ''",
+            'tpu-small-1': "Invalid runner type 'tpu'",
+        }
+        for name, message in cases.items():
+            with self.subTest(name=name):
+                with self.assertRaises(ValueError) as ctx:
+                    self._create_runner(name)
+                self.assertIn(message, str(ctx.exception))
+
     def test_parse_gpu_runner(self):
         """Test parsing of GPU runner name"""
         runner = self._create_runner('gpu-max-1')
@@ -411,6 +481,32 @@ class TestCleanupHook(unittest.TestCase):
         self.assertLess(workspace_chown_pos, container_rm_pos,
                         "workspace chown must run before container .local rm")
 
+    @patch.object(deploy_host, 'run_cmd')
+    def test_hook_reinstalled_only_when_content_or_metadata_differ(self, mock_run_cmd):
+        """An identical hook is skipped only if its owner and mode are also right"""
+        content = self.deployer.generate_hook_content(self.runner)
+
+        def stat_result(uid, gid, mode):
+            return os.stat_result((stat.S_IFREG | mode, 0, 0, 1, uid, gid, len(content), 0, 0, 0))
+
+        installed = stat_result(1003, 1003, 0o755)
+        with patch.object(deploy_host, '_read_text_or_none', return_value=content), \
+                patch.object(deploy_host.Path, 'stat', autospec=True,
+                             side_effect=lambda path: installed):
+            # Same content, owner and mode: nothing to do
+            self.deployer.create_cleanup_hook(self.runner)
+            mock_run_cmd.assert_not_called()
+
+            # Same content, different owner: install again
+            installed = stat_result(0, 0, 0o755)
+            self.deployer.create_cleanup_hook(self.runner)
+            self.assertEqual(mock_run_cmd.call_count, 1)
+
+            # Same content and owner, different mode: install again
+            installed = stat_result(1003, 1003, 0o644)
+            self.deployer.create_cleanup_hook(self.runner)
+            self.assertEqual(mock_run_cmd.call_count, 2)
+
     def test_hook_contains_logging(self):
         """Test that hook logs when cleaning .local"""
         content = self.deployer.generate_hook_content(self.runner)
@@ -442,9 +538,10 @@ class TestCleanupHook(unittest.TestCase):
 class TestSudoersContent(unittest.TestCase):
     """Test sudoers configuration content generation"""
 
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.config_file = Path(self.temp_dir) / "test-config.yml"
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.config_file = Path(cls.temp_dir) / "test-config.yml"
         config = {
             'github': {'org': 'test-org', 'prefix': 'test'},
             'host': {
@@ -459,13 +556,14 @@ class TestSudoersContent(unittest.TestCase):
             'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
             'runner': {'version': '2.321.0', 'arch': 'linux-x64'}
         }
-        with open(self.config_file, 'w') as f:
+        with open(cls.config_file, 'w') as f:
             yaml.dump(config, f)
-        self.deployer = HostDeployer(config_path=str(self.config_file))
+        cls.deployer = HostDeployer(config_path=str(cls.config_file))
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
 
     def test_sudoers_allows_work_chown(self):
         """Test that sudoers allows chown on _work directories"""
@@ -497,9 +595,10 @@ class TestHookSudoersConsistency(unittest.TestCase):
     These tests ensure the two stay in sync.
     """
 
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.config_file = Path(self.temp_dir) / "test-config.yml"
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.config_file = Path(cls.temp_dir) / "test-config.yml"
         config = {
             'github': {'org': 'test-org', 'prefix': 'test'},
             'host': {
@@ -514,32 +613,23 @@ class TestHookSudoersConsistency(unittest.TestCase):
             'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
             'runner': {'version': '2.321.0', 'arch': 'linux-x64'}
         }
-        with open(self.config_file, 'w') as f:
+        with open(cls.config_file, 'w') as f:
             yaml.dump(config, f)
-        self.deployer = HostDeployer(config_path=str(self.config_file))
-        self.runner = self.deployer.runners[0]
+        cls.deployer = HostDeployer(config_path=str(cls.config_file))
+        cls.runner = cls.deployer.runners[0]
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
 
     def _extract_sudoers_chown_globs(self):
         """Extract the glob patterns from sudoers NOPASSWD chown rules."""
         sudoers = self.deployer.generate_sudoers_content()
         # The sudoers line looks like:
         #   #1003 ALL=(root) NOPASSWD: /usr/bin/chown -R 1003\:1003 /srv/gha/*/_work, ...
-        # Extract each chown target path (the glob after uid:gid)
-        nopasswd_line = [l for l in sudoers.splitlines() if 'NOPASSWD' in l][0]
-        # Split on commas to get individual rules, extract the path from each
-        rules = nopasswd_line.split('NOPASSWD:')[1].split(',')
-        globs = []
-        for rule in rules:
-            rule = rule.strip()
-            # Each rule is: /usr/bin/chown -R uid\:gid <path>
-            parts = rule.rsplit(' ', 1)
-            if len(parts) == 2:
-                globs.append(parts[1])
-        return globs
+        # Each chown target path is the glob after uid:gid
+        return SUDOERS_CHOWN_TARGET_PATTERN.findall(sudoers)
 
     def test_sudoers_covers_workspace_chown_command(self):
         """Test that the workspace chown in the hook is permitted by sudoers"""
@@ -547,7 +637,7 @@ class TestHookSudoersConsistency(unittest.TestCase):
         globs = self._extract_sudoers_chown_globs()
 
         # Extract WORK_DIR path from hook
-        match = re.search(r'WORK_DIR="([^"]+)"', hook)
+        match = WORK_DIR_PATTERN.search(hook)
         work_dir = match.group(1)
 
         # The workspace path must match at least one sudoers glob
@@ -562,7 +652,7 @@ class TestHookSudoersConsistency(unittest.TestCase):
         globs = self._extract_sudoers_chown_globs()
 
         # Extract HOME_LOCAL path from hook
-        match = re.search(r'HOME_LOCAL="([^"]+)"', hook)
+        match = HOME_LOCAL_PATTERN.search(hook)
         home_local = match.group(1)
 
         # The .local path must match at least one sudoers glob
@@ -580,8 +670,8 @@ class TestHookSudoersConsistency(unittest.TestCase):
         """
         hook = self.deployer.generate_hook_content(self.runner)
 
-        work_dir = re.search(r'WORK_DIR="([^"]+)"', hook).group(1)
-        container_local = re.search(r'CONTAINER_HOME_LOCAL="([^"]+)"', hook).group(1)
+        work_dir = WORK_DIR_PATTERN.search(hook).group(1)
+        container_local = CONTAINER_HOME_LOCAL_PATTERN.search(hook).group(1)
 
         self.assertTrue(
             container_local.startswith(work_dir + "/"),
@@ -593,9 +683,10 @@ class TestHookSudoersConsistency(unittest.TestCase):
 class TestAsymmetricUidGid(unittest.TestCase):
     """P1: Test that uid and gid are not accidentally swapped or duplicated."""
 
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.config_file = Path(self.temp_dir) / "test-config.yml"
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.config_file = Path(cls.temp_dir) / "test-config.yml"
         config = {
             'github': {'org': 'test-org', 'prefix': 'test'},
             'host': {
@@ -610,14 +701,15 @@ class TestAsymmetricUidGid(unittest.TestCase):
             'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
             'runner': {'version': '2.321.0', 'arch': 'linux-x64'}
         }
-        with open(self.config_file, 'w') as f:
+        with open(cls.config_file, 'w') as f:
             yaml.dump(config, f)
-        self.deployer = HostDeployer(config_path=str(self.config_file))
-        self.runner = self.deployer.runners[0]
+        cls.deployer = HostDeployer(config_path=str(cls.config_file))
+        cls.runner = cls.deployer.runners[0]
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
 
     def test_hook_uses_asymmetric_uid_gid(self):
         """Test that hook uses uid:gid (not uid:uid) in chown commands"""
@@ -641,9 +733,10 @@ class TestAsymmetricUidGid(unittest.TestCase):
 class TestHookSecurityGuardrails(unittest.TestCase):
     """P1: Security guardrails for the cleanup hook."""
 
-    def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.config_file = Path(self.temp_dir) / "test-config.yml"
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.config_file = Path(cls.temp_dir) / "test-config.yml"
         config = {
             'github': {'org': 'test-org', 'prefix': 'test'},
             'host': {
@@ -658,14 +751,15 @@ class TestHookSecurityGuardrails(unittest.TestCase):
             'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
             'runner': {'version': '2.321.0', 'arch': 'linux-x64'}
         }
-        with open(self.config_file, 'w') as f:
+        with open(cls.config_file, 'w') as f:
             yaml.dump(config, f)
-        self.deployer = HostDeployer(config_path=str(self.config_file))
-        self.runner = self.deployer.runners[0]
+        cls.deployer = HostDeployer(config_path=str(cls.config_file))
+        cls.runner = cls.deployer.runners[0]
 
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
 
     def test_hook_rm_does_not_use_sudo(self):
         """Test that rm -rf is never called via sudo (chown first, then rm as runner user)"""
@@ -678,8 +772,7 @@ class TestHookSecurityGuardrails(unittest.TestCase):
     def test_hook_host_local_matches_runner_path(self):
         """Test that the hook's host HOME_LOCAL is runner_path/.local (matches systemd HOME)"""
         content = self.deployer.generate_hook_content(self.runner)
-        # Match HOME_LOCAL= but not CONTAINER_HOME_LOCAL=
-        home_local = re.search(r'\nHOME_LOCAL="([^"]+)"', content).group(1)
+        home_local = HOME_LOCAL_PATTERN.search(content).group(1)
         expected = self.runner.runner_path + "/.local"
         self.assertEqual(home_local, expected,
                          "HOME_LOCAL must equal runner_path/.local — "
@@ -1091,6 +1184,24 @@ class TestDeregistrationFallback(unittest.TestCase):
         import shutil
         shutil.rmtree(self.temp_dir, ignore_errors=True)
 
+    @patch.dict(os.environ, {"REGISTER_GITHUB_RUNNER_TOKEN": "fake-token"})
+    @patch.object(deploy_host, 'run_cmd')
+    def test_deregister_runs_config_sh_without_shell(self, mock_run_cmd):
+        """config.sh remove is exec'd directly as the runner user, not via bash -c"""
+        runner_path = Path("/srv/gha/test-linux-cpu-small-1")
+        mock_run_cmd.return_value = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="", stderr=""
+        )
+
+        with patch.object(Path, 'exists', return_value=True):
+            self.assertTrue(self.deployer._deregister_runner_from_github("cpu-small-1", runner_path))
+
+        cmd = mock_run_cmd.call_args_list[0][0][0]
+        self.assertEqual(cmd, [
+            "sudo", "-u", "#1003", "env", f"--chdir={runner_path}",
+            str(runner_path / "config.sh"), "remove", "--token", "fake-token",
+        ])
+
     @patch.dict(os.environ, {"REGISTER_GITHUB_RUNNER_TOKEN": "fake-token"})
     @patch.object(deploy_host, 'run_cmd')
     def test_deregister_falls_through_on_config_sh_failure(self, mock_run_cmd):
@@ -1103,7 +1214,8 @@ class TestDeregistrationFallback(unittest.TestCase):
         )
         # Second call: gh api (list runners) → returns runner id
         api_list = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="12345\n", stderr=""
+            args=[], returncode=0,
+            stdout="test-linux-cpu-small-1\t12345\toffline\tfalse\t\n", stderr=""
         )
         # Third call: gh api DELETE → success
         api_delete = subprocess.CompletedProcess(
@@ -1153,15 +1265,16 @@ class TestBusyRunnerProtection(unittest.TestCase):
     @patch.object(deploy_host, 'run_cmd')
     def test_busy_runner_skipped_during_cleanup(self, mock_run_cmd):
         """Busy runners should be skipped during cleanup_removed_runners"""
-        # systemctl list-units returns an old runner not in config
+        # systemctl list-unit-files returns an old runner not in config
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-old-runner-1.service loaded active running\n",
+            stdout="gha-test-linux-old-runner-1.service enabled enabled\n",
             stderr=""
         )
-        # _is_runner_busy → gh api returns "true"
+        # _is_runner_busy → gh api lists the runner as busy
         busy_result = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="true\n", stderr=""
+            args=[], returncode=0,
+            stdout="test-linux-old-runner-1\t1\tonline\ttrue\t\n", stderr=""
         )
         mock_run_cmd.side_effect = [list_result, busy_result]
 
@@ -1174,15 +1287,16 @@ class TestBusyRunnerProtection(unittest.TestCase):
     @patch.object(deploy_host, 'run_cmd')
     def test_idle_runner_removed_during_cleanup(self, mock_run_cmd):
         """Idle runners should be removed normally during cleanup"""
-        # systemctl list-units returns an old runner not in config
+        # systemctl list-unit-files returns an old runner not in config
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-old-runner-1.service loaded active running\n",
+            stdout="gha-test-linux-old-runner-1.service enabled enabled\n",
             stderr=""
         )
-        # _is_runner_busy → gh api returns "false"
+        # _is_runner_busy → gh api lists the runner as idle
         idle_result = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="false\n", stderr=""
+            args=[], returncode=0,
+            stdout="test-linux-old-runner-1\t1\tonline\tfalse\t\n", stderr=""
         )
         # Remaining calls for the removal process (stop, disable, deregister, etc.)
         generic_ok = subprocess.CompletedProcess(
@@ -1197,13 +1311,122 @@ class TestBusyRunnerProtection(unittest.TestCase):
         self.assertGreater(mock_run_cmd.call_count, 2)
         self.assertEqual(self.deployer._removed_runners, ["test-linux-old-runner-1"])
 
+    @patch.object(deploy_host, 'run_cmd')
+    def test_removed_runners_handled_in_batches(self, mock_run_cmd):
+        """Several removed runners share one disable --now; the reload is deferred"""
+        list_result = subprocess.CompletedProcess(
+            args=[], returncode=0,
+            stdout=("gha-test-linux-old-runner-1.service enabled enabled\n"
+                    "gha-test-linux-old-runner-2.service enabled enabled\n"),
+            stderr=""
+        )
+        # One runner listing answers the busy check for both runners
+        idle_result = subprocess.CompletedProcess(
+            args=[], returncode=0,
+            stdout=("test-linux-old-runner-1\t1\tonline\tfalse\t\n"
+                    "test-linux-old-runner-2\t2\tonline\tfalse\t\n"),
+            stderr=""
+        )
+        generic_ok = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="", stderr=""
+        )
+        mock_run_cmd.side_effect = [list_result, idle_result] + [generic_ok] * 20
+
+        with patch.object(Path, 'exists', return_value=False):
+            self.deployer.cleanup_removed_runners()
+
+        commands = [c[0][0] for c in mock_run_cmd.call_args_list]
+        units = ["gha-test-linux-old-runner-1.service", "gha-test-linux-old-runner-2.service"]
+        self.assertIn(["systemctl", "disable", "--now"] + units, commands)
+        self.assertIn(["rm", "-f"] + [f"/etc/systemd/system/{unit}" for unit in units], commands)
+        self.assertNotIn(["systemctl", "daemon-reload"], commands)
+        self.assertTrue(self.deployer._daemon_reload_pending)
+        self.assertEqual(self.deployer._removed_runners,
+                         ["test-linux-old-runner-1", "test-linux-old-runner-2"])
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_removed_runners_deregistered_concurrently(self, mock_run_cmd):
+        """API deletions for several removed runners are in flight together"""
+        import threading
+        names = [f"old-runner-{i}" for i in range(3)]
+        list_result = subprocess.CompletedProcess(
+            args=[], returncode=0,
+            stdout="".join(f"gha-test-linux-{n}.service enabled enabled\n" for n in names),
+            stderr=""
+        )
+        generic_ok = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="", stderr=""
+        )
+        mock_run_cmd.side_effect = [list_result] + [generic_ok] * 20
+        client = MagicMock()
+        client.list_runners.return_value = [
+            {'name': f"test-linux-{n}", 'id': i, 'status': 'offline', 'busy': False}
+            for i, n in enumerate(names)
+        ]
+        # Each DELETE waits until all of them have started
+        barrier = threading.Barrier(len(names), timeout=5)
+        client.request.side_effect = lambda method, path: barrier.wait()
+
+        with patch.object(Path, 'exists', return_value=False), \
+                patch.object(self.deployer, 'github_client', client):
+            self.deployer.cleanup_removed_runners()
+
+        client.list_runners.assert_called_once()
+        deletes = sorted(c[0] for c in client.request.call_args_list)
+        self.assertEqual(deletes, [("DELETE", f"/orgs/test-org/actions/runners/{i}")
+                                   for i in range(3)])
+        self.assertFalse(barrier.broken)
+        self.assertEqual(len(self.deployer._removed_runners), 3)
+
+    def test_runner_already_deleted_on_github_counts_as_removed(self):
+        """A 404 from the API DELETE means the runner is already gone"""
+        client = MagicMock()
+        client.list_runners.return_value = [
+            {'name': 'test-linux-old-runner-1', 'id': 7, 'status': 'offline', 'busy': False}]
+        client.request.side_effect = deploy_host.GitHubAPIError(
+            'DELETE', '/orgs/test-org/actions/runners/7', 404, 'Not Found', '')
+
+        with patch.object(self.deployer, 'github_client', client), \
+                patch.object(deploy_host, 'log') as mock_log:
+            self.assertTrue(self.deployer._deregister_runner_from_github(
+                'old-runner-1', Path(self.temp_dir) / 'missing'))
+
+        self.assertFalse([c for c in mock_log.call_args_list if c[0][1:] == ("warning",)])
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_runner_directories_removed_in_process_as_root(self, mock_run_cmd):
+        """As root, runner directories are deleted without spawning rm"""
+        paths = [Path(self.temp_dir) / "runner-a", Path(self.temp_dir) / "runner-b"]
+        for path in paths:
+            (path / "_work").mkdir(parents=True)
+
+        with patch.object(deploy_host, 'IS_ROOT', True):
+            self.deployer._remove_runner_directories(paths)
+
+        self.assertFalse(any(path.exists() for path in paths))
+        mock_run_cmd.assert_not_called()
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_only_existing_runner_directories_removed(self, mock_run_cmd):
+        """Missing runner directories are skipped using one listing of their parent"""
+        present = Path(self.temp_dir) / "runner-a"
+        present.mkdir()
+        missing = Path(self.temp_dir) / "runner-b"
+
+        with patch.object(deploy_host, 'IS_ROOT', False), \
+                patch.object(Path, 'exists', side_effect=AssertionError("stat per path")):
+            self.deployer._remove_runner_directories([present, missing])
+
+        mock_run_cmd.assert_called_once()
+        self.assertEqual(mock_run_cmd.call_args[0][0], ["rm", "-rf", str(present)])
+
     @patch.object(deploy_host, 'run_cmd')
     def test_force_remove_bypasses_busy_check(self, mock_run_cmd):
         """--force should skip the busy check and remove anyway"""
-        # systemctl list-units → service exists
+        # systemctl list-unit-files → service exists
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-cpu-small-1.service loaded active running\n",
+            stdout="gha-test-linux-cpu-small-1.service enabled enabled\n",
             stderr=""
         )
         generic_ok = subprocess.CompletedProcess(
@@ -1211,34 +1434,33 @@ class TestBusyRunnerProtection(unittest.TestCase):
         )
         mock_run_cmd.side_effect = [list_result] + [generic_ok] * 20
 
-        with patch.object(Path, 'exists', return_value=False):
+        with patch.object(Path, 'exists', return_value=False), \
+                patch.object(self.deployer, '_is_runner_busy') as mock_busy:
             result = self.deployer.remove_runner("cpu-small-1", force=True)
 
         self.assertTrue(result)
-        # Verify no busy-check call was made (would contain '--jq' with '.busy')
-        for call in mock_run_cmd.call_args_list:
-            joined = " ".join(str(a) for a in call[0][0])
-            self.assertNotIn(".busy", joined)
+        mock_busy.assert_not_called()
 
     @patch.object(deploy_host, 'run_cmd')
     def test_busy_runner_blocked_without_force(self, mock_run_cmd):
         """remove_runner should refuse to remove a busy runner without --force"""
-        # systemctl list-units → service exists
+        # systemctl list-unit-files → service exists
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-cpu-small-1.service loaded active running\n",
+            stdout="gha-test-linux-cpu-small-1.service enabled enabled\n",
             stderr=""
         )
-        # _is_runner_busy → "true"
+        # _is_runner_busy → runner listed as busy
         busy_result = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="true\n", stderr=""
+            args=[], returncode=0,
+            stdout="test-linux-cpu-small-1\t1\tonline\ttrue\t\n", stderr=""
         )
         mock_run_cmd.side_effect = [list_result, busy_result]
 
         result = self.deployer.remove_runner("cpu-small-1", force=False)
 
         self.assertFalse(result)
-        # Only 2 calls: list-units + busy check. No stop/disable.
+        # Only 2 calls: list-unit-files + busy check. No stop/disable.
         self.assertEqual(mock_run_cmd.call_count, 2)
 
 
@@ -1363,6 +1585,12 @@ class TestValidationHelpers(unittest.TestCase):
     def test_slug_rejects_starting_hyphen(self):
         self.assertFalse(deploy_host.is_valid_slug("-org"))
 
+    def test_validators_reject_trailing_newline(self):
+        self.assertFalse(deploy_host.is_valid_slug("my-org\n"))
+        self.assertFalse(deploy_host.is_valid_octal_string("755\n"))
+        self.assertFalse(deploy_host.is_valid_systemd_memory("4G\n"))
+        self.assertFalse(deploy_host.is_valid_service_name_part("gha\n"))
+
     # -- is_valid_url_template --
     def test_url_template_valid(self):
         tpl = "https://example.com/{version}/runner-{arch}.tar.gz"
@@ -1574,6 +1802,18 @@ class TestConfigValueValidation(unittest.TestCase):
         )
         self.assertTrue(self._validate(cfg))
 
+    # -- runner.sha256 --
+
+    def test_runner_sha256_invalid_rejected(self):
+        cfg = self._base_config()
+        cfg['runner']['sha256'] = "not-a-digest"
+        self.assertFalse(self._validate(cfg))
+
+    def test_runner_sha256_valid_accepted(self):
+        cfg = self._base_config()
+        cfg['runner']['sha256'] = "a" * 64
+        self.assertTrue(self._validate(cfg))
+
     # -- org/enterprise slugs --
 
     def test_org_slug_spaces_rejected(self):
@@ -1769,6 +2009,65 @@ class TestRegisterRunnerIdempotency(unittest.TestCase):
                         return
         self.fail("Could not find a bash -c command containing both rm and config.sh")
 
+    @patch.dict(os.environ, {"REGISTER_GITHUB_RUNNER_TOKEN": "fake-token"})
+    @patch.object(deploy_host, 'run_cmd')
+    def test_labels_saved_by_registration_shell(self, mock_run_cmd):
+        """.labels is written by the runner user after config.sh, not via sudo cp"""
+        runner = self.deployer.runners[0]
+
+        def side_effect(cmd, **kwargs):
+            returncode = 1 if cmd[0] == "cat" else 0
+            return subprocess.CompletedProcess(args=cmd, returncode=returncode, stdout="", stderr="")
+
+        mock_run_cmd.side_effect = side_effect
+        self.deployer.register_runner(runner)
+
+        commands = [c[0][0] for c in mock_run_cmd.call_args_list]
+        shell_cmd = next(cmd[-1] for cmd in commands
+                         if cmd[-2:-1] == ["-c"] and "config.sh" in cmd[-1])
+        self.assertTrue(shell_cmd.endswith(f"&& printf %s {runner.labels} > .labels"))
+        self.assertFalse(any(cmd[0] in ("cp", "chown") for cmd in commands))
+
+    @patch.dict(os.environ, {"REGISTER_GITHUB_RUNNER_TOKEN": "fake-token"})
+    @patch.object(deploy_host, 'run_cmd')
+    def test_fresh_runner_registered_with_single_config_sh(self, mock_run_cmd):
+        """Without .labels, .runner or a running service there is nothing to stop or remove first"""
+        def side_effect(cmd, **kwargs):
+            returncode = 1 if cmd[0] == "cat" or "test -e" in cmd[-1] else 0
+            return subprocess.CompletedProcess(args=cmd, returncode=returncode, stdout="", stderr="")
+
+        mock_run_cmd.side_effect = side_effect
+        self.deployer.register_runner(self.deployer.runners[0])
+
+        commands = [c[0][0] for c in mock_run_cmd.call_args_list]
+        self.assertEqual(len(commands), 3)
+        self.assertEqual(commands[0][0], "cat")
+        self.assertIn("test -e", commands[1][-1])
+        self.assertIn("--replace", commands[2][-1])
+        self.assertFalse([c for c in commands if c[0] == "systemctl" or "remove" in c])
+
+    @patch.dict(os.environ, {"REGISTER_GITHUB_RUNNER_TOKEN": "fake-token"})
+    @patch.object(deploy_host, 'run_cmd')
+    def test_runner_without_labels_file_unconfigured_first(self, mock_run_cmd):
+        """A .runner or running service without .labels is stopped and removed before config.sh"""
+        runner = self.deployer.runners[0]
+
+        def side_effect(cmd, **kwargs):
+            returncode = 1 if cmd[0] == "cat" else 0
+            return subprocess.CompletedProcess(args=cmd, returncode=returncode, stdout="", stderr="")
+
+        mock_run_cmd.side_effect = side_effect
+        self.deployer.register_runner(runner)
+
+        commands = [c[0][0] for c in mock_run_cmd.call_args_list]
+        probe = commands[1][-1]
+        self.assertIn(f"test -e {runner.runner_path}/.runner ", probe)
+        self.assertIn(f"systemctl is-active --quiet {runner.service_name}.service", probe)
+        self.assertIn(["systemctl", "stop", f"{runner.service_name}.service"], commands)
+        remove = next(i for i, c in enumerate(commands) if "remove" in c)
+        register = next(i for i, c in enumerate(commands) if "--replace" in c[-1])
+        self.assertLess(remove, register)
+
     @patch.dict(os.environ, {"REGISTER_GITHUB_RUNNER_TOKEN": "fake-token"})
     @patch.object(deploy_host, 'run_cmd')
     def test_skip_registration_when_labels_match(self, mock_run_cmd):
@@ -2053,10 +2352,10 @@ class TestHealthCheck(unittest.TestCase):
     @patch.object(deploy_host, 'run_cmd')
     def test_health_returns_0_when_all_healthy(self, mock_run_cmd):
         """All runners active + online = exit code 0"""
-        # _get_deployed_runners: systemctl list-units
+        # _get_deployed_runners: systemctl list-unit-files
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-cpu-small-1.service loaded active running\n",
+            stdout="gha-test-linux-cpu-small-1.service enabled enabled\n",
             stderr=""
         )
         # _get_deployed_runners: systemctl is-active
@@ -2065,7 +2364,7 @@ class TestHealthCheck(unittest.TestCase):
         )
         # _get_runner_github_status: gh api
         gh_result = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="online/false\n", stderr=""
+            args=[], returncode=0, stdout="test-linux-cpu-small-1\t7\tonline\tfalse\t\n", stderr=""
         )
         mock_run_cmd.side_effect = [list_result, active_result, gh_result]
 
@@ -2077,14 +2376,14 @@ class TestHealthCheck(unittest.TestCase):
         """Inactive systemd service = exit code 1"""
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-cpu-small-1.service loaded inactive dead\n",
+            stdout="gha-test-linux-cpu-small-1.service enabled enabled\n",
             stderr=""
         )
         inactive_result = subprocess.CompletedProcess(
             args=[], returncode=3, stdout="inactive\n", stderr=""
         )
         gh_result = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="offline/false\n", stderr=""
+            args=[], returncode=0, stdout="test-linux-cpu-small-1\t7\toffline\tfalse\t\n", stderr=""
         )
         mock_run_cmd.side_effect = [list_result, inactive_result, gh_result]
 
@@ -2097,14 +2396,14 @@ class TestHealthCheck(unittest.TestCase):
         import json as json_mod
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-cpu-small-1.service loaded active running\n",
+            stdout="gha-test-linux-cpu-small-1.service enabled enabled\n",
             stderr=""
         )
         active_result = subprocess.CompletedProcess(
             args=[], returncode=0, stdout="active\n", stderr=""
         )
         gh_result = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="online/false\n", stderr=""
+            args=[], returncode=0, stdout="test-linux-cpu-small-1\t7\tonline\tfalse\t\n", stderr=""
         )
         mock_run_cmd.side_effect = [list_result, active_result, gh_result]
 
@@ -2136,14 +2435,14 @@ class TestHealthCheck(unittest.TestCase):
         """Busy runner (active + busy) should be considered healthy"""
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-cpu-small-1.service loaded active running\n",
+            stdout="gha-test-linux-cpu-small-1.service enabled enabled\n",
             stderr=""
         )
         active_result = subprocess.CompletedProcess(
             args=[], returncode=0, stdout="active\n", stderr=""
         )
         gh_result = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="online/true\n", stderr=""
+            args=[], returncode=0, stdout="test-linux-cpu-small-1\t7\tonline\ttrue\t\n", stderr=""
         )
         mock_run_cmd.side_effect = [list_result, active_result, gh_result]
 
@@ -2187,7 +2486,7 @@ class TestMetrics(unittest.TestCase):
         """Output file should contain valid Prometheus text format"""
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-cpu-small-1.service loaded active running\n",
+            stdout="gha-test-linux-cpu-small-1.service enabled enabled\n",
             stderr=""
         )
         active_result = subprocess.CompletedProcess(
@@ -2219,7 +2518,7 @@ class TestMetrics(unittest.TestCase):
         """Metrics should be written atomically (no partial files on failure)"""
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-cpu-small-1.service loaded active running\n",
+            stdout="gha-test-linux-cpu-small-1.service enabled enabled\n",
             stderr=""
         )
         active_result = subprocess.CompletedProcess(
@@ -2242,7 +2541,7 @@ class TestMetrics(unittest.TestCase):
         """Active runners should have up=1, inactive should have up=0"""
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-cpu-small-1.service loaded active running\n",
+            stdout="gha-test-linux-cpu-small-1.service enabled enabled\n",
             stderr=""
         )
         active_result = subprocess.CompletedProcess(
@@ -2326,9 +2625,9 @@ class TestPoolFilter(unittest.TestCase):
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
             stdout=(
-                "gha-test-linux-cpu-small-1.service loaded active running\n"
-                "gha-test-linux-cpu-medium-docker-1.service loaded active running\n"
-                "gha-test-linux-gpu-max-1.service loaded active running\n"
+                "gha-test-linux-cpu-small-1.service enabled enabled\n"
+                "gha-test-linux-cpu-medium-docker-1.service enabled enabled\n"
+                "gha-test-linux-gpu-max-1.service enabled enabled\n"
             ),
             stderr=""
         )
@@ -2347,9 +2646,9 @@ class TestPoolFilter(unittest.TestCase):
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
             stdout=(
-                "gha-test-linux-cpu-small-1.service loaded active running\n"
-                "gha-test-linux-cpu-medium-docker-1.service loaded active running\n"
-                "gha-test-linux-gpu-max-1.service loaded active running\n"
+                "gha-test-linux-cpu-small-1.service enabled enabled\n"
+                "gha-test-linux-cpu-medium-docker-1.service enabled enabled\n"
+                "gha-test-linux-gpu-max-1.service enabled enabled\n"
             ),
             stderr=""
         )
@@ -2368,26 +2667,50 @@ class TestPoolFilter(unittest.TestCase):
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
             stdout=(
-                "gha-test-linux-cpu-small-1.service loaded active running\n"
-                "gha-test-linux-cpu-medium-docker-1.service loaded active running\n"
-                "gha-test-linux-gpu-max-1.service loaded active running\n"
+                "gha-test-linux-cpu-small-1.service enabled enabled\n"
+                "gha-test-linux-cpu-medium-docker-1.service enabled enabled\n"
+                "gha-test-linux-gpu-max-1.service enabled enabled\n"
             ),
             stderr=""
         )
         active_result = subprocess.CompletedProcess(
-            args=[], returncode=0, stdout="active\n", stderr=""
+            args=[], returncode=0, stdout="active\nfailed\nactive\n", stderr=""
         )
-        mock_run_cmd.side_effect = [list_result] + [active_result] * 3
+        mock_run_cmd.side_effect = [list_result, active_result]
 
         runners = self.deployer._get_deployed_runners(pool=None)
         self.assertEqual(len(runners), 3)
+        self.assertEqual([r['status'] for r in runners], ["active", "failed", "active"])
+        is_active = mock_run_cmd.call_args_list[1][0][0]
+        self.assertEqual(is_active[:2], ["systemctl", "is-active"])
+        self.assertEqual(len(is_active), 5)
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_runners_discovered_from_unit_files(self, mock_run_cmd):
+        """Discovery lists unit files; two- and three-column output both parse"""
+        list_result = subprocess.CompletedProcess(
+            args=[], returncode=0,
+            stdout=("gha-test-linux-cpu-small-1.service enabled\n"
+                    "gha-test-linux-gpu-max-1.service disabled enabled\n"),
+            stderr=""
+        )
+        states = subprocess.CompletedProcess(
+            args=[], returncode=3, stdout="active\ninactive\n", stderr=""
+        )
+        mock_run_cmd.side_effect = [list_result, states]
+
+        runners = self.deployer._get_deployed_runners()
+        self.assertEqual(mock_run_cmd.call_args_list[0][0][0][:2],
+                         ["systemctl", "list-unit-files"])
+        self.assertEqual([(r['name'], r['status']) for r in runners],
+                         [("cpu-small-1", "active"), ("gpu-max-1", "inactive")])
 
     @patch.object(deploy_host, 'run_cmd')
     def test_pool_no_match_returns_empty(self, mock_run_cmd):
         """Pool filter with no matches should return empty list"""
         list_result = subprocess.CompletedProcess(
             args=[], returncode=0,
-            stdout="gha-test-linux-cpu-small-1.service loaded active running\n",
+            stdout="gha-test-linux-cpu-small-1.service enabled enabled\n",
             stderr=""
         )
         mock_run_cmd.side_effect = [list_result]
@@ -2630,5 +2953,978 @@ class TestResourceBudgetValidation(unittest.TestCase):
         self.assertFalse(self._validate(config))
 
 
+class TestParallelDeploy(unittest.TestCase):
+    """Test that per-runner deployment runs concurrently and reloads systemd once"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = Path(self.temp_dir) / "test-config.yml"
+        cfg = {
+            'github': {'org': 'test-org', 'prefix': 'test', 'scope': 'org'},
+            'host': {
+                'runner_base': '/srv/gha',
+                'docker_socket': '/var/run/docker.sock',
+                'docker_user_uid': 1003,
+                'docker_user_gid': 1003,
+                'label': 'test-host',
+            },
+            'cache': {'base_dir': '/srv/gha-cache', 'permissions': '755'},
+            'runners': ['cpu-small-1', 'cpu-small-2', 'cpu-small-docker-1'],
+            'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
+            'runner': {'version': '2.321.0', 'arch': 'linux-x64'},
+        }
+        with open(self.config_file, 'w') as f:
+            yaml.dump(cfg, f)
+        self.deployer = HostDeployer(config_path=str(self.config_file))
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_parallel_calls_every_item(self):
+        """_parallel should call fn once per item"""
+        seen = []
+        self.deployer._parallel(seen.append, [1, 2, 3])
+        self.assertEqual(sorted(seen), [1, 2, 3])
+
+    def test_parallel_limit_of_one_runs_serially(self):
+        """--parallel 1 runs every item on a single worker thread"""
+        import threading
+        threads = set()
+        with patch.object(deploy_host, 'MAX_PARALLEL_RUNNERS', 1):
+            self.deployer._parallel(
+                lambda item: threads.add(threading.get_ident()), [1, 2, 3, 4]
+            )
+        self.assertEqual(len(threads), 1)
+
+    def test_parallel_reraises_failure(self):
+        """A failure (including sys.exit) in one item is re-raised"""
+        def fn(item):
+            if item == 2:
+                sys.exit(1)
+
+        with self.assertRaises(SystemExit):
+            self.deployer._parallel(fn, [1, 2, 3])
+
+    def test_parallel_tags_log_lines_with_runner(self):
+        """Log output from worker threads is prefixed with the runner name"""
+        from io import StringIO
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            self.deployer._parallel(lambda r: deploy_host.log("working"), self.deployer.runners)
+        lines = sorted(mock_stdout.getvalue().splitlines())
+        self.assertEqual(len(lines), 3)
+        for line, runner in zip(lines, sorted(r.name for r in self.deployer.runners)):
+            self.assertTrue(line.endswith(f"[{runner}] working"))
+
+    def test_parallel_empty(self):
+        """No items is a no-op"""
+        self.deployer._parallel(self.fail, [])
+
+    @patch.object(deploy_host, 'run_cmd')
+    @patch.object(deploy_host, 'check_requirements')
+    def test_deploy_reloads_systemd_once(self, mock_check, mock_run_cmd):
+        """Unit files are written per runner, then one reload/enable/restart for all"""
+        d = self.deployer
+        with patch.object(d, 'ensure_github_token', return_value=True), \
+                patch.object(d, 'ensure_directories'), \
+                patch.object(d, 'cleanup_removed_runners'), \
+                patch.object(d, 'configure_sudoers'), \
+                patch.object(d, 'install_runner_binary'), \
+                patch.object(d, 'register_runner'), \
+                patch.object(d, 'create_cleanup_hook'), \
+                patch.object(d, 'write_systemd_service') as mock_write, \
+                patch.object(d, 'sync_labels_via_api'), \
+                patch.object(d, 'print_summary'):
+            d.deploy()
+
+        self.assertEqual(mock_write.call_count, 3)
+        commands = [c[0][0] for c in mock_run_cmd.call_args_list]
+        self.assertEqual(commands.count(["systemctl", "daemon-reload"]), 1)
+        restarts = [c for c in commands if c[:2] == ["systemctl", "restart"]]
+        self.assertEqual(len(restarts), 1)
+        self.assertEqual(restarts[0][2:], [f"{r.service_name}.service" for r in d.runners])
+        enables = [c for c in commands if c[:2] == ["systemctl", "enable"]]
+        self.assertEqual(len(enables), 1)
+
+    @patch.object(deploy_host, 'run_cmd')
+    @patch.object(deploy_host, 'check_requirements')
+    def test_deploy_authorizes_sudo_once_up_front(self, mock_check, mock_run_cmd):
+        """A non-root deploy runs sudo -v before any other command"""
+        d = self.deployer
+        with patch.object(deploy_host, 'IS_ROOT', False), \
+                patch.object(d, 'ensure_github_token', return_value=True), \
+                patch.object(d, 'install_runner_binary'), \
+                patch.object(d, 'register_runner'), \
+                patch.object(d, 'create_cleanup_hook'), \
+                patch.object(d, 'cleanup_removed_runners'), \
+                patch.object(d, 'configure_sudoers'), \
+                patch.object(d, 'write_systemd_service', return_value=False), \
+                patch.object(d, 'sync_labels_via_api'), \
+                patch.object(d, 'print_summary'):
+            d.deploy()
+
+        commands = [c[0][0] for c in mock_run_cmd.call_args_list]
+        self.assertEqual(commands[0], ["sudo", "-v"])
+        self.assertEqual(commands.count(["sudo", "-v"]), 1)
+
+        mock_run_cmd.reset_mock()
+        with patch.object(deploy_host, 'IS_ROOT', True):
+            self.assertIsNone(d._authorize_sudo())
+        mock_run_cmd.assert_not_called()
+
+    @patch.object(deploy_host, 'run_cmd')
+    @patch.object(deploy_host, 'check_requirements')
+    def test_deploy_unchanged_units_not_restarted(self, mock_check, mock_run_cmd):
+        """Unchanged unit files skip daemon-reload and use start, not restart"""
+        d = self.deployer
+        with patch.object(d, 'ensure_github_token', return_value=True), \
+                patch.object(d, 'ensure_directories'), \
+                patch.object(d, 'cleanup_removed_runners'), \
+                patch.object(d, 'configure_sudoers'), \
+                patch.object(d, 'install_runner_binary'), \
+                patch.object(d, 'register_runner'), \
+                patch.object(d, 'create_cleanup_hook'), \
+                patch.object(d, 'write_systemd_service', return_value=False), \
+                patch.object(d, 'sync_labels_via_api'), \
+                patch.object(d, 'print_summary'):
+            d.deploy()
+
+        commands = [c[0][0] for c in mock_run_cmd.call_args_list]
+        self.assertNotIn(["systemctl", "daemon-reload"], commands)
+        self.assertFalse([c for c in commands if c[:2] == ["systemctl", "restart"]])
+        starts = [c for c in commands if c[:3] == ["systemctl", "enable", "--now"]]
+        self.assertEqual(len(starts), 1)
+        self.assertEqual(len(starts[0]) - 3, 3)
+        self.assertFalse([c for c in commands if c[:2] == ["systemctl", "start"]])
+
+    @patch.object(deploy_host, 'run_cmd')
+    @patch.object(deploy_host, 'check_requirements')
+    def test_deploy_reloads_once_after_cleanup(self, mock_check, mock_run_cmd):
+        """Removed runners and unchanged units share a single daemon-reload"""
+        d = self.deployer
+
+        def cleanup():
+            d._daemon_reload_pending = True
+
+        with patch.object(d, 'ensure_github_token', return_value=True), \
+                patch.object(d, 'ensure_directories'), \
+                patch.object(d, 'cleanup_removed_runners', side_effect=cleanup), \
+                patch.object(d, 'configure_sudoers'), \
+                patch.object(d, 'install_runner_binary'), \
+                patch.object(d, 'register_runner'), \
+                patch.object(d, 'create_cleanup_hook'), \
+                patch.object(d, 'write_systemd_service', return_value=False), \
+                patch.object(d, 'sync_labels_via_api'), \
+                patch.object(d, 'print_summary'):
+            d.deploy()
+
+        commands = [c[0][0] for c in mock_run_cmd.call_args_list]
+        self.assertEqual(commands.count(["systemctl", "daemon-reload"]), 1)
+        self.assertFalse(d._daemon_reload_pending)
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_upgrade_runs_per_runner_then_one_status_check(self, mock_run_cmd):
+        """Each runner is upgraded through the pool, then settled units are checked once"""
+        d = self.deployer
+        deployed = [
+            {'name': r.name, 'service': f"{r.service_name}.service",
+             'path': Path(r.runner_path), 'exists': True, 'status': 'active'}
+            for r in d.runners
+        ]
+        mock_run_cmd.return_value = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="active\nactive\nfailed\n", stderr=""
+        )
+        with patch.object(d, '_get_deployed_runners', return_value=deployed), \
+                patch.object(d, '_ensure_runner_template', return_value=Path("/cache/t")), \
+                patch.object(d, '_upgrade_runner') as mock_upgrade, \
+                patch.object(deploy_host.time, 'sleep') as mock_sleep:
+            d.upgrade_runners()
+
+        self.assertEqual(sorted(c[0][0]['name'] for c in mock_upgrade.call_args_list),
+                         sorted(r.name for r in d.runners))
+        # One settle wait for all runners, then one status query
+        mock_sleep.assert_called_once_with(deploy_host.SERVICE_SETTLE_TIME)
+        mock_run_cmd.assert_called_once()
+        self.assertEqual(mock_run_cmd.call_args[0][0][:2], ["systemctl", "is-active"])
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_upgrade_authorizes_sudo_and_stops_keepalive(self, mock_run_cmd):
+        """sudo is authorized before the upgrade threads start and the refresh always stops"""
+        d = self.deployer
+        deployed = [
+            {'name': r.name, 'service': f"{r.service_name}.service",
+             'path': Path(r.runner_path), 'exists': True, 'status': 'active'}
+            for r in d.runners
+        ]
+        keepalive = MagicMock()
+        with patch.object(d, '_get_deployed_runners', return_value=deployed), \
+                patch.object(d, '_authorize_sudo', return_value=keepalive) as mock_authorize, \
+                patch.object(d, '_ensure_runner_template', return_value=Path("/cache/t")), \
+                patch.object(d, '_upgrade_runner', side_effect=RuntimeError("tar failed")):
+            with self.assertRaises(RuntimeError):
+                d.upgrade_runners()
+
+        mock_authorize.assert_called_once()
+        keepalive.set.assert_called_once()
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_wait_for_services_polls_while_starting(self, mock_run_cmd):
+        """Units still activating are polled again until they settle"""
+        mock_run_cmd.side_effect = [
+            subprocess.CompletedProcess(args=[], returncode=3,
+                                        stdout="active\nactivating\n", stderr=""),
+            subprocess.CompletedProcess(args=[], returncode=0,
+                                        stdout="active\nactive\n", stderr=""),
+        ]
+        with patch.object(deploy_host.time, 'sleep') as mock_sleep:
+            states = self.deployer._wait_for_services(["a.service", "b.service"])
+
+        self.assertEqual(states, ["active", "active"])
+        self.assertEqual(mock_run_cmd.call_count, 2)
+        self.assertEqual([c[0][0] for c in mock_sleep.call_args_list],
+                         [deploy_host.SERVICE_SETTLE_TIME, deploy_host.SERVICE_POLL_INTERVAL])
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_upgrade_copies_from_template(self, mock_run_cmd):
+        """An upgrade copies binaries from the template instead of re-extracting"""
+        runner_path = Path(self.temp_dir) / "test-linux-cpu-small-1"
+        runner_path.mkdir()
+        (runner_path / ".backup-done").touch()
+        info = {'name': 'cpu-small-1', 'service': 'gha-test-linux-cpu-small-1.service',
+                'path': runner_path}
+
+        self.deployer._upgrade_runner(info, Path("/cache/t"), ["--exclude=_work"])
+
+        commands = [c[0][0] for c in mock_run_cmd.call_args_list]
+        self.assertFalse([c for c in commands if c[0] == "tar"])
+        scripts = [c[2] for c in commands if c[:2] == ["bash", "-c"]]
+        self.assertEqual(len(scripts), 1)
+        self.assertIn(f"cp -a --reflink=auto --remove-destination /cache/t/. {runner_path}",
+                      scripts[0])
+        self.assertNotIn("cp -al", scripts[0])
+        self.assertIn(f"find {runner_path} \\( ! -uid 1003 -o ! -gid 1003 \\)"
+                      f" -exec chown -h 1003:1003 {{}} +", scripts[0])
+
+
+class TestEnsureDirectories(unittest.TestCase):
+    """Test runner directory creation"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = Path(self.temp_dir) / "test-config.yml"
+        cfg = {
+            'github': {'org': 'test-org', 'prefix': 'test', 'scope': 'org'},
+            'host': {
+                'runner_base': '/srv/gha',
+                'docker_socket': '/var/run/docker.sock',
+                'docker_user_uid': 1003,
+                'docker_user_gid': 1003,
+                'label': 'test-host',
+            },
+            'cache': {'base_dir': '/srv/gha-cache', 'permissions': '755'},
+            'runners': ['cpu-small-1', 'cpu-small-2', 'cpu-small-docker-1'],
+            'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
+            'runner': {'version': '2.321.0', 'arch': 'linux-x64'},
+        }
+        with open(self.config_file, 'w') as f:
+            yaml.dump(cfg, f)
+        self.deployer = HostDeployer(config_path=str(self.config_file))
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_ensure_directories_single_sudo_call(self, mock_run_cmd):
+        """All mkdir/chown/chmod work is batched into one privileged shell"""
+        self.deployer.ensure_directories()
+
+        mock_run_cmd.assert_called_once()
+        cmd = mock_run_cmd.call_args[0][0]
+        self.assertEqual(cmd[:2], ["bash", "-c"])
+        self.assertTrue(mock_run_cmd.call_args[1]['sudo'])
+        script = cmd[2]
+        for path in ['/srv/gha/test-linux-cpu-small-1', '/srv/gha/test-linux-cpu-small-docker-1',
+                     '/srv/gha-cache']:
+            self.assertIn(path, script)
+        # Only entries not already owned by the runner user are chowned
+        self.assertIn(r'find /srv/gha \( ! -uid 1003 -o ! -gid 1003 \) -exec chown -h 1003:1003 {} +',
+                      script)
+        self.assertIn('chmod 755 /srv/gha-cache', script)
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_ensure_directories_lists_base_once(self, mock_run_cmd):
+        """Existing runner directories are found from one listing of the base"""
+        base = Path(self.temp_dir) / "runners"
+        (base / "test-linux-cpu-small-1").mkdir(parents=True)
+        cfg = yaml.safe_load(self.config_file.read_text())
+        cfg['host']['runner_base'] = str(base)
+        cfg['cache']['base_dir'] = self.temp_dir
+        self.config_file.write_text(yaml.dump(cfg))
+        d = HostDeployer(config_path=str(self.config_file))
+
+        with patch.object(deploy_host.Path, 'exists', autospec=True,
+                          side_effect=lambda p: os.path.exists(p)) as mock_exists:
+            d.ensure_directories()
+
+        checked = [str(c[0][0]) for c in mock_exists.call_args_list]
+        self.assertNotIn(str(base / "test-linux-cpu-small-1"), checked)
+        script = mock_run_cmd.call_args[0][0][2]
+        mkdir = next(part for part in script.split("; ") if part.startswith("mkdir"))
+        self.assertNotIn("test-linux-cpu-small-1", mkdir)
+        self.assertIn(str(base / "test-linux-cpu-small-2"), mkdir)
+        self.assertIn(str(base / "test-linux-cpu-small-docker-1"), mkdir)
+
+
+class TestRunnerTarballCache(unittest.TestCase):
+    """Test the shared runner tarball download and extracted template"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = Path(self.temp_dir) / "test-config.yml"
+        cfg = {
+            'github': {'org': 'test-org', 'prefix': 'test', 'scope': 'org'},
+            'host': {
+                'runner_base': '/srv/gha',
+                'docker_socket': '/var/run/docker.sock',
+                'docker_user_uid': 1003,
+                'docker_user_gid': 1003,
+                'label': 'test-host',
+            },
+            'cache': {'base_dir': '/srv/gha-cache', 'permissions': '755'},
+            'runners': ['cpu-small-1', 'cpu-small-2', 'cpu-small-docker-1'],
+            'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
+            'runner': {'version': '2.321.0', 'arch': 'linux-x64'},
+        }
+        with open(self.config_file, 'w') as f:
+            yaml.dump(cfg, f)
+        self.deployer = HostDeployer(config_path=str(self.config_file))
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_tarball_downloaded_once_for_all_runners(self, mock_run_cmd):
+        """One download and one extraction are shared by every runner"""
+        d = self.deployer
+        with patch.object(deploy_host, 'RUNNER_TARBALL_CACHE_DIR', self.temp_dir):
+            d._parallel(d.install_runner_binary, d.runners)
+
+        scripts = [c[0][0][2] for c in mock_run_cmd.call_args_list
+                   if c[0][0][:2] == ["bash", "-c"]]
+        downloads = [s for s in scripts if 'curl' in s]
+        self.assertEqual(len(downloads), 1)
+        self.assertIn('flock', downloads[0])
+        self.assertIn('--retry 3', downloads[0])
+        tarball = str(Path(self.temp_dir) / "actions-runner-linux-x64-2.321.0.tar.gz")
+        extracts = [s for s in scripts if f"-f {tarball} -C" in s]
+        self.assertEqual(len(extracts), 1)
+        template = str(Path(self.temp_dir) / "actions-runner-linux-x64-2.321.0")
+        copies = sorted(s for s in scripts
+                        if f"cp -a --reflink=auto --remove-destination {template}/." in s)
+        self.assertEqual(len(copies), 3)
+        for copy, runner in zip(copies, sorted(d.runners, key=lambda r: r.runner_path)):
+            self.assertIn(runner.runner_path, copy)
+            self.assertIn(f"find {runner.runner_path} \\( ! -uid 1003", copy)
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_template_not_owned_by_root_is_extracted_again(self, mock_run_cmd):
+        """A template chowned through old hardlinks is replaced, a root-owned one reused"""
+        d = self.deployer
+        tarball = Path(self.temp_dir) / "actions-runner-linux-x64-2.321.0.tar.gz"
+        template = Path(self.temp_dir) / "actions-runner-linux-x64-2.321.0"
+        template.mkdir()
+        (template / "config.sh").touch()
+
+        with patch.object(deploy_host, 'RUNNER_TARBALL_CACHE_DIR', self.temp_dir), \
+                patch.object(d, '_ensure_tarball_cached', return_value=tarball), \
+                patch.object(deploy_host, '_owner_uid', return_value=0):
+            self.assertEqual(d._ensure_runner_template(), template)
+        mock_run_cmd.assert_not_called()
+
+        d._template_path = None
+        with patch.object(deploy_host, 'RUNNER_TARBALL_CACHE_DIR', self.temp_dir), \
+                patch.object(d, '_ensure_tarball_cached', return_value=tarball), \
+                patch.object(deploy_host, '_owner_uid', return_value=1003):
+            self.assertEqual(d._ensure_runner_template(), template)
+        script = mock_run_cmd.call_args[0][0][2]
+        self.assertIn(f"stat -c %u {template / 'config.sh'}", script)
+        self.assertIn(f"rm -rf {template} && mv {template}.part {template}", script)
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_cached_tarball_checked_against_sha256(self, mock_run_cmd):
+        """A cached tarball is reused only if it matches runner.sha256"""
+        import hashlib
+        d = self.deployer
+        tarball = Path(self.temp_dir) / "actions-runner-linux-x64-2.321.0.tar.gz"
+        tarball.write_bytes(b"runner" * 1000)
+        digest = hashlib.sha256(tarball.read_bytes()).hexdigest()
+        self.assertEqual(deploy_host._file_sha256(tarball), digest)
+
+        d.config['runner']['sha256'] = digest.upper()
+        with patch.object(deploy_host, 'RUNNER_TARBALL_CACHE_DIR', self.temp_dir):
+            self.assertEqual(d._ensure_tarball_cached(), tarball)
+        mock_run_cmd.assert_not_called()
+
+        def run_cmd(cmd, **kwargs):
+            if cmd[0] == "flock":
+                tarball.unlink()
+
+        mock_run_cmd.side_effect = run_cmd
+        d._tarball_path = None
+        d.config['runner']['sha256'] = "0" * 64
+        with patch.object(deploy_host, 'RUNNER_TARBALL_CACHE_DIR', self.temp_dir):
+            d._ensure_tarball_cached()
+
+        commands = [c[0][0] for c in mock_run_cmd.call_args_list]
+        self.assertEqual(commands[0][-2:], [str(tarball), str(tarball)[:-len(".tar.gz")]])
+        self.assertEqual(len(commands), 2)
+        self.assertIn('curl', commands[1][2])
+
+
+class TestLabelSync(unittest.TestCase):
+    """Test syncing runner labels to GitHub"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = Path(self.temp_dir) / "test-config.yml"
+        cfg = {
+            'github': {'org': 'test-org', 'prefix': 'test', 'scope': 'org'},
+            'host': {
+                'runner_base': '/srv/gha',
+                'docker_socket': '/var/run/docker.sock',
+                'docker_user_uid': 1003,
+                'docker_user_gid': 1003,
+                'label': 'test-host',
+            },
+            'cache': {'base_dir': '/srv/gha-cache', 'permissions': '755'},
+            'runners': ['cpu-small-1', 'cpu-small-2', 'cpu-small-docker-1'],
+            'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
+            'runner': {'version': '2.321.0', 'arch': 'linux-x64'},
+        }
+        with open(self.config_file, 'w') as f:
+            yaml.dump(cfg, f)
+        self.deployer = HostDeployer(config_path=str(self.config_file))
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch.object(deploy_host.subprocess, 'Popen')
+    @patch.object(deploy_host.subprocess, 'run')
+    def test_label_sync_lists_runners_once(self, mock_run, mock_popen):
+        """Runner IDs come from one listing call; labels are PUT per runner"""
+        d = self.deployer
+        d.config['github_api'] = {'enforce_labels': True}
+        mock_run.return_value = subprocess.CompletedProcess(
+            args=[], returncode=0, stderr='',
+            stdout=("test-linux-cpu-small-1\t11\tonline\tfalse\t\n"
+                    "test-linux-cpu-small-2\t12\tonline\tfalse\t\n"
+                    "other\t99\toffline\tfalse\t\n"))
+        mock_popen.return_value.communicate.return_value = ('', '')
+        mock_popen.return_value.returncode = 0
+
+        with patch.dict(os.environ, {'REGISTER_GITHUB_RUNNER_TOKEN': 'x' * 29}), \
+                patch.object(d, 'github_client', None), \
+                patch.object(deploy_host.shutil, 'which', return_value='/usr/bin/gh'):
+            d.sync_labels_via_api()
+
+        self.assertEqual(mock_run.call_count, 1)
+        put_paths = sorted(c[0][0][-3] for c in mock_popen.call_args_list)
+        self.assertEqual(put_paths, [
+            '/orgs/test-org/actions/runners/11/labels',
+            '/orgs/test-org/actions/runners/12/labels',
+        ])
+
+    @patch.object(deploy_host.subprocess, 'Popen')
+    @patch.object(deploy_host.subprocess, 'run')
+    def test_label_updates_run_concurrently(self, mock_run, mock_popen):
+        """Label PUTs for different runners are in flight at the same time"""
+        import threading
+        d = self.deployer
+        d.config['github_api'] = {'enforce_labels': True}
+        mock_run.return_value = subprocess.CompletedProcess(
+            args=[], returncode=0, stderr='',
+            stdout="".join(f"{r.registered_name}\t{i}\tonline\tfalse\t\n"
+                           for i, r in enumerate(d.runners)))
+
+        # Each PUT waits until every runner's PUT has started; this only
+        # completes if they run concurrently rather than one after another.
+        barrier = threading.Barrier(len(d.runners), timeout=5)
+
+        def communicate(input=None):
+            barrier.wait()
+            return ('', '')
+
+        mock_popen.return_value.communicate.side_effect = communicate
+        mock_popen.return_value.returncode = 0
+
+        with patch.dict(os.environ, {'REGISTER_GITHUB_RUNNER_TOKEN': 'x' * 29}), \
+                patch.object(d, 'github_client', None), \
+                patch.object(deploy_host.shutil, 'which', return_value='/usr/bin/gh'):
+            d.sync_labels_via_api()
+
+        self.assertEqual(mock_popen.call_count, len(d.runners))
+        self.assertFalse(barrier.broken)
+
+    def test_label_sync_with_api_token_skips_gh(self):
+        """With a REST client, listing and label PUTs go over HTTPS"""
+        d = self.deployer
+        d.config['github_api'] = {'enforce_labels': True}
+        client = MagicMock()
+        client.list_runners.return_value = [
+            {'name': r.registered_name, 'id': 20 + i} for i, r in enumerate(d.runners)
+        ]
+
+        with patch.dict(os.environ, {'REGISTER_GITHUB_RUNNER_TOKEN': 'x' * 29}), \
+                patch.object(d, 'github_client', client), \
+                patch.object(deploy_host.subprocess, 'run') as mock_run, \
+                patch.object(deploy_host.subprocess, 'Popen') as mock_popen:
+            d.sync_labels_via_api()
+
+        mock_run.assert_not_called()
+        mock_popen.assert_not_called()
+        client.list_runners.assert_called_once_with('/orgs/test-org/actions/runners')
+        put_paths = sorted(c[0][1] for c in client.request.call_args_list)
+        self.assertEqual(put_paths, [f'/orgs/test-org/actions/runners/{20 + i}/labels'
+                                     for i in range(3)])
+
+    def test_label_sync_skips_runners_with_current_labels(self):
+        """Only runners whose custom labels differ on GitHub get a PUT"""
+        d = self.deployer
+        d.config['github_api'] = {'enforce_labels': True}
+        current, stale = d.runners[0], d.runners[1]
+        client = MagicMock()
+        # As returned by the API: read-only defaults are capitalized and
+        # every label carries its type
+        read_only = [{'id': i, 'name': name, 'type': 'read-only'}
+                     for i, name in enumerate(['self-hosted', 'Linux', 'X64'])]
+        custom_labels = [l for l in current.labels.split(',') if l not in ('self-hosted', 'linux')]
+        client.list_runners.return_value = [
+            {'name': current.registered_name, 'id': 1,
+             'labels': read_only + [{'id': 10 + i, 'name': l.upper(), 'type': 'custom'}
+                                    for i, l in enumerate(custom_labels)]},
+            {'name': stale.registered_name, 'id': 2,
+             'labels': read_only + [{'id': 20, 'name': 'old-label', 'type': 'custom'}]},
+        ]
+
+        with patch.dict(os.environ, {'REGISTER_GITHUB_RUNNER_TOKEN': 'x' * 29}), \
+                patch.object(d, 'github_client', client):
+            d.sync_labels_via_api()
+
+        client.request.assert_called_once()
+        self.assertEqual(client.request.call_args[0][1], '/orgs/test-org/actions/runners/2/labels')
+
+
+class TestGitHubRunnerListing(unittest.TestCase):
+    """Test the shared listing of the organization's runners on GitHub"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = Path(self.temp_dir) / "test-config.yml"
+        cfg = {
+            'github': {'org': 'test-org', 'prefix': 'test', 'scope': 'org'},
+            'host': {
+                'runner_base': '/srv/gha',
+                'docker_socket': '/var/run/docker.sock',
+                'docker_user_uid': 1003,
+                'docker_user_gid': 1003,
+                'label': 'test-host',
+            },
+            'cache': {'base_dir': '/srv/gha-cache', 'permissions': '755'},
+            'runners': ['cpu-small-1', 'cpu-small-2', 'cpu-small-docker-1'],
+            'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
+            'runner': {'version': '2.321.0', 'arch': 'linux-x64'},
+        }
+        with open(self.config_file, 'w') as f:
+            yaml.dump(cfg, f)
+        self.deployer = HostDeployer(config_path=str(self.config_file))
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_runner_listing_shared_between_lookups(self):
+        """Busy checks and status lookups reuse one listing until it expires"""
+        d = self.deployer
+        client = MagicMock()
+        client.list_runners.return_value = [
+            {'name': 'test-linux-old-1', 'id': 5, 'status': 'online', 'busy': True},
+        ]
+
+        with patch.object(d, 'github_client', client), \
+                patch.object(deploy_host.time, 'monotonic', return_value=1000.0) as clock:
+            self.assertTrue(d._is_runner_busy('old-1'))
+            self.assertEqual(d._get_runner_github_status('old-1'), 'busy')
+            self.assertIsNone(d._is_runner_busy('old-2'))
+            self.assertEqual(client.list_runners.call_count, 1)
+
+            clock.return_value = 1000.0 + deploy_host.GITHUB_RUNNERS_TTL
+            d._is_runner_busy('old-1')
+            self.assertEqual(client.list_runners.call_count, 2)
+
+
+class TestInstallContent(unittest.TestCase):
+    """Test installing generated files (units, hooks, sudoers)"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = Path(self.temp_dir) / "test-config.yml"
+        cfg = {
+            'github': {'org': 'test-org', 'prefix': 'test', 'scope': 'org'},
+            'host': {
+                'runner_base': '/srv/gha',
+                'docker_socket': '/var/run/docker.sock',
+                'docker_user_uid': 1003,
+                'docker_user_gid': 1003,
+                'label': 'test-host',
+            },
+            'cache': {'base_dir': '/srv/gha-cache', 'permissions': '755'},
+            'runners': ['cpu-small-1', 'cpu-small-2', 'cpu-small-docker-1'],
+            'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
+            'runner': {'version': '2.321.0', 'arch': 'linux-x64'},
+        }
+        with open(self.config_file, 'w') as f:
+            yaml.dump(cfg, f)
+        self.deployer = HostDeployer(config_path=str(self.config_file))
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_generated_files_replaced_atomically(self, mock_run_cmd):
+        """Units are piped to a dotted sibling and renamed over the target"""
+        d = self.deployer
+        runner = d.runners[0]
+        with patch.object(deploy_host, '_read_text_or_none', return_value=None):
+            d.write_systemd_service(runner)
+
+        cmd = mock_run_cmd.call_args[0][0]
+        unit = re.escape(f"/etc/systemd/system/{runner.service_name}.service")
+        self.assertEqual(cmd[:2], ["bash", "-c"])
+        self.assertRegex(cmd[2], rf"cat > {unit}\.tmp && chown root:root {unit}\.tmp"
+                                 rf" && chmod 644 {unit}\.tmp && mv -f {unit}\.tmp {unit};")
+        self.assertIn("[Service]", mock_run_cmd.call_args[1]['input'])
+
+    def test_install_content_shell(self):
+        """The install shell writes the file, and leaves nothing behind on failure"""
+        def run_unprivileged(cmd, **kwargs):
+            return subprocess.run(cmd, input=kwargs['input'], text=True, check=True,
+                                  capture_output=True)
+
+        dest = Path(self.temp_dir) / "unit.service"
+        with patch.object(deploy_host, 'run_cmd', side_effect=run_unprivileged):
+            self.deployer._install_content("one\n", dest, os.getuid(), os.getgid(), "640",
+                                           sudo_reason="test")
+            self.assertEqual(dest.read_text(), "one\n")
+            self.assertEqual(dest.stat().st_mode & 0o777, 0o640)
+
+            with self.assertRaises(subprocess.CalledProcessError) as ctx:
+                self.deployer._install_content("two\n", dest, os.getuid(), os.getgid(), "640",
+                                               sudo_reason="test", validate="false")
+        self.assertEqual(ctx.exception.returncode, deploy_host.INSTALL_VALIDATION_FAILED)
+        self.assertEqual(dest.read_text(), "one\n")
+        self.assertFalse(Path(f"{dest}.tmp").exists())
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_write_systemd_service_skips_identical_unit(self, mock_run_cmd):
+        """An installed unit with identical content is not rewritten"""
+        d = self.deployer
+        runner = d.runners[0]
+
+        with patch.object(deploy_host, '_read_text_or_none', return_value=None):
+            self.assertTrue(d.write_systemd_service(runner))
+        written = mock_run_cmd.call_args[1]['input']
+        with patch.object(deploy_host, '_read_text_or_none', return_value=written):
+            self.assertFalse(d.write_systemd_service(runner))
+
+        self.assertEqual(mock_run_cmd.call_count, 1)
+
+
+class TestRegistrationTokenCache(unittest.TestCase):
+    """Test reuse of the registration token across runs until it nears expiry"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = Path(self.temp_dir) / "test-config.yml"
+        cfg = {
+            'github': {'org': 'test-org', 'prefix': 'test', 'scope': 'org'},
+            'host': {
+                'runner_base': '/srv/gha',
+                'docker_user_uid': 1003,
+                'docker_user_gid': 1003,
+                'label': 'test-host',
+            },
+            'runners': ['cpu-small-1'],
+            'sizes': {'small': {'cpus': 2.0, 'mem_limit': '4g'}},
+            'runner': {'version': '2.321.0', 'arch': 'linux-x64'},
+        }
+        with open(self.config_file, 'w') as f:
+            yaml.dump(cfg, f)
+        self.deployer = HostDeployer(config_path=str(self.config_file))
+        self.token_path = Path(self.temp_dir) / "gha-runnerd" / "registration-token.json"
+        patchers = [
+            patch.object(deploy_host, 'TOKEN_CACHE_PATH', self.token_path),
+            patch.dict(os.environ),
+            patch.object(deploy_host.shutil, 'which', return_value='/usr/bin/gh'),
+        ]
+        for p in patchers:
+            p.start()
+            self.addCleanup(p.stop)
+        for var in ('REGISTER_GITHUB_RUNNER_TOKEN', 'GH_TOKEN', 'GITHUB_TOKEN'):
+            os.environ.pop(var, None)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _gh_response(self, token, expires_in):
+        expires_at = (deploy_host.datetime.now(deploy_host.timezone.utc) + expires_in).isoformat()
+        return subprocess.CompletedProcess(
+            args=[], returncode=0,
+            stdout=json.dumps({'token': token, 'expires_at': expires_at}), stderr='')
+
+    @patch.object(deploy_host.subprocess, 'run')
+    def test_fresh_token_is_cached_and_reused(self, mock_run):
+        """Second run reuses the cached token without calling gh"""
+        mock_run.return_value = self._gh_response('A' * 29, deploy_host.timedelta(hours=1))
+        self.assertTrue(self.deployer.ensure_github_token())
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(self.token_path.stat().st_mode & 0o777, 0o600)
+
+        os.environ.pop('REGISTER_GITHUB_RUNNER_TOKEN')
+        self.assertTrue(self.deployer.ensure_github_token())
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(os.environ['REGISTER_GITHUB_RUNNER_TOKEN'], 'A' * 29)
+
+    @patch.object(deploy_host.subprocess, 'run')
+    def test_nearly_expired_token_is_refetched(self, mock_run):
+        """A token inside the refresh margin is not reused"""
+        mock_run.return_value = self._gh_response('A' * 29, deploy_host.timedelta(minutes=2))
+        self.assertTrue(self.deployer.ensure_github_token())
+
+        os.environ.pop('REGISTER_GITHUB_RUNNER_TOKEN')
+        self.assertTrue(self.deployer.ensure_github_token())
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch.object(deploy_host.subprocess, 'run')
+    @patch.object(deploy_host.GitHubClient, 'request')
+    def test_env_token_uses_rest_api_directly(self, mock_request, mock_run):
+        """With GH_TOKEN set the token is fetched over HTTPS without gh"""
+        expires_at = (deploy_host.datetime.now(deploy_host.timezone.utc)
+                      + deploy_host.timedelta(hours=1)).isoformat()
+        mock_request.return_value = {'token': 'C' * 29, 'expires_at': expires_at}
+        os.environ['GH_TOKEN'] = 'ghp_example'
+
+        with patch.object(deploy_host.shutil, 'which', return_value=None):
+            self.assertTrue(self.deployer.ensure_github_token())
+
+        mock_run.assert_not_called()
+        mock_request.assert_called_once_with(
+            'POST', '/orgs/test-org/actions/runners/registration-token')
+        self.assertEqual(self.deployer.github_client.token, 'ghp_example')
+        self.assertEqual(os.environ['REGISTER_GITHUB_RUNNER_TOKEN'], 'C' * 29)
+
+    @patch.object(deploy_host.GitHubClient, 'request')
+    def test_network_error_reported_with_causes(self, mock_request):
+        """A DNS/connect/TLS failure on the REST path returns None with the usual help"""
+        mock_request.side_effect = ConnectionError("POST failed: gaierror(-3)")
+        os.environ['GH_TOKEN'] = 'ghp_example'
+
+        with patch.object(deploy_host, 'log') as mock_log:
+            self.assertIsNone(self.deployer.fetch_github_token())
+
+        messages = [c[0][0] for c in mock_log.call_args_list]
+        self.assertIn("Possible causes:", messages)
+        self.assertIn("  • Cannot reach api.github.com (check DNS, proxy and firewall)", messages)
+        self.assertFalse([m for m in messages if m.startswith("Unexpected error")])
+
+    @patch.object(deploy_host, 'run_cmd')
+    def test_deregister_uses_cached_token(self, mock_run_cmd):
+        """--remove can deregister via config.sh with the cached token"""
+        self.token_path.parent.mkdir(parents=True)
+        expires_at = (deploy_host.datetime.now(deploy_host.timezone.utc)
+                      + deploy_host.timedelta(hours=1)).isoformat()
+        self.token_path.write_text(json.dumps(
+            {'api_base': '/orgs/test-org', 'token': 'D' * 29, 'expires_at': expires_at}))
+        mock_run_cmd.return_value = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="", stderr="")
+        runner_path = Path("/srv/gha/test-linux-cpu-small-1")
+
+        with patch.object(Path, 'exists', return_value=True):
+            self.assertTrue(self.deployer._deregister_runner_from_github("cpu-small-1", runner_path))
+
+        self.assertEqual(mock_run_cmd.call_count, 1)
+        self.assertEqual(mock_run_cmd.call_args[0][0][-2:], ["--token", 'D' * 29])
+
+    @patch.object(deploy_host.subprocess, 'run')
+    def test_not_cached_without_runtime_dir(self, mock_run):
+        """Without XDG_RUNTIME_DIR nothing is written and every run fetches"""
+        mock_run.return_value = self._gh_response('A' * 29, deploy_host.timedelta(hours=1))
+        with patch.object(deploy_host, 'TOKEN_CACHE_PATH', None):
+            self.assertTrue(self.deployer.ensure_github_token())
+            os.environ.pop('REGISTER_GITHUB_RUNNER_TOKEN')
+            self.assertTrue(self.deployer.ensure_github_token())
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertFalse(self.token_path.parent.exists())
+
+    def test_missing_runtime_dir_not_created(self):
+        """A runtime directory that doesn't exist is not created to hold the token"""
+        runtime_dir = Path(self.temp_dir) / "run-user"
+        token_path = runtime_dir / "gha-runnerd" / "registration-token.json"
+        with patch.object(deploy_host, 'TOKEN_CACHE_PATH', token_path):
+            self.deployer._save_cached_token('A' * 29, '2099-01-01T00:00:00Z')
+        self.assertFalse(runtime_dir.exists())
+
+    def test_token_for_other_scope_ignored(self):
+        """A token cached for a different org is not used"""
+        self.token_path.parent.mkdir(parents=True)
+        expires_at = (deploy_host.datetime.now(deploy_host.timezone.utc)
+                      + deploy_host.timedelta(hours=1)).isoformat()
+        self.token_path.write_text(json.dumps(
+            {'api_base': '/orgs/other-org', 'token': 'B' * 29, 'expires_at': expires_at}))
+        self.assertIsNone(self.deployer._load_cached_token())
+
+    def test_corrupt_cache_ignored(self):
+        """Unreadable cache contents fall back to fetching"""
+        self.token_path.parent.mkdir(parents=True)
+        self.token_path.write_text("not json")
+        self.assertIsNone(self.deployer._load_cached_token())
+
+
+class TestGitHubClient(unittest.TestCase):
+    """Test the keep-alive GitHub REST client"""
+
+    def _response(self, status, body):
+        response = MagicMock()
+        response.status = status
+        response.reason = 'OK' if status < 300 else 'Not Found'
+        response.read.return_value = json.dumps(body).encode()
+        return response
+
+    @patch('http.client.HTTPSConnection')
+    def test_connection_reused_across_requests(self, mock_conn_cls):
+        """Sequential calls on one thread share a single connection"""
+        conn = mock_conn_cls.return_value
+        conn.getresponse.return_value = self._response(200, {'ok': True})
+        client = deploy_host.GitHubClient('tok')
+
+        client.request('GET', '/a')
+        client.request('PUT', '/b', {'labels': ['x']})
+
+        mock_conn_cls.assert_called_once_with('api.github.com', timeout=30)
+        self.assertEqual(conn.request.call_count, 2)
+        method, path = conn.request.call_args[0]
+        headers = conn.request.call_args[1]['headers']
+        self.assertEqual((method, path), ('PUT', '/b'))
+        self.assertEqual(headers['Authorization'], 'Bearer tok')
+        self.assertEqual(json.loads(conn.request.call_args[1]['body']), {'labels': ['x']})
+
+    @patch('http.client.HTTPSConnection')
+    def test_list_runners_follows_pages(self, mock_conn_cls):
+        """Pages are fetched until a short page is returned"""
+        full = {'runners': [{'name': f'r{i}', 'id': i} for i in range(100)]}
+        last = {'runners': [{'name': 'r100', 'id': 100}]}
+        mock_conn_cls.return_value.getresponse.side_effect = [
+            self._response(200, full), self._response(200, last)]
+
+        runners = deploy_host.GitHubClient('tok').list_runners('/orgs/o/actions/runners')
+
+        self.assertEqual(len(runners), 101)
+        paths = [c[0][1] for c in mock_conn_cls.return_value.request.call_args_list]
+        self.assertEqual(paths, ['/orgs/o/actions/runners?per_page=100&page=1',
+                                 '/orgs/o/actions/runners?per_page=100&page=2'])
+
+    @patch('http.client.HTTPSConnection')
+    def test_error_status_raises(self, mock_conn_cls):
+        """Non-2xx responses raise GitHubAPIError with the status"""
+        mock_conn_cls.return_value.getresponse.return_value = self._response(404, {})
+        with self.assertRaises(deploy_host.GitHubAPIError) as ctx:
+            deploy_host.GitHubClient('tok').request('GET', '/missing')
+        self.assertEqual(ctx.exception.status, 404)
+
+    @patch('http.client.HTTPSConnection')
+    def test_reconnects_once_after_dropped_connection(self, mock_conn_cls):
+        """A keep-alive connection closed by the server is replaced and retried"""
+        stale, fresh = MagicMock(), MagicMock()
+        stale.getresponse.side_effect = [self._response(200, {'n': 1}),
+                                         http.client.RemoteDisconnected()]
+        fresh.getresponse.return_value = self._response(200, {'n': 2})
+        mock_conn_cls.side_effect = [stale, fresh]
+        client = deploy_host.GitHubClient('tok')
+
+        self.assertEqual(client.request('GET', '/a'), {'n': 1})
+        self.assertEqual(client.request('GET', '/a'), {'n': 2})
+        stale.close.assert_called_once()
+
+    @patch('http.client.HTTPSConnection')
+    def test_new_connection_not_retried(self, mock_conn_cls):
+        """A connection that fails on its first request surfaces as ConnectionError"""
+        mock_conn_cls.return_value.getresponse.side_effect = http.client.RemoteDisconnected()
+        with self.assertRaises(ConnectionError):
+            deploy_host.GitHubClient('tok').request('DELETE', '/a')
+        self.assertEqual(mock_conn_cls.call_count, 1)
+
+    @patch('http.client.HTTPSConnection')
+    def test_errors_after_sending_not_retried(self, mock_conn_cls):
+        """Timeouts, resolver and protocol errors on a reused connection are not resent"""
+        import socket
+        conn = mock_conn_cls.return_value
+        for error in (TimeoutError("timed out"), socket.gaierror(-3, "Temporary failure"),
+                      http.client.BadStatusLine('')):
+            conn.reset_mock()
+            conn.getresponse.side_effect = [self._response(200, {}), error]
+            client = deploy_host.GitHubClient('tok')
+            client.request('GET', '/a')
+            with self.assertRaises(ConnectionError):
+                client.request('DELETE', '/a')
+            self.assertEqual(conn.request.call_count, 2)
+
+
+class TestReadGitHead(unittest.TestCase):
+    """Test reading the HEAD commit without running git"""
+
+    SHA = "0123456789abcdef0123456789abcdef01234567"
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = Path(self.temp_dir)
+        self.git_dir = self.root / ".git"
+        (self.git_dir / "refs" / "heads").mkdir(parents=True)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_loose_ref_found_from_subdirectory(self):
+        (self.git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        (self.git_dir / "refs" / "heads" / "main").write_text(self.SHA + "\n")
+        subdir = self.root / "a" / "b"
+        subdir.mkdir(parents=True)
+        self.assertEqual(deploy_host._read_git_head(subdir), "0123456")
+
+    def test_packed_ref_and_detached_head(self):
+        (self.git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        (self.git_dir / "packed-refs").write_text(
+            f"# pack-refs with: peeled fully-peeled sorted\n{self.SHA} refs/heads/main\n"
+        )
+        self.assertEqual(deploy_host._read_git_head(self.root), "0123456")
+
+        (self.git_dir / "HEAD").write_text(self.SHA + "\n")
+        self.assertEqual(deploy_host._read_git_head(self.root), "0123456")
+
+    def test_gitfile_and_unborn_branch_fall_back(self):
+        (self.git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        self.assertIsNone(deploy_host._read_git_head(self.root))
+
+        worktree = self.root / "worktree"
+        worktree.mkdir()
+        (worktree / ".git").write_text("gitdir: /elsewhere\n")
+        self.assertIsNone(deploy_host._read_git_head(worktree))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the Bash command validator hook (.claude/hooks/validate-bash.py)
+"""
+
+import unittest
+from unittest.mock import patch
+import importlib.util
+from pathlib import Path
+
+# Import from validate-bash.py
+# We need to handle this carefully since validate-bash.py is not a module
+spec = importlib.util.spec_from_file_location(
+    "validate_bash",
+    Path(__file__).parent.parent / ".claude" / "hooks" / "validate-bash.py"
+)
+validate_bash = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(validate_bash)
+
+
+def compile_config(deny=(), ask=(), allow=()):
+    """Compile deny/ask/allow pattern lists, one config section each"""
+    config = {
+        'deny': {'test': {'patterns': list(deny)}},
+        'ask': {'test': {'patterns': list(ask)}},
+        'allow': {'test': {'patterns': list(allow)}},
+    }
+    return tuple(validate_bash.compile_patterns(config, category)
+                 for category in validate_bash.CATEGORIES)
+
+
+def decide(command, patterns):
+    """Decision for command against compiled (deny, ask, allow) patterns"""
+    decision, _ = validate_bash.validate_command(command, *patterns)
+    return decision
+
+
+class TestPatternFusion(unittest.TestCase):
+    """Patterns that would change meaning in a fused alternation are matched on their own"""
+
+    def test_plain_patterns_are_fused(self):
+        """Ordinary patterns go into the fused regexes, not the separate list"""
+        deny, _, allow = compile_config(deny=[r'^rm -rf /', r'sudo '], allow=[r'^ls\b'])
+        self.assertEqual(deny.separate, [])
+        self.assertIsNotNone(deny.unanchored)
+        self.assertEqual(decide('rm -rf /', (deny, _, allow)), 'deny')
+        self.assertEqual(decide('ls -la', (deny, _, allow)), 'allow')
+
+    def test_global_inline_flag(self):
+        """A pattern starting with (?i) compiles and still denies"""
+        patterns = compile_config(deny=[r'zz', r'(?i)^RM -RF'], allow=[r'^rm\b'])
+        self.assertEqual(decide('rm -rf /tmp/x', patterns), 'deny')
+        self.assertEqual(decide('zz', patterns), 'deny')
+
+    def test_numbered_backreference(self):
+        """A backreference keeps referring to its own pattern's group"""
+        patterns = compile_config(deny=[r'zz(q)', r'(b)\1'], allow=[r'^echo\b'])
+        self.assertEqual(decide('echo bb', patterns), 'deny')
+        self.assertEqual(decide('echo ba', patterns), 'allow')
+
+    def test_group_conditional(self):
+        """A (?(1)...) conditional keeps referring to its own pattern's group"""
+        patterns = compile_config(deny=[r'zz(q)', r'(<)?x(?(1)>)$'], allow=[r'^echo\b'])
+        self.assertEqual(decide('echo <x>', patterns), 'deny')
+
+    def test_duplicate_named_groups(self):
+        """The same group name in two patterns does not break compilation"""
+        patterns = compile_config(deny=[r'(?P<cmd>shred) ', r'(?P<cmd>wipefs) (?P=cmd)?'],
+                                  allow=[r'^echo\b'])
+        self.assertEqual(decide('shred -u file', patterns), 'deny')
+        self.assertEqual(decide('wipefs /dev/sda', patterns), 'deny')
+        self.assertEqual(decide('echo hi', patterns), 'allow')
+
+    def test_falls_back_when_fused_compile_fails(self):
+        """If a fused alternation does not compile, its patterns are searched one by one"""
+        with patch.object(validate_bash, 'is_fusable', return_value=True):
+            patterns = compile_config(deny=[r'(?i)^RM -RF', r'(?i)SUDO '],
+                                      allow=[r'^rm\b', r'^echo\b'])
+        deny = patterns[0]
+        self.assertIsNone(deny.unanchored)
+        self.assertEqual(decide('rm -rf /tmp/x', patterns), 'deny')
+        self.assertEqual(decide('echo hi; sudo ls', patterns), 'deny')
+        self.assertEqual(decide('echo hi', patterns), 'allow')
+
+
+class TestShippedConfig(unittest.TestCase):
+    """The bundled bash-patterns.toml compiles and decides as expected"""
+
+    @classmethod
+    def setUpClass(cls):
+        config_path = Path(__file__).parent.parent / ".claude" / "hooks" / "bash-patterns.toml"
+        cls.patterns = validate_bash.load_patterns(str(config_path))
+
+    def test_decisions(self):
+        """Common commands get the expected decision"""
+        self.assertEqual(decide('ls -la', self.patterns), 'allow')
+        self.assertEqual(decide('rm -rf /', self.patterns), 'deny')
+        self.assertEqual(decide('git push --force', self.patterns), 'ask')
+
+
+if __name__ == '__main__':
+    unittest.main()